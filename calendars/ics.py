@@ -0,0 +1,163 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from plan.models import Plan
+
+# 이벤트 UID 의 도메인 부분 (plan-<id>@UID_DOMAIN)
+UID_DOMAIN = "goingmarry"
+
+# 스트리밍 응답에서 한 번에 만들어 보낼 이벤트 수
+EVENT_CHUNK_SIZE = 200
+
+# RFC 5545: 한 줄은 CRLF 제외 75 octet 까지, 넘으면 공백으로 시작하는 줄로 접는다
+LINE_LIMIT = 75
+
+
+def iter_calendar(plans: Iterable[Plan], name: str) -> Iterator[str]:
+    # plan 목록을 VCALENDAR 문서로 (EVENT_CHUNK_SIZE 개씩 묶어서) 내보낸다
+    yield _lines(
+        [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:-//{UID_DOMAIN}//plans//KO",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_escape(name)}",
+        ]
+    )
+    chunk: List[str] = []
+    for count, plan in enumerate(plans, start=1):
+        chunk.extend(_event(plan))
+        if count % EVENT_CHUNK_SIZE == 0:
+            yield _lines(chunk)
+            chunk = []
+    chunk.append("END:VCALENDAR")
+    yield _lines(chunk)
+
+
+def parse_events(text: str) -> List[Dict[str, Any]]:
+    # .ics 문서의 VEVENT 를 plan 생성 데이터 (title, start_date, end_date) 로 읽는다
+    # 종일 일정의 DTEND 는 다음 날(미포함)이므로 하루를 빼서 end_date 로 쓴다
+    # Raises :
+    # - ValueError : VCALENDAR 형식이 아니거나 날짜를 읽을 수 없는 경우
+    lines = _unfold(text)
+    if not lines or lines[0].upper() != "BEGIN:VCALENDAR":
+        raise ValueError("Not an iCalendar document")
+
+    events: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, str]] = None
+    for line in lines:
+        name, params, value = _split(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            current = {}
+        elif name == "END" and value.upper() == "VEVENT" and current is not None:
+            events.append(_to_plan_data(current))
+            current = None
+        elif current is not None and name in ("SUMMARY", "DTSTART", "DTEND"):
+            current[name] = value
+            if name == "DTEND" and "VALUE=DATE" not in params:
+                # 시각이 있는 일정은 끝나는 날을 포함한다
+                current["DTEND_INCLUSIVE"] = "1"
+    return events
+
+
+def _event(plan: Plan) -> List[str]:
+    start = _as_date(plan.start_date)
+    end = _as_date(plan.end_date) or start
+    assert start is not None and end is not None
+    stamp = plan.updated_at.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return [
+        "BEGIN:VEVENT",
+        f"UID:plan-{plan.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{stamp}",
+        f"LAST-MODIFIED:{stamp}",
+        f"DTSTART;VALUE=DATE:{start:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{end + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_escape(plan.title)}",
+        "END:VEVENT",
+    ]
+
+
+def _to_plan_data(fields: Dict[str, str]) -> Dict[str, Any]:
+    if "DTSTART" not in fields:
+        raise ValueError("VEVENT without DTSTART")
+    start = _parse_date(fields["DTSTART"])
+    end = start
+    if "DTEND" in fields:
+        end = _parse_date(fields["DTEND"])
+        if not fields.get("DTEND_INCLUSIVE") and end > start:
+            end -= timedelta(days=1)
+    return {
+        "title": _unescape(fields.get("SUMMARY", ""))[:255] or "(제목 없음)",
+        "start_date": start,
+        "end_date": end,
+    }
+
+
+def _parse_date(value: str) -> date:
+    # 20240601 또는 20240601T100000(Z) (시각은 버리고 날짜만)
+    return datetime.strptime(value[:8], "%Y%m%d").date()
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value if isinstance(value, date) else None
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _unescape(text: str) -> str:
+    result = []
+    chars = iter(text)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            result.append("\n" if escaped in ("n", "N") else escaped)
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def _lines(lines: List[str]) -> str:
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def _fold(line: str) -> str:
+    # UTF-8 문자 중간에서 자르지 않도록 글자 단위로 octet 수를 센다
+    parts: List[str] = []
+    current, size, limit = "", 0, LINE_LIMIT
+    for char in line:
+        width = len(char.encode())
+        if size + width > limit:
+            parts.append(current)
+            current, size, limit = "", 0, LINE_LIMIT - 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _unfold(text: str) -> List[str]:
+    lines: List[str] = []
+    for raw in text.replace("\r\n", "\n").split("\n"):
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw.strip():
+            lines.append(raw)
+    return lines
+
+
+def _split(line: str) -> Tuple[str, str, str]:
+    # "NAME;PARAM=1:value" -> ("NAME", "PARAM=1", "value")
+    head, _, value = line.partition(":")
+    name, _, params = head.partition(";")
+    return name.upper(), params.upper(), value
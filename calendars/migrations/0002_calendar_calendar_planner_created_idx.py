@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calendars", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="calendar",
+            index=models.Index(
+                fields=["planner_id", "-created_at"],
+                name="calendar_planner_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calendars", "0002_calendar_calendar_planner_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarMonth",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("planner_id", models.BigIntegerField()),
+                ("month", models.DateField()),
+                ("days", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "calendar_months",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("planner_id", "month"), name="calendar_month_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
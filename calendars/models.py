@@ -12,3 +12,32 @@ class Calendar(models.Model):
 
     class Meta:
         db_table = "calendars"
+        indexes = [
+            # CalendarService.get_calendars: planner_id 조건 + 최신순 정렬
+            models.Index(
+                fields=["planner_id", "-created_at"],
+                name="calendar_planner_created_idx",
+            ),
+        ]
+
+
+class CalendarMonth(models.Model):
+    """
+    planner 별 월간 달력 요약 (날짜 -> 그날 진행 중인 plan id 목록).
+    처음 조회할 때 만들고, 이후에는 plan 의 날짜가 바뀔 때 해당 월만 다시 계산합니다.
+    """
+
+    planner_id = models.BigIntegerField()
+    month = models.DateField()  # 해당 월 1일
+    # {"1": [plan id, ...], ...} (plan 이 있는 날만)
+    days = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "calendar_months"
+        constraints = [
+            # 월 이동은 이 unique 인덱스 조회 한 번
+            models.UniqueConstraint(
+                fields=["planner_id", "month"], name="calendar_month_uniq"
+            ),
+        ]
@@ -2,7 +2,7 @@ from typing import Any
 
 from rest_framework import serializers
 
-from .models import Calendar
+from .models import Calendar, CalendarMonth
 
 
 class CalendarSerializer(serializers.ModelSerializer[Calendar]):
@@ -10,3 +10,20 @@ class CalendarSerializer(serializers.ModelSerializer[Calendar]):
         model = Calendar
         fields = "__all__"
         read_only_fields = ("id", "created_at", "updated_at", "is_deleted")
+
+
+class CalendarBulkCreateSerializer(serializers.ModelSerializer[Calendar]):
+    # 일괄 생성 항목. planner_id 는 요청 사용자로 정해지므로 입력 필드가 없다
+    class Meta:
+        model = Calendar
+        fields = ("id",)
+        read_only_fields = ("id",)
+
+
+class CalendarMonthSerializer(serializers.ModelSerializer[CalendarMonth]):
+    # days : {"일": [plan id, ...]} (plan 이 있는 날만)
+    month = serializers.DateField(format="%Y-%m")
+
+    class Meta:
+        model = CalendarMonth
+        fields = ("month", "days", "updated_at")
@@ -1,11 +1,40 @@
-from typing import Any, Dict
+import calendar as calendar_module
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from django.db.models import QuerySet
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from .models import Calendar
+from common.bulk import bulk_insert
+from common.cache import VersionedListCache
+from plan.models import Plan
+from sync.models import Change
+from sync.services import SyncService
+from user.models import User
+
+from .models import Calendar, CalendarMonth
+
+# 기간 조회 한 번에 허용하는 최대 일수
+MAX_RANGE_DAYS = 366
+
+# .ics 구독 주소 토큰 서명용 salt
+FEED_SALT = "calendars.feed"
+
+# plan 의 (start_date, end_date). 문자열("YYYY-MM-DD")도 받는다
+DateSpan = Tuple[Any, Any]
+
+# (plan id, start_date, end_date)
+SpanRow = Tuple[int, Optional[date], Optional[date]]
 
 
 class CalendarService:
+    # 사용자별 캘린더 목록 응답 캐시 (생성/수정/삭제 시 무효화)
+    list_cache = VersionedListCache("calendar")
+
     @staticmethod
     def get_calendars(planner_id: int) -> QuerySet[Calendar]:
         # 캘린더 조회
@@ -13,12 +42,151 @@ class CalendarService:
             planner_id=planner_id, is_deleted=False
         ).order_by("-created_at")
 
+    @staticmethod
+    def get_plans_in_range(planner_id: int, start: date, end: date) -> QuerySet[Plan]:
+        # [start, end] 기간과 겹치는 plan (쿼리 한 번, plan_planner_range_idx)
+        # end_date 가 없는 plan 은 start_date 하루짜리로 본다. 날짜가 없는 plan 은 제외
+        # Raises :
+        # - ValueError : 기간이 잘못되었거나 MAX_RANGE_DAYS 보다 긴 경우
+        if end < start:
+            raise ValueError("'end' must not be before 'start'")
+        if (end - start).days >= MAX_RANGE_DAYS:
+            raise ValueError(f"Range must be shorter than {MAX_RANGE_DAYS} days")
+        return _overlapping(planner_id, start, end)
+
+    @staticmethod
+    def get_feed_token(user: User) -> str:
+        # 캘린더 앱이 헤더 없이 구독할 .ics 주소용 서명 토큰
+        # token_version 을 담아, 전체 로그아웃 시 구독 주소도 함께 무효가 된다
+        return signing.dumps({"u": user.id, "v": user.token_version}, salt=FEED_SALT)
+
+    @staticmethod
+    def get_feed_user(token: str) -> Optional[User]:
+        # 토큰이 잘못되었거나 무효가 되었으면 None (기본 키 조회 한 번)
+        try:
+            payload = signing.loads(token, salt=FEED_SALT)
+        except signing.BadSignature:
+            return None
+        return (
+            User.objects.filter(
+                id=payload.get("u"), token_version=payload.get("v"), is_active=True
+            )
+            .only("id", "token_version")
+            .first()
+        )
+
+    @staticmethod
+    def get_feed_plans(planner_id: int) -> QuerySet[Plan]:
+        # .ics 로 내보낼 날짜가 있는 plan (plan_planner_range_idx 순서 그대로)
+        return Plan.objects.filter(
+            planner_id=planner_id, is_deleted=False, start_date__isnull=False
+        ).order_by("start_date", "end_date", "id")
+
+    @staticmethod
+    def get_month(planner_id: int, year: int, month: int) -> CalendarMonth:
+        # 월간 요약. 있으면 unique 인덱스 조회 한 번, 없으면 계산해서 저장
+        # Raises :
+        # - ValueError : 잘못된 연/월
+        first = date(year, month, 1)
+        try:
+            return CalendarMonth.objects.get(planner_id=planner_id, month=first)
+        except CalendarMonth.DoesNotExist:
+            pass
+        with transaction.atomic():
+            # plan 쓰기의 refresh_months 와 직렬화한 뒤 다시 확인하고 계산한다
+            # (잠금 전에 읽은 plan 으로 만든 요약이 저장되지 않도록)
+            _lock_owner(planner_id)
+            summary = CalendarMonth.objects.filter(
+                planner_id=planner_id, month=first
+            ).first()
+            if summary is not None:
+                return summary
+            summary = CalendarMonth(
+                planner_id=planner_id,
+                month=first,
+                days=_summarize(
+                    first, _span_rows(planner_id, first, _month_end(first))
+                ),
+            )
+            try:
+                with transaction.atomic():
+                    summary.save()
+            except IntegrityError:
+                # 잠금을 지원하지 않는 DB 에서 다른 요청이 먼저 만든 경우
+                return CalendarMonth.objects.get(planner_id=planner_id, month=first)
+        return summary
+
+    @staticmethod
+    def refresh_months(planner_id: int, spans: Iterable[DateSpan]) -> int:
+        # plan 의 날짜가 바뀌었을 때 (이전/이후 기간을 모두 넘긴다) 이미 만들어진
+        # 월간 요약 중 그 기간에 걸친 월만 다시 계산한다 (쿼리 최대 3번)
+        # Returns : 다시 계산한 월 수
+        # plan 을 쓴 트랜잭션 안에서 호출해야 요약이 plan 과 함께 커밋된다
+        bounds = [bound for span in spans for bound in _bounds(span)]
+        if not bounds:
+            return 0
+        with transaction.atomic():
+            # 같은 사용자의 요약 계산(get_month)/갱신을 직렬화
+            _lock_owner(planner_id)
+            months = list(
+                CalendarMonth.objects.select_for_update()
+                .filter(
+                    planner_id=planner_id,
+                    month__gte=min(bounds).replace(day=1),
+                    month__lte=max(bounds),
+                )
+                .order_by("month")
+            )
+            if not months:
+                return 0
+            rows = _span_rows(planner_id, months[0].month, _month_end(months[-1].month))
+            now = timezone.now()
+            for summary in months:
+                summary.days = _summarize(summary.month, rows)
+                summary.updated_at = now
+            CalendarMonth.objects.bulk_update(months, ["days", "updated_at"])
+        return len(months)
+
+    @staticmethod
+    def get_list_validators(planner_id: int) -> Tuple[int, Optional[datetime]]:
+        # 조건부 GET용 (활성 캘린더 수, 최종 수정 시각)
+        def aggregate() -> Tuple[int, Optional[datetime]]:
+            result = Calendar.objects.filter(planner_id=planner_id).aggregate(
+                count=Count("id", filter=Q(is_deleted=False)),
+                last=Max("updated_at"),
+            )
+            return result["count"], result["last"]
+
+        return CalendarService.list_cache.get_or_build(
+            planner_id, {}, aggregate, kind="validators"
+        )
+
     @staticmethod
     def create_calendar(planner_id: int) -> Calendar:
         # 캘린더 생성
         # Args : planner_id: Calendar 를 생성하는 Planner의 ID
         # Return : 생성된 Calendar 객체
-        return Calendar.objects.create(planner_id=planner_id)
+        with transaction.atomic():
+            calendar = Calendar.objects.create(planner_id=planner_id)
+            SyncService.record(planner_id, Change.CALENDAR, [calendar.id])
+        CalendarService.list_cache.invalidate(planner_id)
+        return calendar
+
+    @staticmethod
+    def bulk_create_calendars(
+        items: List[Dict[str, Any]], planner_id: int
+    ) -> List[Calendar]:
+        # 여러 캘린더를 한 트랜잭션, 한 번의 INSERT 로 생성
+        # Return : 생성된 Calendar 객체 목록 (요청 순서)
+        with transaction.atomic():
+            calendars = bulk_insert(
+                Calendar, [Calendar(planner_id=planner_id, **item) for item in items]
+            )
+            SyncService.record(
+                planner_id, Change.CALENDAR, [calendar.id for calendar in calendars]
+            )
+        CalendarService.list_cache.invalidate(planner_id)
+        return calendars
 
     @staticmethod
     def update_calendar(
@@ -47,7 +215,10 @@ class CalendarService:
             if hasattr(calendar, key):
                 setattr(calendar, key, value)
 
-        calendar.save()
+        with transaction.atomic():
+            calendar.save()
+            SyncService.record(planner_id, Change.CALENDAR, [calendar.id])
+        CalendarService.list_cache.invalidate(planner_id)
         return calendar
 
     @staticmethod
@@ -70,5 +241,122 @@ class CalendarService:
             raise PermissionError("Not authorized to delete this calendar")
 
         calendar.is_deleted = True
-        calendar.save()
+        with transaction.atomic():
+            calendar.save()
+            SyncService.record(planner_id, Change.CALENDAR, [calendar.id])
+        CalendarService.list_cache.invalidate(planner_id)
         return True
+
+    # ----- async 뷰용 (Django async ORM, 스레드 풀을 거치지 않는다) -----
+
+    @staticmethod
+    async def aget_month(planner_id: int, year: int, month: int) -> CalendarMonth:
+        # 만들어진 요약은 async ORM 으로 읽고, 없을 때만 스레드에서 계산한다
+        try:
+            return await CalendarMonth.objects.aget(
+                planner_id=planner_id, month=date(year, month, 1)
+            )
+        except CalendarMonth.DoesNotExist:
+            return await sync_to_async(CalendarService.get_month)(
+                planner_id, year, month
+            )
+
+    @staticmethod
+    async def aget_list_validators(planner_id: int) -> Tuple[int, Optional[datetime]]:
+        async def aggregate() -> Tuple[int, Optional[datetime]]:
+            result = await Calendar.objects.filter(planner_id=planner_id).aaggregate(
+                count=Count("id", filter=Q(is_deleted=False)),
+                last=Max("updated_at"),
+            )
+            return result["count"], result["last"]
+
+        return await CalendarService.list_cache.aget_or_build(
+            planner_id, {}, aggregate, kind="validators"
+        )
+
+    @staticmethod
+    async def acreate_calendar(planner_id: int) -> Calendar:
+        # 행과 변경 기록을 한 트랜잭션에 쓰므로 (async ORM 미지원) 동기 구현을 스레드에서 실행
+        return await sync_to_async(CalendarService.create_calendar)(planner_id)
+
+    @staticmethod
+    async def adelete_calendar(calendar_id: int, planner_id: int) -> bool:
+        # 조회 없이 UPDATE 한 번으로 soft delete
+        # Raises :
+        # - Calendar.DoesNotExist : Calendar를 찾을 수 없는 경우
+        # 행과 변경 기록을 한 트랜잭션에 (async ORM 미지원, 스레드에서 실행)
+        @sync_to_async
+        def delete() -> None:
+            with transaction.atomic():
+                updated = Calendar.objects.filter(
+                    id=calendar_id, planner_id=planner_id, is_deleted=False
+                ).update(is_deleted=True, updated_at=timezone.now())
+                if not updated:
+                    raise Calendar.DoesNotExist(
+                        f"Calendar with id {calendar_id} does not exist"
+                    )
+                SyncService.record(planner_id, Change.CALENDAR, [calendar_id])
+
+        await delete()
+        await CalendarService.list_cache.ainvalidate(planner_id)
+        return True
+
+
+def _overlapping(planner_id: int, start: date, end: date) -> QuerySet[Plan]:
+    # [start, end] 와 겹치는 plan (plan_planner_range_idx)
+    return (
+        Plan.objects.filter(
+            planner_id=planner_id, is_deleted=False, start_date__lte=end
+        )
+        .filter(
+            Q(end_date__gte=start) | Q(end_date__isnull=True, start_date__gte=start)
+        )
+        .order_by("start_date", "end_date", "id")
+    )
+
+
+def _lock_owner(planner_id: int) -> None:
+    # 월간 요약은 아직 행이 없을 수도 있으므로 소유자(User) 행을 잠가
+    # 같은 사용자의 요약 계산과 갱신을 트랜잭션 단위로 직렬화한다
+    list(
+        User.objects.select_for_update()
+        .filter(pk=planner_id)
+        .values_list("pk", flat=True)
+    )
+
+
+def _span_rows(planner_id: int, start: date, end: date) -> List[SpanRow]:
+    return list(
+        _overlapping(planner_id, start, end).values_list("id", "start_date", "end_date")
+    )
+
+
+def _summarize(month: date, rows: Sequence[SpanRow]) -> Dict[str, List[int]]:
+    # 해당 월의 날짜별 plan id 목록 (plan 기간을 월 안으로 잘라서 센다)
+    last = _month_end(month)
+    days: Dict[str, List[int]] = {}
+    for plan_id, start, end in rows:
+        if start is None:
+            continue
+        end = end or start
+        if end < month or start > last:
+            continue
+        day = max(start, month)
+        while day <= min(end, last):
+            days.setdefault(str(day.day), []).append(plan_id)
+            day += timedelta(days=1)
+    return days
+
+
+def _month_end(month: date) -> date:
+    return month.replace(day=calendar_module.monthrange(month.year, month.month)[1])
+
+
+def _bounds(span: DateSpan) -> List[date]:
+    # (start, end) 중 날짜로 읽을 수 있는 값. 시작일이 없는 plan 은 달력에 없다
+    start, end = (
+        parse_date(value) if isinstance(value, str) else value for value in span
+    )
+    if start is None:
+        return []
+    return [start, end or start]
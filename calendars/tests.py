@@ -1,20 +1,33 @@
+from datetime import date, timedelta
 from typing import Any, cast
+from unittest import mock, skipUnless
 
+from django.core.cache import cache
+from django.db import DatabaseError, connection
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from common.testing import QueryPlanAssertionsMixin
+from plan.models import Plan
+from plan.services import PlanService
 from user.models import User
 
-from .models import Calendar
+from .models import Calendar, CalendarMonth
+from .services import CalendarService
+from .views import CalendarPagination
 
 # Create your tests here.
 
 
 class CalendarTests(APITestCase):
     def setUp(self) -> None:
+        # 테스트 간 목록 캐시가 섞이지 않도록 비운다
+        cache.clear()
+
         # 테스트 유저 생성
         self.user = User.objects.create_user(
             username="testuser",
@@ -94,3 +107,227 @@ class CalendarTests(APITestCase):
         url = reverse("calendar:calendar-update", args=[999])
         response = self.client.put(url, {}, format="json")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_calendars_paginated(self) -> None:
+        # 최신 캘린더부터 페이지 단위로 조회
+        calendars = [Calendar.objects.create(planner_id=self.user.id) for _ in range(3)]
+        base = timezone.now()
+        for i, calendar in enumerate(calendars):
+            Calendar.objects.filter(id=calendar.id).update(
+                created_at=base + timedelta(minutes=i)
+            )
+
+        url = reverse("calendar:calendar-list")
+        response = self.client.get(f"{url}?page_size=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data],
+            [calendars[2].id, calendars[1].id],
+        )
+        self.assertIn('rel="next"', response.headers["Link"])
+
+        next_url = response.headers["Link"].split(">")[0][1:]
+        response = self.client.get(next_url)
+        self.assertEqual([item["id"] for item in response.data], [calendars[0].id])
+        self.assertNotIn("Link", response.headers)
+
+    def test_async_calendar_views(self) -> None:
+        url = reverse("calendar:calendar-list-async")
+        response = self.client.post(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        calendar_id = response.json()["id"]
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.json()], [calendar_id])
+
+        delete_url = reverse("calendar:calendar-delete-async", args=[calendar_id])
+        response = self.client.delete(delete_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Calendar.objects.get(id=calendar_id).is_deleted)
+        self.assertEqual(self.client.get(url).json(), [])
+        response = self.client.delete(delete_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_calendars(self) -> None:
+        response = self.client.post(
+            reverse("calendar:calendar-bulk-create"), [{}, {}, {}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["ids"]), 3)
+        self.assertEqual(
+            Calendar.objects.filter(
+                id__in=response.data["ids"], planner_id=self.user.id
+            ).count(),
+            3,
+        )
+
+    def test_get_plans_in_range(self) -> None:
+        def plan(title: str, start: str, end: Any = None, **kwargs: Any) -> None:
+            Plan.objects.create(
+                planner_id=kwargs.get("planner_id", self.user.id),
+                ordering_num=1,
+                title=title,
+                start_date=start,
+                end_date=end,
+                is_deleted=kwargs.get("is_deleted", False),
+            )
+
+        plan("before", "2024-05-01", "2024-05-31")
+        plan("overlap start", "2024-05-20", "2024-06-02")
+        plan("inside", "2024-06-10")
+        plan("spanning", "2024-01-01", "2024-12-31")
+        plan("overlap end", "2024-06-30", "2024-07-05")
+        plan("after", "2024-07-01")
+        plan("deleted", "2024-06-10", is_deleted=True)
+        plan("other user", "2024-06-10", planner_id=self.user.id + 1)
+
+        url = reverse("calendar:calendar-plan-range")
+        with self.assertNumQueries(2):  # 인증용 사용자 조회 + 기간 조회
+            response = self.client.get(f"{url}?start=2024-06-01&end=2024-06-30")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["title"] for item in response.data],
+            ["spanning", "overlap start", "inside", "overlap end"],
+        )
+
+        for query in ("start=2024-06-01", "start=2024-06-30&end=2024-06-01"):
+            response = self.client.get(f"{url}?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f"{url}?start=2024-01-01&end=2025-06-01")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_month_summary_follows_plan_changes(self) -> None:
+        response = self.client.post(
+            reverse("plan:plan-create"),
+            {"title": "신혼여행", "start_date": "2024-06-29", "end_date": "2024-07-02"},
+            format="json",
+        )
+        plan_id = response.data["id"]
+        url = reverse("calendar:calendar-list")
+
+        response = self.client.get(f"{url}?month=2024-06")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["month"], "2024-06")
+        self.assertEqual(response.data["days"], {"29": [plan_id], "30": [plan_id]})
+        # 만들어진 요약은 인증용 사용자 조회 + unique 인덱스 조회 한 번
+        with self.assertNumQueries(2):
+            self.client.get(f"{url}?month=2024-06")
+        self.client.get(f"{url}?month=2024-07")
+
+        # 날짜를 바꾸면 이전/이후 기간에 걸친 월이 다시 계산된다
+        self.client.put(
+            reverse("plan:plan-update", args=[plan_id]),
+            {"start_date": "2024-07-01", "end_date": "2024-07-01"},
+            format="json",
+        )
+        june = CalendarMonth.objects.get(month=date(2024, 6, 1))
+        july = CalendarMonth.objects.get(month=date(2024, 7, 1))
+        self.assertEqual((june.days, july.days), ({}, {"1": [plan_id]}))
+
+        # 요약 갱신이 실패하면 plan 변경도 함께 롤백된다 (같은 트랜잭션)
+        with mock.patch.object(
+            CalendarMonth.objects, "bulk_update", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                PlanService.update_plan(
+                    plan_id, {"start_date": date(2024, 6, 30)}, self.user
+                )
+        self.assertEqual(Plan.objects.get(id=plan_id).start_date, date(2024, 7, 1))
+
+        self.client.delete(reverse("plan:plan-delete", args=[plan_id]))
+        response = self.client.get(f"{url}?month=2024-07")
+        self.assertEqual(response.data["days"], {})
+
+        for month in ("2024-13", "june"):
+            response = self.client.get(f"{url}?month={month}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _feed_url(self) -> str:
+        response = self.client.get(reverse("calendar:calendar-feed-token"))
+        return str(response.data["url"])
+
+    def test_ics_feed(self) -> None:
+        title = "본식 준비, 드레스; 가봉 " + "가" * 40
+        Plan.objects.create(
+            planner_id=self.user.id,
+            ordering_num=1,
+            title=title,
+            start_date=date(2024, 6, 1),
+            end_date=date(2024, 6, 2),
+        )
+        Plan.objects.create(planner_id=self.user.id, ordering_num=2, title="날짜 없음")
+        url = self._feed_url()
+        # 캘린더 앱은 인증 헤더 없이 주소만으로 가져간다
+        self.client.credentials()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = b"".join(cast(Any, response).streaming_content)
+        lines = body.split(b"\r\n")
+        self.assertTrue(all(len(line) <= 75 for line in lines))
+        text = body.decode()
+        self.assertEqual(text.count("BEGIN:VEVENT"), 1)
+        self.assertIn("DTSTART;VALUE=DATE:20240601\r\n", text)
+        self.assertIn("DTEND;VALUE=DATE:20240603\r\n", text)
+
+        # 바뀌지 않았으면 토큰 사용자 조회 한 번으로 304
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.assertEqual(
+            self.client.get(url.replace(".ics", "x.ics")).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        # 전체 로그아웃(token_version 증가) 후에는 구독 주소도 무효
+        User.objects.filter(id=self.user.id).update(token_version=1)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ics_import_round_trip(self) -> None:
+        Plan.objects.create(
+            planner_id=self.user.id,
+            ordering_num=1,
+            title="상견례, 한정식 " + "나" * 40,
+            start_date=date(2024, 6, 1),
+            end_date=date(2024, 6, 3),
+        )
+        feed = b"".join(cast(Any, self.client.get(self._feed_url())).streaming_content)
+
+        url = reverse("calendar:calendar-import")
+        response = self.client.post(url, feed, content_type="text/calendar")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        original, imported = Plan.objects.order_by("id")
+        self.assertEqual(imported.id, response.data["ids"][0])
+        self.assertEqual(
+            (imported.title, imported.start_date, imported.end_date),
+            (original.title, original.start_date, original.end_date),
+        )
+
+        response = self.client.post(
+            url, b"not a calendar", content_type="text/calendar"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class CalendarQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    def test_get_calendars_uses_index(self) -> None:
+        calendars = CalendarService.get_calendars(1)
+        self.assertUsesIndex(calendars, "calendar_planner_created_idx")
+
+    def test_calendar_page_uses_index(self) -> None:
+        paginator = CalendarPagination()
+        calendars = (
+            CalendarService.get_calendars(1)
+            .order_by(*paginator.ordering)
+            .filter(paginator._after(["2024-01-01T00:00:00+00:00", 3]))
+        )
+        self.assertUsesIndex(calendars, "calendar_planner_created_idx")
+
+    def test_plans_in_range_uses_index(self) -> None:
+        plans = CalendarService.get_plans_in_range(
+            1, date(2024, 6, 1), date(2024, 6, 30)
+        )
+        self.assertUsesIndex(plans, "plan_planner_range_idx")
@@ -7,6 +7,21 @@ app_name = "calendar"
 urlpatterns = [
     path("", views.CalendarListView.as_view(), name="calendar-list"),
     path("create/", views.CalendarCreateView.as_view(), name="calendar-create"),
+    path("bulk/", views.CalendarBulkCreateView.as_view(), name="calendar-bulk-create"),
+    path("plans/", views.CalendarPlanRangeView.as_view(), name="calendar-plan-range"),
+    # .ics 구독 주소 발급 / 구독 피드 / 가져오기
+    path("feed/", views.CalendarFeedTokenView.as_view(), name="calendar-feed-token"),
+    path(
+        "feed/<str:token>.ics", views.CalendarFeedView.as_view(), name="calendar-feed"
+    ),
+    path("import/", views.CalendarImportView.as_view(), name="calendar-import"),
+    # ASGI 전용 async 뷰
+    path("async/", views.AsyncCalendarListView.as_view(), name="calendar-list-async"),
+    path(
+        "async/<int:calendar_id>/delete/",
+        views.AsyncCalendarDeleteView.as_view(),
+        name="calendar-delete-async",
+    ),
     path(
         "<int:calendar_id>/", views.CalendarUpdateView.as_view(), name="calendar-update"
     ),
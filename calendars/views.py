@@ -1,37 +1,191 @@
-from typing import cast
+from datetime import date
+from typing import Any, Dict, List, Tuple, cast
 
+from django.http import HttpRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import render
+from django.urls import reverse
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from calendars.serializers import CalendarSerializer
+from calendars.serializers import (
+    CalendarBulkCreateSerializer,
+    CalendarMonthSerializer,
+    CalendarSerializer,
+)
 from calendars.services import CalendarService
+from common.async_views import AsyncAPIView
+from common.bulk import validate_bulk
+from common.conditional import aconditional_list_response, conditional_list_response
+from common.pagination import (
+    KeysetPagination,
+    astream_list_response,
+    is_stream_request,
+    stream_list_response,
+)
+from plan.serializers import PlanBulkCreateSerializer, PlanSerializer
+from plan.services import PlanService
 from user.models import User
 
+from .ics import EVENT_CHUNK_SIZE, iter_calendar, parse_events
 from .models import Calendar
 
+# .ics 구독 시 캘린더 앱에 보이는 이름
+FEED_NAME = "goingmarry"
+
 # Create your views here.
 
 
+class CalendarPagination(KeysetPagination):
+    # 최신 캘린더부터 (created_at 내림차순, id 오름차순)
+    ordering = ("-created_at", "id")
+
+
 class CalendarListView(APIView):
     # 캘린더 조회 API
     permission_classes = [IsAuthenticated]
 
-    def get(self, request: Request) -> Response:
-        # 사용자의 모든 캘린더를 조회
+    def get(self, request: Request) -> HttpResponseBase:
+        # 사용자의 캘린더를 한 페이지씩 조회 (?stream=true 이면 전체를 스트리밍)
+        # 목록이 바뀌지 않았으면 집계 쿼리 한 번으로 304 응답
+        # ?month=YYYY-MM 이면 그 달의 날짜별 plan id 요약
         try:
             user = cast(User, request.user)
-            calendars = CalendarService.get_calendars(user.id)
-            serializer = CalendarSerializer(calendars, many=True)
-            return Response(serializer.data)
+            if "month" in request.query_params:
+                return self._month(request, user)
+            count, last_modified = CalendarService.get_list_validators(user.id)
+            return conditional_list_response(
+                request,
+                f"calendar:{user.id}",
+                count,
+                last_modified,
+                lambda: self._list(request, user),
+            )
+        except NotFound as e:
+            return Response({"error": str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _month(self, request: Request, user: User) -> Response:
+        try:
+            year, month = _parse_month(request.query_params["month"])
+            summary = CalendarService.get_month(user.id, year, month)
+        except ValueError:
+            return Response(
+                {"error": "'month' must be YYYY-MM"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(CalendarMonthSerializer(summary).data)
+
+    def _list(self, request: Request, user: User) -> HttpResponseBase:
+        calendars = CalendarService.get_calendars(user.id)
+        if is_stream_request(request):
+            return stream_list_response(calendars, CalendarSerializer)
+
+        paginator = CalendarPagination()
+
+        def build() -> Dict[str, Any]:
+            page = paginator.paginate_queryset(calendars, request, view=self)
+            return paginator.get_payload(CalendarSerializer(page, many=True).data)
+
+        payload = CalendarService.list_cache.get_or_build(
+            user.id, request.query_params, build
+        )
+        return paginator.get_payload_response(request, payload)
+
+
+class CalendarPlanRangeView(APIView):
+    # 기간과 겹치는 plan 조회 API (?start=YYYY-MM-DD&end=YYYY-MM-DD, 양 끝 포함)
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        user = cast(User, request.user)
+        try:
+            start = date.fromisoformat(request.query_params["start"])
+            end = date.fromisoformat(request.query_params["end"])
+            plans = CalendarService.get_plans_in_range(user.id, start, end)
+        except KeyError as e:
+            return Response(
+                {"error": f"'{e.args[0]}' is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # plan 이 바뀌면 무효화되는 plan 목록 캐시에 함께 둔다
+        data = PlanService.list_cache.get_or_build(
+            user.id,
+            {"start": start, "end": end},
+            lambda: list(PlanSerializer(plans, many=True).data),
+            kind="range",
+        )
+        return Response(data)
+
+
+class CalendarFeedTokenView(APIView):
+    # 캘린더 앱에 등록할 .ics 구독 주소 발급
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        token = CalendarService.get_feed_token(cast(User, request.user))
+        url = reverse("calendar:calendar-feed", args=[token])
+        return Response({"url": request.build_absolute_uri(url)})
+
+
+class CalendarFeedView(APIView):
+    # .ics 구독 피드 (인증 헤더 대신 주소의 서명 토큰으로 사용자 확인)
+    # 캘린더 앱이 몇 분마다 가져가므로, 바뀌지 않았으면 캐시된 집계값으로 304 응답하고
+    # 바뀐 경우에만 plan 을 EVENT_CHUNK_SIZE 개씩 읽어 스트리밍한다
+    authentication_classes: List[Any] = []
+    permission_classes = [AllowAny]
+
+    def get(self, request: Request, token: str) -> HttpResponseBase:
+        user = CalendarService.get_feed_user(token)
+        if user is None:
+            return Response(
+                {"error": "Calendar feed not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        count, last_modified = PlanService.get_list_validators(user)
+        return conditional_list_response(
+            request,
+            f"ics:{user.id}",
+            count,
+            last_modified,
+            lambda: StreamingHttpResponse(
+                iter_calendar(
+                    CalendarService.get_feed_plans(user.id).iterator(
+                        chunk_size=EVENT_CHUNK_SIZE
+                    ),
+                    FEED_NAME,
+                ),
+                content_type="text/calendar; charset=utf-8",
+            ),
+        )
+
+
+class CalendarImportView(APIView):
+    # .ics 파일(요청 본문, text/calendar)의 일정을 plan 으로 일괄 생성
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        try:
+            events = parse_events(request.body.decode("utf-8"))
+            items = validate_bulk(PlanBulkCreateSerializer, events)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        plans = PlanService.bulk_create_plans(items, cast(User, request.user))
+        return Response(
+            {"ids": [plan.id for plan in plans]}, status=status.HTTP_201_CREATED
+        )
+
 
 class CalendarCreateView(APIView):
     # 캘린더 생성 API
@@ -48,6 +202,23 @@ class CalendarCreateView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CalendarBulkCreateView(APIView):
+    # 캘린더 일괄 생성 API (요청 본문은 캘린더 배열). 생성된 id 를 요청 순서대로 반환
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        try:
+            items = validate_bulk(CalendarBulkCreateSerializer, request.data)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        user = cast(User, request.user)
+        calendars = CalendarService.bulk_create_calendars(items, user.id)
+        return Response(
+            {"ids": [calendar.id for calendar in calendars]},
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class CalendarUpdateView(APIView):
     # 캘린더 수정 API
     permission_classes = [IsAuthenticated]
@@ -95,3 +266,76 @@ class CalendarDeleteView(APIView):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class AsyncCalendarListView(AsyncAPIView):
+    # CalendarListView 의 async 버전 (ASGI 에서 스레드 풀을 거치지 않는다)
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        user = cast(User, request.user)
+        if "month" in request.GET:
+            try:
+                year, month = _parse_month(request.GET["month"])
+                summary = await CalendarService.aget_month(user.id, year, month)
+            except ValueError:
+                return self.error(
+                    "'month' must be YYYY-MM", status.HTTP_400_BAD_REQUEST
+                )
+            return self.respond(CalendarMonthSerializer(summary).data)
+        count, last_modified = await CalendarService.aget_list_validators(user.id)
+        return await aconditional_list_response(
+            request,
+            f"calendar:{user.id}",
+            count,
+            last_modified,
+            lambda: self._list(request, user),
+        )
+
+    async def _list(self, request: HttpRequest, user: User) -> HttpResponseBase:
+        calendars = CalendarService.get_calendars(user.id)
+        if is_stream_request(request):
+            return astream_list_response(calendars, CalendarSerializer)
+
+        paginator = CalendarPagination()
+
+        async def build() -> Dict[str, Any]:
+            page = await paginator.apaginate_queryset(calendars, request)
+            return paginator.get_payload(CalendarSerializer(page, many=True).data)
+
+        try:
+            payload = await CalendarService.list_cache.aget_or_build(
+                user.id, request.GET, build
+            )
+        except NotFound as e:
+            return self.error(e.detail, status.HTTP_404_NOT_FOUND)
+        response = self.respond(payload["results"])
+        link = paginator.get_payload_link_header(request, payload)
+        if link is not None:
+            response["Link"] = link
+        return response
+
+    async def post(self, request: HttpRequest) -> HttpResponseBase:
+        # 새로운 캘린더 생성 (CalendarCreateView 의 async 버전)
+        user = cast(User, request.user)
+        calendar = await CalendarService.acreate_calendar(user.id)
+        return self.respond(CalendarSerializer(calendar).data, status.HTTP_201_CREATED)
+
+
+class AsyncCalendarDeleteView(AsyncAPIView):
+    # CalendarDeleteView 의 async 버전 (soft delete)
+
+    async def delete(self, request: HttpRequest, calendar_id: int) -> HttpResponseBase:
+        user = cast(User, request.user)
+        try:
+            await CalendarService.adelete_calendar(calendar_id, user.id)
+        except Calendar.DoesNotExist:
+            return self.error("Calendar not found", status.HTTP_404_NOT_FOUND)
+        return self.respond({"message": "Successfully deleted"})
+
+
+def _parse_month(value: str) -> Tuple[int, int]:
+    # "YYYY-MM" -> (연, 월). Raises : ValueError
+    year, month = value.split("-")
+    if not 1 <= int(month) <= 12:
+        raise ValueError(value)
+    return int(year), int(month)
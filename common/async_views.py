@@ -0,0 +1,111 @@
+import json
+from typing import Any, Callable, Optional, Sequence, Type
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from django.http.response import HttpResponseBase
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+class AsyncAPIView(View):
+    """
+    ASGI 환경에서 스레드 풀을 거치지 않고 실행되는 API 뷰의 기반 클래스.
+    DRF APIView 와 같은 인증 클래스(DEFAULT_AUTHENTICATION_CLASSES)로 사용자를
+    확인하고, 인증된 사용자만 접근할 수 있습니다. 하위 클래스의 핸들러는 모두
+    async def 로 작성해야 합니다.
+    """
+
+    authentication_classes: Sequence[Type[BaseAuthentication]] = (
+        api_settings.DEFAULT_AUTHENTICATION_CLASSES  # type: ignore[assignment]
+    )
+
+    data: Any = None
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Callable[..., Any]:
+        # DRF APIView 와 같이 세션이 아닌 토큰 인증을 쓰므로 CSRF 검사를 하지 않는다
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(  # type: ignore[override]
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        try:
+            user = await self.authenticate(request)
+        except APIException as e:
+            return self.error(e.detail, e.status_code)
+        if user is None:
+            return self.error(
+                "Authentication credentials were not provided.",
+                status.HTTP_401_UNAUTHORIZED,
+            )
+        request.user = user
+
+        if request.method in ("POST", "PUT", "PATCH"):
+            try:
+                self.data = json.loads(request.body or b"null")
+            except ValueError:
+                return self.error("Invalid JSON body", status.HTTP_400_BAD_REQUEST)
+
+        # 핸들러가 async def 이므로 View.dispatch 는 코루틴을 돌려준다
+        return await super().dispatch(request, *args, **kwargs)  # type: ignore[misc,no-any-return]
+
+    async def authenticate(self, request: HttpRequest) -> Optional[Any]:
+        for authentication_class in self.authentication_classes:
+            authenticator = authentication_class()
+            if isinstance(authenticator, JWTAuthentication):
+                # 토큰 검증은 CPU 작업이므로 이벤트 루프에서 바로 처리하고
+                # 사용자 조회만 async ORM 으로 한다
+                user = await self._authenticate_jwt(authenticator, request)
+            else:
+                result = await sync_to_async(authenticator.authenticate)(
+                    request  # type: ignore[arg-type]
+                )
+                user = None if result is None else result[0]
+            if user is not None:
+                return user
+        return None
+
+    @staticmethod
+    async def _authenticate_jwt(
+        authenticator: JWTAuthentication, request: HttpRequest
+    ) -> Optional[Any]:
+        header = authenticator.get_header(request)  # type: ignore[arg-type]
+        raw_token = None if header is None else authenticator.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = authenticator.get_validated_token(raw_token)
+        aget_user = getattr(authenticator, "aget_user", None)
+        if aget_user is not None:
+            # 인증 클래스가 async 조회를 제공하면 그대로 사용한다
+            return await aget_user(token)
+
+        try:
+            user_id = token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        try:
+            user = await authenticator.user_model.objects.aget(
+                **{jwt_settings.USER_ID_FIELD: user_id}
+            )
+        except authenticator.user_model.DoesNotExist:
+            raise AuthenticationFailed("User not found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive")
+        return user
+
+    @staticmethod
+    def respond(data: Any, status_code: int = status.HTTP_200_OK) -> JsonResponse:
+        return JsonResponse(data, status=status_code, safe=False, encoder=JSONEncoder)
+
+    @staticmethod
+    def error(detail: Any, status_code: int) -> JsonResponse:
+        return JsonResponse({"error": str(detail)}, status=status_code)
@@ -0,0 +1,34 @@
+from typing import Any, List, Sequence, TypeVar
+
+from django.db import connections
+from django.db.models import Model
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+M = TypeVar("M", bound=Model)
+
+# 한 요청으로 만들 수 있는 최대 객체 수
+MAX_BULK_CREATE = 500
+
+
+def validate_bulk(serializer_class: Any, data: Any) -> List[Any]:
+    # 배열 요청 본문을 many=True 직렬화로 한 번에 검증
+    # Returns : 항목별 validated_data 목록 (실패하면 ValidationError)
+    if not isinstance(data, list) or not data:
+        raise ValidationError("Expected a non-empty list of objects")
+    if len(data) > MAX_BULK_CREATE:
+        raise ValidationError(f"At most {MAX_BULK_CREATE} objects per request")
+    serializer: serializers.BaseSerializer[Any] = serializer_class(data=data, many=True)
+    serializer.is_valid(raise_exception=True)
+    return list(serializer.validated_data)
+
+
+def bulk_insert(model: Any, objs: Sequence[M]) -> List[M]:
+    # 한 번의 INSERT 로 저장하고 id 를 채운다. 호출한 쪽의 트랜잭션 안에서 사용
+    # (INSERT ... RETURNING 을 지원하지 않는 DB 는 같은 트랜잭션에서 한 건씩 저장)
+    manager = model._default_manager
+    if connections[manager.db].features.can_return_rows_from_bulk_insert:
+        return list(manager.bulk_create(objs))
+    for obj in objs:
+        obj.save(force_insert=True)
+    return list(objs)
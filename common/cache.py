@@ -0,0 +1,133 @@
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Tuple, TypeVar, cast
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.metrics import Counter
+
+T = TypeVar("T")
+
+CACHE_REQUESTS = Counter(
+    "list_cache_requests_total", "List cache lookups", ["cache", "result"]
+)
+CACHE_INVALIDATIONS = Counter(
+    "list_cache_invalidations_total", "List cache version bumps", ["cache"]
+)
+
+_MISSING = object()
+
+
+class VersionedListCache:
+    """
+    사용자별 목록 응답 캐시.
+    데이터 키에 사용자별 버전 번호를 포함하고, 변경이 생기면 버전만 올려
+    이전 키들을 한 번에 무효화합니다 (이전 항목은 timeout 후 자연 소멸).
+    LocMem, Redis, Memcached 등 어떤 Django 캐시 백엔드에서도 동작합니다.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+
+    @property
+    def timeout(self) -> int:
+        return int(getattr(settings, "LIST_CACHE_TIMEOUT", 300))
+
+    def get_or_build(
+        self,
+        user_id: int,
+        params: Mapping[str, Any],
+        builder: Callable[[], T],
+        kind: str = "page",
+    ) -> T:
+        # kind : 같은 사용자 버전 아래에 저장하는 값의 종류 (목록 페이지, 집계값 등)
+        key = self._data_key(user_id, kind, params)
+        cached = cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            CACHE_REQUESTS.inc(cache=self.namespace, result="hit")
+            return cast(T, cached)
+
+        CACHE_REQUESTS.inc(cache=self.namespace, result="miss")
+        value = builder()
+        cache.set(key, value, self.timeout)
+        return value
+
+    async def aget_or_build(
+        self,
+        user_id: int,
+        params: Mapping[str, Any],
+        builder: Callable[[], Awaitable[T]],
+        kind: str = "page",
+    ) -> T:
+        # async 뷰용 get_or_build (builder 는 코루틴 함수)
+        key = await self._adata_key(user_id, kind, params)
+        cached = await cache.aget(key, _MISSING)
+        if cached is not _MISSING:
+            CACHE_REQUESTS.inc(cache=self.namespace, result="hit")
+            return cast(T, cached)
+
+        CACHE_REQUESTS.inc(cache=self.namespace, result="miss")
+        value = await builder()
+        await cache.aset(key, value, self.timeout)
+        return value
+
+    def invalidate(self, user_id: int) -> None:
+        CACHE_INVALIDATIONS.inc(cache=self.namespace)
+        try:
+            cache.incr(self._version_key(user_id))
+        except ValueError:
+            # 버전 키가 없으면 다음 조회 때 새 버전으로 시작한다
+            pass
+
+    async def ainvalidate(self, user_id: int) -> None:
+        CACHE_INVALIDATIONS.inc(cache=self.namespace)
+        try:
+            await cache.aincr(self._version_key(user_id))
+        except ValueError:
+            pass
+
+    def get_version(self, user_id: int) -> int:
+        key = self._version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            # 버전 키가 밀려나도 예전 데이터 키와 겹치지 않도록 시각 기반 값으로 시작
+            initial = int(time.time() * 1000)
+            cache.add(key, initial, timeout=None)
+            version = cache.get(key, initial)
+        return int(version)
+
+    async def aget_version(self, user_id: int) -> int:
+        key = self._version_key(user_id)
+        version = await cache.aget(key)
+        if version is None:
+            initial = int(time.time() * 1000)
+            await cache.aadd(key, initial, timeout=None)
+            version = await cache.aget(key, initial)
+        return int(version)
+
+    def _version_key(self, user_id: int) -> str:
+        return f"list:{self.namespace}:ver:{user_id}"
+
+    def _data_key(self, user_id: int, kind: str, params: Mapping[str, Any]) -> str:
+        return self._format_key(user_id, self.get_version(user_id), kind, params)
+
+    async def _adata_key(
+        self, user_id: int, kind: str, params: Mapping[str, Any]
+    ) -> str:
+        version = await self.aget_version(user_id)
+        return self._format_key(user_id, version, kind, params)
+
+    def _format_key(
+        self, user_id: int, version: int, kind: str, params: Mapping[str, Any]
+    ) -> str:
+        digest = params_digest(params)
+        return f"list:{self.namespace}:{user_id}:{version}:{kind}:{digest}"
+
+
+def params_digest(params: Mapping[str, Any]) -> str:
+    # 쿼리 파라미터(QueryDict 포함)를 순서와 무관한 해시로 만든다
+    lists = getattr(params, "lists", None)
+    items: Iterable[Tuple[str, Any]] = lists() if callable(lists) else params.items()
+    raw = repr(sorted((key, repr(value)) for key, value in items))
+    return hashlib.sha1(raw.encode()).hexdigest()
@@ -0,0 +1,93 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Mapping, Optional, Tuple
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+
+from common.cache import params_digest
+
+
+def conditional_list_response(
+    request: Request,
+    scope: str,
+    count: int,
+    last_modified: Optional[datetime],
+    build_response: Callable[[], HttpResponseBase],
+) -> HttpResponseBase:
+    # 목록 응답의 조건부 GET 처리
+    # Args :
+    # - scope : 응답 구분 값 (예: "plan:<user id>")
+    # - count / last_modified : 집계 쿼리로 구한 행 수와 최종 수정 시각
+    # - build_response : 변경이 있을 때만 호출해 실제 응답을 만든다
+
+    # Returns :
+    # - If-None-Match / If-Modified-Since 가 일치하면 304, 아니면 build_response()
+    etag, timestamp, response = _check_conditional(request, scope, count, last_modified)
+    if response is None:
+        response = build_response()
+        if response.status_code != 200:
+            return response
+    return _set_validators(response, etag, timestamp)
+
+
+async def aconditional_list_response(
+    request: HttpRequest,
+    scope: str,
+    count: int,
+    last_modified: Optional[datetime],
+    build_response: Callable[[], Awaitable[HttpResponseBase]],
+) -> HttpResponseBase:
+    # async 뷰용 conditional_list_response (build_response 는 코루틴 함수)
+    etag, timestamp, response = _check_conditional(request, scope, count, last_modified)
+    if response is None:
+        response = await build_response()
+        if response.status_code != 200:
+            return response
+    return _set_validators(response, etag, timestamp)
+
+
+def _check_conditional(
+    request: HttpRequest,
+    scope: str,
+    count: int,
+    last_modified: Optional[datetime],
+) -> Tuple[str, Optional[int], Optional[HttpResponseBase]]:
+    # DRF Request 와 Django HttpRequest(async 뷰) 모두 지원
+    if isinstance(request, Request):
+        params, http_request = request.query_params, request._request
+    else:
+        params, http_request = request.GET, request
+    etag = make_list_etag(scope, count, last_modified, params)
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    response: Optional[HttpResponseBase] = get_conditional_response(
+        http_request, etag=etag, last_modified=timestamp
+    )
+    return etag, timestamp, response
+
+
+def _set_validators(
+    response: HttpResponseBase, etag: str, timestamp: Optional[int]
+) -> HttpResponseBase:
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    # 공유 캐시에 저장하지 않고, 클라이언트는 매번 재검증하도록 한다
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def make_list_etag(
+    scope: str,
+    count: int,
+    last_modified: Optional[datetime],
+    params: Mapping[str, Any],
+) -> str:
+    # 같은 사용자라도 페이지/검색 조건이 다르면 본문이 다르므로 파라미터도 포함한다
+    stamp = last_modified.isoformat() if last_modified else ""
+    raw = f"{scope}:{count}:{stamp}:{params_digest(params)}"
+    return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
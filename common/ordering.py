@@ -0,0 +1,137 @@
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from django.db import transaction
+from django.db.models import Max, Model, Q, QuerySet
+
+# 정렬 번호 사이 간격. 이동 시 두 번호의 중간값을 쓰고,
+# 간격이 모두 소진된 경우에만 전체를 다시 번호 매긴다 (lazy rebalancing)
+ORDERING_GAP = 1024
+
+M = TypeVar("M", bound=Model)
+
+
+def next_ordering_num(queryset: "QuerySet[M]") -> int:
+    # 목록 맨 뒤에 추가할 때 사용할 정렬 번호
+    last = queryset.aggregate(last=Max("ordering_num"))["last"]
+    return ORDERING_GAP if last is None else last + ORDERING_GAP
+
+
+def assign_ordering_nums(
+    queryset: "QuerySet[M]",
+    objs: Sequence[M],
+    next_num: Optional[Callable[[], int]] = None,
+) -> None:
+    # ordering_num 이 없는 객체에 목록 맨 뒤부터 차례로 번호를 매긴다 (집계 한 번)
+    # next_num : 목록 맨 뒤 번호를 queryset 집계 대신 따로 구할 때 (예: 템플릿 항목 포함)
+    missing = [obj for obj in objs if getattr(obj, "ordering_num") is None]
+    if not missing:
+        return
+    start = next_num() if next_num is not None else next_ordering_num(queryset)
+    for index, obj in enumerate(missing):
+        setattr(obj, "ordering_num", start + index * ORDERING_GAP)
+
+
+async def anext_ordering_num(queryset: "QuerySet[M]") -> int:
+    # next_ordering_num 의 async 버전
+    last = (await queryset.aaggregate(last=Max("ordering_num")))["last"]
+    return ORDERING_GAP if last is None else last + ORDERING_GAP
+
+
+def optional_int(value: Any) -> Optional[int]:
+    # 요청의 after_id / before_id (없으면 None, 숫자가 아니면 ValueError/TypeError)
+    return None if value is None else int(value)
+
+
+def rebalance(queryset: "QuerySet[M]") -> int:
+    # 현재 순서를 유지한 채 ORDERING_GAP 간격으로 다시 번호를 매긴다
+    # Returns : 다시 번호가 매겨진 객체 수
+    objs = list(queryset.order_by("ordering_num", "id"))
+    for index, obj in enumerate(objs, start=1):
+        setattr(obj, "ordering_num", index * ORDERING_GAP)
+    queryset.model._default_manager.bulk_update(objs, ["ordering_num"], batch_size=500)
+    return len(objs)
+
+
+def move_between(
+    queryset: "QuerySet[M]",
+    obj_id: int,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    on_rebalance: Optional[Callable[[List[int]], None]] = None,
+) -> M:
+    # obj_id 객체를 after_id 객체 뒤, before_id 객체 앞으로 이동
+    # 대부분의 경우 이동한 객체 한 행만 수정한다
+    # Args :
+    # - queryset : 정렬 범위 (예: 한 사용자의 plan 목록)
+    # - after_id / before_id : 둘 중 하나만 주면 나머지 이웃은 자동으로 찾는다
+    #   (after_id가 없으면 맨 앞, before_id가 없으면 맨 뒤로 이동)
+    # - on_rebalance : 전체 재정렬이 일어나면 번호가 바뀐 객체 id 목록으로 호출
+
+    # Raises :
+    # - DoesNotExist : 범위 안에서 객체를 찾을 수 없는 경우
+    # - ValueError : after_id / before_id 가 모두 없거나 순서가 맞지 않는 경우
+    if after_id is None and before_id is None:
+        raise ValueError("Either 'after_id' or 'before_id' is required")
+    if after_id == before_id:
+        raise ValueError("'after_id' and 'before_id' must be different")
+    if obj_id in (after_id, before_id):
+        raise ValueError("Cannot move an item next to itself")
+
+    with transaction.atomic():
+        obj = queryset.get(id=obj_id)
+        others = queryset.exclude(id=obj_id).order_by("ordering_num", "id")
+
+        new_num = _between(others, after_id, before_id)
+        if new_num is None:
+            # 두 이웃 사이에 남은 번호가 없으면 한 번만 전체 재정렬
+            rebalance(others)
+            if on_rebalance is not None:
+                on_rebalance(list(others.values_list("pk", flat=True)))
+            new_num = _between(others, after_id, before_id)
+        if new_num is None:
+            raise ValueError("No ordering number left between the neighbours")
+
+        setattr(obj, "ordering_num", new_num)
+        obj.save(update_fields=["ordering_num", "updated_at"])
+        return obj
+
+
+def _between(
+    others: "QuerySet[M]", after_id: Optional[int], before_id: Optional[int]
+) -> Optional[int]:
+    # 이웃 두 객체 사이의 정렬 번호. 남은 간격이 없으면 None
+    after = others.get(id=after_id) if after_id is not None else None
+    before = others.get(id=before_id) if before_id is not None else None
+
+    if after is not None and before is None:
+        before = others.filter(
+            Q(ordering_num__gt=_num(after))
+            | Q(ordering_num=_num(after), id__gt=after.pk)
+        ).first()
+    elif before is not None and after is None:
+        after = (
+            others.filter(
+                Q(ordering_num__lt=_num(before))
+                | Q(ordering_num=_num(before), id__lt=before.pk)
+            )
+            .order_by("-ordering_num", "-id")
+            .first()
+        )
+
+    if after is None:
+        assert before is not None
+        return _num(before) - ORDERING_GAP
+    if before is None:
+        return _num(after) + ORDERING_GAP
+
+    low = _num(after)
+    high = _num(before)
+    if (low, after.pk) > (high, before.pk):
+        raise ValueError("'after_id' must come before 'before_id'")
+    if high - low < 2:
+        return None
+    return (low + high) // 2
+
+
+def _num(obj: Model) -> int:
+    return int(getattr(obj, "ordering_num"))
@@ -0,0 +1,345 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+)
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Field, Model, Q, QuerySet
+from django.http import HttpRequest, QueryDict, StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+# 스트리밍 응답에서 한 번에 읽고 직렬화할 행 수
+STREAM_CHUNK_SIZE = 500
+
+# 목록 원본: QuerySet, 또는 서비스가 여러 테이블을 합쳐 만든 (정렬 전) 목록
+Rows = Union[QuerySet[Any], Sequence[Any]]
+
+
+class KeysetPagination(BasePagination):
+    """
+    (정렬 필드..., id) 기준의 keyset(cursor) 페이지네이션.
+    OFFSET 없이 마지막 행의 정렬 값 다음부터 읽으므로 페이지 위치와 관계없이
+    비용이 일정합니다. 응답 본문은 기존과 같은 목록이며, 다음 페이지 주소는
+    Link 헤더(rel="next")로 전달합니다.
+    """
+
+    ordering: Sequence[str] = ("ordering_num", "id")
+    page_size: Optional[int] = api_settings.PAGE_SIZE
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    next_cursor: Optional[str] = None
+
+    def paginate_queryset(
+        self, queryset: Rows, request: Request, view: Optional[APIView] = None
+    ) -> List[Any]:
+        page_size = self.get_page_size(request)
+        # 다음 페이지 존재 여부를 알기 위해 한 행을 더 읽는다
+        if isinstance(queryset, QuerySet):
+            rows = list(self._page_queryset(queryset, request, page_size))
+        else:
+            rows = self._page_list(queryset, request, page_size)
+        return self._finish_page(rows, page_size)
+
+    async def apaginate_queryset(
+        self, queryset: Rows, request: HttpRequest
+    ) -> List[Any]:
+        # async 뷰용 paginate_queryset (Django async ORM 으로 한 페이지를 읽는다)
+        page_size = self.get_page_size(request)
+        if isinstance(queryset, QuerySet):
+            rows = [
+                row async for row in self._page_queryset(queryset, request, page_size)
+            ]
+        else:
+            rows = self._page_list(queryset, request, page_size)
+        return self._finish_page(rows, page_size)
+
+    def _page_list(
+        self, objs: Sequence[Any], request: HttpRequest, page_size: int
+    ) -> List[Any]:
+        # 메모리에 있는 목록을 같은 정렬/cursor 규칙으로 자른다
+        self.request = request
+        rows = sorted(objs, key=self._sort_key)
+        cursor = _query_params(request).get(self.cursor_query_param)
+        if cursor and rows:
+            values = self._cursor_values(cursor, type(rows[0]))
+            rows = [obj for obj in rows if self._is_after(self._values(obj), values)]
+        return rows[: page_size + 1]
+
+    def _page_queryset(
+        self, queryset: QuerySet[Any], request: HttpRequest, page_size: int
+    ) -> QuerySet[Any]:
+        self.request = request
+        queryset = queryset.order_by(*self.ordering)
+        cursor = _query_params(request).get(self.cursor_query_param)
+        if cursor:
+            values = self._cursor_values(cursor, queryset.model)
+            queryset = queryset.filter(self._after(values))
+        return queryset[: page_size + 1]
+
+    def get_offset(self, request: HttpRequest) -> int:
+        # 순위 목록(검색 결과)용 cursor 는 [다음 위치] 하나만 담는다
+        cursor = _query_params(request).get(self.cursor_query_param)
+        if not cursor:
+            return 0
+        values = self._decode(cursor)
+        if (
+            len(values) != 1
+            or not isinstance(values[0], int)
+            or isinstance(values[0], bool)
+            or values[0] < 0
+        ):
+            raise NotFound("Invalid cursor")
+        return values[0]
+
+    def paginate_ranked(self, rows: Rows, request: HttpRequest) -> List[Any]:
+        # 이미 순위대로 정렬된 목록을 위치 기준으로 자른다 (정렬 필드 cursor 를 쓸 수 없는 경우)
+        # rows 는 get_offset() + get_page_size() 보다 한 행 이상 더 읽어 넘긴다
+        self.request = request
+        offset = self.get_offset(request)
+        page_size = self.get_page_size(request)
+        page = list(rows[offset : offset + page_size + 1])
+        self.next_cursor = (
+            self.encode_cursor([offset + page_size]) if len(page) > page_size else None
+        )
+        return page[:page_size]
+
+    def _finish_page(self, rows: List[Any], page_size: int) -> List[Any]:
+        page = rows[:page_size]
+        self.next_cursor = (
+            self.encode_cursor(self._values(page[-1]))
+            if len(rows) > page_size
+            else None
+        )
+        return page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        response = Response(data)
+        link = self.get_next_link_header()
+        if link is not None:
+            response["Link"] = link
+        return response
+
+    def get_payload(self, data: Any) -> Dict[str, Any]:
+        # 캐시에 저장할 수 있는 형태 (직렬화된 목록 + 다음 cursor)
+        return {"results": list(data), "next": self.next_cursor}
+
+    def get_payload_response(
+        self, request: Request, payload: Dict[str, Any]
+    ) -> Response:
+        self.request = request
+        self.next_cursor = payload["next"]
+        return self.get_paginated_response(payload["results"])
+
+    def get_payload_link_header(
+        self, request: HttpRequest, payload: Dict[str, Any]
+    ) -> Optional[str]:
+        # async 뷰용: 캐시에서 꺼낸 payload 에도 Link 헤더를 붙일 수 있도록
+        # 페이지를 자를 때 정한 값이 아니라 payload 의 다음 cursor 로 만든다
+        self.request = request
+        self.next_cursor = payload["next"]
+        return self.get_next_link_header()
+
+    def get_next_link_header(self) -> Optional[str]:
+        next_link = self.get_next_link()
+        return None if next_link is None else f'<{next_link}>; rel="next"'
+
+    def get_page_size(self, request: HttpRequest) -> int:
+        try:
+            page_size = int(_query_params(request).get(self.page_size_query_param, ""))
+        except ValueError:
+            return self.page_size or self.max_page_size
+        if page_size <= 0:
+            return self.page_size or self.max_page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def encode_cursor(self, values: Sequence[Any]) -> str:
+        raw = json.dumps(
+            [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> List[Any]:
+        values = self._decode(cursor)
+        if len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        if not all(
+            isinstance(value, (int, float, str)) and not isinstance(value, bool)
+            for value in values
+        ):
+            raise NotFound("Invalid cursor")
+        return values
+
+    @staticmethod
+    def _decode(cursor: str) -> List[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(values, list):
+            raise NotFound("Invalid cursor")
+        return values
+
+    def _cursor_values(self, cursor: str, model: Type[Model]) -> List[Any]:
+        # cursor 값을 정렬 필드의 타입으로 바꾼다. 바꿀 수 없으면 (조작된 cursor) 404
+        values = self.decode_cursor(cursor)
+        fields = [
+            cast("Field[Any, Any]", model._meta.get_field(name.lstrip("-")))
+            for name in self.ordering
+        ]
+        try:
+            return [field.to_python(value) for field, value in zip(fields, values)]
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+
+    def _values(self, obj: Model) -> List[Any]:
+        return [getattr(obj, field.lstrip("-")) for field in self.ordering]
+
+    def _sort_key(self, obj: Model) -> List[Any]:
+        # 숫자 정렬 필드만 내림차순(-)을 지원한다
+        return [
+            -value if field.startswith("-") else value
+            for field, value in zip(self.ordering, self._values(obj))
+        ]
+
+    def _is_after(self, row: Sequence[Any], values: Sequence[Any]) -> bool:
+        # _after 와 같은 비교를 메모리에서 한다
+        for field, current, cursor in zip(self.ordering, row, values):
+            if current != cursor:
+                return bool(
+                    current < cursor if field.startswith("-") else current > cursor
+                )
+        return False
+
+    def _after(self, values: Sequence[Any]) -> Q:
+        # (a, b, c) > (x, y, z) 를 a > x OR (a = x AND b > y) OR ... 로 풀어 쓴다
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            branch = Q(**{f"{name}__{lookup}": values[index]})
+            for prev_field, prev_value in zip(self.ordering[:index], values):
+                branch &= Q(**{prev_field.lstrip("-"): prev_value})
+            condition |= branch
+        # 첫 정렬 필드에 범위 조건을 하나 더 걸어 인덱스 범위 탐색이 되도록 한다
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & condition
+
+
+def is_stream_request(request: HttpRequest) -> bool:
+    # ?stream=true 이면 페이지 구분 없이 전체 목록을 스트리밍한다
+    return _query_params(request).get("stream", "").lower() in ("1", "true")
+
+
+def _query_params(request: HttpRequest) -> QueryDict:
+    # DRF Request 와 Django HttpRequest(async 뷰) 모두 지원
+    return request.query_params if isinstance(request, Request) else request.GET
+
+
+def stream_list_response(
+    queryset: Rows,
+    serializer_class: Type[BaseSerializer[Any]],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> StreamingHttpResponse:
+    # 전체 목록을 JSON 배열로 스트리밍한다.
+    # 서버 메모리에는 chunk_size 만큼의 행만 올라간다.
+    return StreamingHttpResponse(
+        _stream_json_array(queryset, serializer_class, chunk_size),
+        content_type="application/json",
+    )
+
+
+def _stream_json_array(
+    queryset: Rows,
+    serializer_class: Type[BaseSerializer[Any]],
+    chunk_size: int,
+) -> Iterator[str]:
+    yield "["
+    first = True
+    chunk: List[Any] = []
+    rows = (
+        queryset.iterator(chunk_size=chunk_size)
+        if isinstance(queryset, QuerySet)
+        else iter(queryset)
+    )
+    for obj in rows:
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield ("" if first else ",") + _encode_chunk(serializer_class, chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield ("" if first else ",") + _encode_chunk(serializer_class, chunk)
+    yield "]"
+
+
+def astream_list_response(
+    queryset: Rows,
+    serializer_class: Type[BaseSerializer[Any]],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> StreamingHttpResponse:
+    # async 뷰용 stream_list_response (ASGI 서버가 async 이터레이터를 직접 소비)
+    return StreamingHttpResponse(
+        _astream_json_array(queryset, serializer_class, chunk_size),
+        content_type="application/json",
+    )
+
+
+async def _astream_json_array(
+    queryset: Rows,
+    serializer_class: Type[BaseSerializer[Any]],
+    chunk_size: int,
+) -> AsyncIterator[str]:
+    yield "["
+    first = True
+    chunk: List[Any] = []
+    if not isinstance(queryset, QuerySet):
+        # 이미 메모리에 있는 목록은 DB 를 읽지 않고 chunk_size 개씩 나눠 보낸다
+        for start in range(0, len(queryset), chunk_size):
+            chunk = list(queryset[start : start + chunk_size])
+            yield ("" if start == 0 else ",") + _encode_chunk(serializer_class, chunk)
+        yield "]"
+        return
+    async for obj in queryset.aiterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield ("" if first else ",") + _encode_chunk(serializer_class, chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield ("" if first else ",") + _encode_chunk(serializer_class, chunk)
+    yield "]"
+
+
+def _encode_chunk(serializer_class: Type[BaseSerializer[Any]], rows: List[Any]) -> str:
+    data = serializer_class(rows, many=True).data
+    return ",".join(json.dumps(item, cls=JSONEncoder) for item in data)
@@ -0,0 +1,21 @@
+import re
+from typing import Any
+from unittest import TestCase
+
+from django.db.models import QuerySet
+
+
+class QueryPlanAssertionsMixin(TestCase):
+    """
+    SQLite의 EXPLAIN QUERY PLAN 결과로 쿼리가 인덱스를 쓰는지 검사합니다.
+    """
+
+    def assertUsesIndex(self, queryset: QuerySet[Any], index_name: str) -> None:
+        plan = queryset.explain()
+        # 지정한 인덱스로 탐색해야 하고
+        self.assertRegex(plan, rf"SEARCH \S+ USING (COVERING )?INDEX {index_name}\b")
+        # 테이블 전체 스캔이나 정렬용 임시 B-tree가 없어야 한다
+        self.assertIsNone(
+            re.search(r"\bSCAN \S+$", plan, re.MULTILINE), f"table scan:\n{plan}"
+        )
+        self.assertNotIn("USE TEMP B-TREE", plan)
@@ -11,7 +11,6 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
-import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -52,6 +51,7 @@ INSTALLED_APPS = [
     "login",
     "plan",
     "planner",
+    "sync",
     "user",
 ]
 
@@ -116,6 +116,22 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# 비밀번호 해시: 맨 앞의 해셔로 새로 해시하고, 나머지는 기존 해시 검증용.
+# 로그인에 성공하면 다른 해셔/비용으로 저장된 비밀번호는 자동으로 다시 해시된다.
+# argon2-cffi 를 설치했다면 user.hashers.TunedArgon2PasswordHasher 를 맨 앞에 둘 수 있다
+PASSWORD_HASHERS = [
+    "user.hashers.TunedScryptPasswordHasher",
+    "user.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# 해시 비용 (python manage.py benchmark_password_hashers 결과로 조정)
+PASSWORD_HASHING = {
+    "SCRYPT_WORK_FACTOR": 2**14,
+    "SCRYPT_BLOCK_SIZE": 8,
+    "SCRYPT_PARALLELISM": 1,
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -147,10 +163,66 @@ CACHES = {
     },
 }
 
+# 사용자별 목록 응답 캐시 유지 시간 (초). 변경 시에는 버전 키로 즉시 무효화됨
+LIST_CACHE_TIMEOUT = 300
+
+# 로그인/로그아웃 감사 기록 버퍼 (login.audit.LoginAuditWriter)
+# (테스트는 @override_settings(LOGIN_AUDIT={"EAGER": True}) 로 요청 안에서 바로 기록)
+LOGIN_AUDIT = {
+    "BATCH_SIZE": 200,
+    "FLUSH_INTERVAL_MS": 200,
+    "MAX_QUEUE_SIZE": 10000,
+    "BLOCK_TIMEOUT_MS": 5,
+    "EAGER": False,
+}
+
+# 오래된 로그인 기록 보관 (login archive_logins 명령, 주기적으로 실행)
+# RETENTION_DAYS 가 지난 행은 DIRECTORY 의 월별 gzip JSONL 로 옮기고 삭제한다
+LOGIN_ARCHIVE = {
+    "RETENTION_DAYS": 180,
+    "DIRECTORY": BASE_DIR / "archive" / "logins",
+    "BATCH_SIZE": 5000,
+}
+
+# /metrics/ 를 읽을 수 있는 Prometheus 수집기 주소 (IP 또는 CIDR)
+METRICS = {
+    "ALLOWED_IPS": ["127.0.0.1", "::1"],
+}
+
+# delta sync (/sync/?since=) 한 번에 내려줄 최대 변경 수와, 아직 커밋되지 않은
+# 변경을 건너뛰지 않도록 cursor 를 앞당기지 않는 최근 구간 (그 구간의 변경은 다시 보낸다)
+SYNC = {
+    "PAGE_SIZE": 1000,
+    "LAG_SECONDS": 5,
+    # /sync/events/ 변경 알림. 워커 프로세스가 여럿이면 프로세스 간 broker 로 바꾼다
+    "BROKER": "sync.broker.InProcessBroker",
+    "HEARTBEAT_SECONDS": 15,
+    "COALESCE_SECONDS": 0.5,
+}
+
+# 로그아웃한 refresh token 폐기 목록 (user.revocation.TokenRevocationList)
+TOKEN_REVOCATION = {
+    "BLOOM_CAPACITY": 100000,
+    "BLOOM_ERROR_RATE": 0.001,
+    "REFRESH_INTERVAL_MS": 1000,
+}
+
+# /user/login/ 실패 횟수 제한 (user.throttling.LoginThrottle)
+# IP 별, 계정별 sliding window 안의 실패 횟수가 LIMIT 에 이르면 429 로 거절
+LOGIN_THROTTLE = {
+    "IP_LIMIT": 20,
+    "IP_WINDOW_SECONDS": 60,
+    "USERNAME_LIMIT": 5,
+    "USERNAME_WINDOW_SECONDS": 300,
+    "LOCAL_CACHE_SIZE": 10000,
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ),
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.KeysetPagination",
+    "PAGE_SIZE": 100,
 }
 
 SIMPLE_JWT = {
@@ -15,14 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admiㅜ
+from django.contrib import admin
 from django.urls import include, path
 
+from common.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("user/", include("user.urls")),
     path("plan/", include("plan.urls")),
     path("planner/", include("planner.urls")),
     path("calendar/", include("calendars.urls")),
-
+    path("login/", include("login.urls")),
+    path("sync/", include("sync.urls")),
+    path("metrics/", metrics_view, name="metrics"),
 ]
@@ -1,3 +1,45 @@
+from typing import Any, Optional
+
 from django.contrib import admin
+from django.http import HttpRequest
+
+from .models import LoginIpRollup, LoginRollup
+
+
+class ReadOnlyRollupAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    # 집계 테이블은 rollup_logins 명령만 기록한다
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: Optional[Any] = None
+    ) -> bool:
+        return False
+
+    def has_delete_permission(
+        self, request: HttpRequest, obj: Optional[Any] = None
+    ) -> bool:
+        return False
+
+
+@admin.register(LoginRollup)
+class LoginRollupAdmin(ReadOnlyRollupAdmin):
+    list_display = (
+        "bucket_start",
+        "granularity",
+        "successes",
+        "failures",
+        "unique_users",
+    )
+    list_filter = ("granularity",)
+    date_hierarchy = "bucket_start"
+    ordering = ("-bucket_start",)
+
 
-# Register your models here.
+@admin.register(LoginIpRollup)
+class LoginIpRollupAdmin(ReadOnlyRollupAdmin):
+    list_display = ("day", "user_ip", "successes", "failures")
+    search_fields = ("user_ip",)
+    date_hierarchy = "day"
+    ordering = ("-day", "-failures")
@@ -0,0 +1,305 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.db.models import Case, DateTimeField, Value, When
+from django.dispatch import receiver
+from django.utils import timezone
+
+from common.metrics import Counter, Gauge
+from user.models import User
+
+from .models import Login, UserAgent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EVENTS = Counter(
+    "login_audit_events_total", "Login audit events enqueued", ["kind"]
+)
+AUDIT_DROPPED = Counter(
+    "login_audit_dropped_total", "Login audit events dropped (queue full)", ["kind"]
+)
+AUDIT_BACKPRESSURE = Counter(
+    "login_audit_backpressure_total",
+    "Enqueue calls that had to wait for queue space",
+    ["kind"],
+)
+AUDIT_WRITTEN = Counter(
+    "login_audit_written_total", "Login audit events written to the DB", ["kind"]
+)
+AUDIT_FLUSH_ERRORS = Counter(
+    "login_audit_flush_errors_total", "Failed login audit batch writes"
+)
+AUDIT_QUEUE_DEPTH = Gauge("login_audit_queue_depth", "Pending login audit events")
+
+DEFAULTS: Dict[str, Any] = {
+    # 한 번에 bulk_create 할 최대 이벤트 수 (N)
+    "BATCH_SIZE": 200,
+    # 첫 이벤트 이후 배치를 기다리는 최대 시간 (T, ms)
+    "FLUSH_INTERVAL_MS": 200,
+    # 대기열 최대 길이. 가득 차면 BLOCK_TIMEOUT_MS 만큼 기다린 뒤 버린다
+    "MAX_QUEUE_SIZE": 10000,
+    "BLOCK_TIMEOUT_MS": 5,
+    # True 이면 대기열 없이 요청 안에서 바로 기록한다 (테스트용)
+    "EAGER": False,
+}
+
+# 기록 스레드가 기억해 두는 User-Agent id 최대 개수
+AGENT_CACHE_SIZE = 1000
+
+
+class LoginAuditWriter:
+    """
+    로그인/로그아웃 감사 기록을 요청 경로 밖에서 모아 쓰는 버퍼.
+    요청은 enqueue 만 하고, 백그라운드 스레드가 BATCH_SIZE 개 또는
+    FLUSH_INTERVAL_MS 마다 bulk_create 로 한 번에 기록합니다.
+    프로세스가 비정상 종료되면 대기열에 남은 이벤트는 유실될 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULTS["BATCH_SIZE"],
+        flush_interval_ms: int = DEFAULTS["FLUSH_INTERVAL_MS"],
+        max_queue_size: int = DEFAULTS["MAX_QUEUE_SIZE"],
+        block_timeout_ms: int = DEFAULTS["BLOCK_TIMEOUT_MS"],
+        eager: bool = DEFAULTS["EAGER"],
+        autostart: bool = True,
+    ) -> None:
+        # autostart=False 이면 기록 스레드를 띄우지 않으므로 flush() 를 직접 호출해야 한다
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.block_timeout = block_timeout_ms / 1000
+        self.eager = eager
+        self.autostart = autostart
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # User-Agent 문자열 -> user_agents.id (같은 브라우저의 반복 로그인은 조회 없이 연결)
+        self._agent_ids: Dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls) -> "LoginAuditWriter":
+        options = {**DEFAULTS, **getattr(settings, "LOGIN_AUDIT", {})}
+        return cls(
+            batch_size=options["BATCH_SIZE"],
+            flush_interval_ms=options["FLUSH_INTERVAL_MS"],
+            max_queue_size=options["MAX_QUEUE_SIZE"],
+            block_timeout_ms=options["BLOCK_TIMEOUT_MS"],
+            eager=options["EAGER"],
+        )
+
+    def reload_settings(self) -> None:
+        # 설정이 바뀌면 (override_settings) 대기열을 제외한 옵션을 다시 읽는다
+        options = {**DEFAULTS, **getattr(settings, "LOGIN_AUDIT", {})}
+        self.batch_size = options["BATCH_SIZE"]
+        self.flush_interval = options["FLUSH_INTERVAL_MS"] / 1000
+        self.block_timeout = options["BLOCK_TIMEOUT_MS"] / 1000
+        self.eager = options["EAGER"]
+
+    def record_login(
+        self,
+        user_id: int,
+        request_meta: Dict[str, Any],
+        is_success: bool = True,
+        refresh_jti: Optional[str] = None,
+    ) -> bool:
+        return self.enqueue(
+            {
+                "kind": "login",
+                "user_id": user_id,
+                "refresh_jti": refresh_jti,
+                "user_ip": request_meta.get("REMOTE_ADDR", ""),
+                "user_agent": request_meta.get("HTTP_USER_AGENT", ""),
+                "is_success": is_success,
+                "at": timezone.now(),
+            }
+        )
+
+    def record_logout(self, user_id: int, refresh_jti: Optional[str] = None) -> bool:
+        return self.enqueue(
+            {
+                "kind": "logout",
+                "user_id": user_id,
+                "refresh_jti": refresh_jti,
+                "at": timezone.now(),
+            }
+        )
+
+    def enqueue(self, event: Dict[str, Any]) -> bool:
+        # Returns : 대기열에 들어갔으면 True, 가득 차서 버려졌으면 False
+        kind = event["kind"]
+        AUDIT_EVENTS.inc(kind=kind)
+        if self.eager:
+            self._write([event])
+            return True
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # 기록 스레드가 따라잡을 때까지 잠깐 기다리고, 그래도 가득 차면 버린다
+            AUDIT_BACKPRESSURE.inc(kind=kind)
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                AUDIT_DROPPED.inc(kind=kind)
+                return False
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def flush(self) -> int:
+        # 대기열에 쌓인 이벤트를 호출한 스레드에서 모두 기록한다
+        # Returns : 기록을 시도한 이벤트 수
+        count = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return count
+            self._write(batch)
+            count += len(batch)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None or not self.autostart:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="login-audit-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            self._write(batch)
+            close_old_connections()
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        # 첫 이벤트를 기다린 뒤 batch_size 개가 차거나 flush_interval 이 지나면 반환
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        logins = [event for event in batch if event["kind"] == "login"]
+        logouts = [event for event in batch if event["kind"] == "logout"]
+        try:
+            agent_ids = self._resolve_agents(event["user_agent"] for event in logins)
+            # 같은 배치의 로그인 기록이 먼저 들어가야 로그아웃이 그 행을 찾는다
+            Login.objects.bulk_create(
+                [
+                    Login(
+                        user_num_id=event["user_id"],
+                        user_ip=event["user_ip"],
+                        agent_id=agent_ids[event["user_agent"]],
+                        is_success=event["is_success"],
+                        login_at=event["at"],
+                        refresh_jti=event["refresh_jti"],
+                    )
+                    for event in logins
+                ]
+            )
+            self._write_last_login(logins)
+            for event in logouts:
+                self._write_logout(event)
+        except Exception:
+            # 기억해 둔 User-Agent id 가 원인일 수 있으므로 다음 배치는 다시 조회한다
+            self._agent_ids.clear()
+            AUDIT_FLUSH_ERRORS.inc()
+            logger.exception("Failed to write %d login audit events", len(batch))
+        else:
+            AUDIT_WRITTEN.inc(len(logins), kind="login")
+            AUDIT_WRITTEN.inc(len(logouts), kind="logout")
+        finally:
+            AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _resolve_agents(self, values: Iterable[str]) -> Dict[str, int]:
+        values = set(values)
+        if self.eager:
+            # 요청의 트랜잭션 안에서 기록하므로 롤백될 수 있는 id 는 기억하지 않는다
+            return UserAgent.objects.resolve(values)
+        missing = values - self._agent_ids.keys()
+        if missing:
+            if len(self._agent_ids) + len(missing) > AGENT_CACHE_SIZE:
+                self._agent_ids.clear()
+                missing = values
+            self._agent_ids.update(UserAgent.objects.resolve(missing))
+        return {value: self._agent_ids[value] for value in values}
+
+    @staticmethod
+    def _write_last_login(logins: List[Dict[str, Any]]) -> None:
+        # 배치 안의 성공한 로그인으로 사용자별 last_login 을 UPDATE 한 번에 갱신한다
+        latest: Dict[int, Any] = {}
+        for event in logins:
+            if event["is_success"]:
+                user_id = event["user_id"]
+                latest[user_id] = max(event["at"], latest.get(user_id, event["at"]))
+        if not latest:
+            return
+        User.objects.filter(pk__in=latest).update(
+            last_login=Case(
+                *[When(pk=user_id, then=Value(at)) for user_id, at in latest.items()],
+                output_field=DateTimeField(),
+            )
+        )
+
+    @staticmethod
+    def _write_logout(event: Dict[str, Any]) -> None:
+        if event["refresh_jti"]:
+            # refresh token 의 jti 로 해당 로그인 행의 logout_at 한 컬럼만 UPDATE 한다
+            updated = Login.objects.filter(
+                refresh_jti=event["refresh_jti"], user_num_id=event["user_id"]
+            ).update(logout_at=event["at"])
+            if updated:
+                return
+
+        # jti 를 저장하기 전에 발급된 토큰은 (jti 가 없거나 일치하는 행이 없으면)
+        # jti 가 없는 로그인 기록 중 가장 최근 것에 남긴다. jti 가 있는 행은 다른
+        # 기기의 세션이므로 닫지 않는다 (해당하는 행이 없으면 기록하지 않는다)
+        # (login_user_recent_idx 사용. MySQL 은 같은 테이블을 서브쿼리로 쓰는
+        # UPDATE 를 허용하지 않아 조회와 UPDATE 를 나눈다)
+        login_id = (
+            Login.objects.filter(user_num_id=event["user_id"], refresh_jti__isnull=True)
+            .order_by("-login_at")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if login_id is not None:
+            Login.objects.filter(id=login_id).update(logout_at=event["at"])
+
+
+# 프로세스 전역 writer (설정은 LOGIN_AUDIT)
+audit_writer = LoginAuditWriter.from_settings()
+
+
+@receiver(setting_changed)
+def _reload_audit_settings(setting: str, **kwargs: Any) -> None:
+    if setting == "LOGIN_AUDIT":
+        audit_writer.reload_settings()
@@ -0,0 +1,140 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from login.models import Login, RollupWatermark
+from login.services import ROLLUP_NAME
+
+DEFAULTS: Dict[str, Any] = {
+    # 이보다 오래된 로그인 기록은 아카이브 파일로 옮기고 logins 테이블에서 삭제
+    "RETENTION_DAYS": 180,
+    "DIRECTORY": "archive/logins",
+    "BATCH_SIZE": 5000,
+}
+
+# 아카이브에 남기는 컬럼 (User-Agent 는 id 대신 문자열로 풀어서 저장)
+ARCHIVE_FIELDS = (
+    "id",
+    "user_num_id",
+    "login_at",
+    "logout_at",
+    "user_ip",
+    "is_success",
+    "refresh_jti",
+    "agent__value",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "보존 기간이 지난 로그인 기록을 월별 gzip JSONL 파일 "
+        "(logins-YYYY-MM.jsonl.gz) 로 옮기고 batch 단위로 삭제"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        options = {**DEFAULTS, **getattr(settings, "LOGIN_ARCHIVE", {})}
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=options["RETENTION_DAYS"],
+            help="보존 기간 (일)",
+        )
+        parser.add_argument(
+            "--output-dir",
+            default=str(options["DIRECTORY"]),
+            help="아카이브 파일을 둘 디렉터리",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=options["BATCH_SIZE"],
+            help="한 번에 옮기고 삭제할 행 수",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="파일을 쓰거나 삭제하지 않고 대상 수만 출력",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        output_dir = Path(options["output_dir"])
+        rows_to_archive = Login.objects.filter(login_at__lt=cutoff)
+        # 집계(rollup_logins)를 쓰는 경우 아직 집계하지 않은 행은 남겨 둔다
+        rolled_up_id = (
+            RollupWatermark.objects.filter(name=ROLLUP_NAME)
+            .values_list("last_id", flat=True)
+            .first()
+        )
+        if rolled_up_id is not None:
+            rows_to_archive = rows_to_archive.filter(id__lte=rolled_up_id)
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"[dry-run] {rows_to_archive.count()} logins older than "
+                f"{cutoff:%Y-%m-%d} would be archived to {output_dir}"
+            )
+            return
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        archived = 0
+        last_id = 0
+        while True:
+            # 오래된 행은 id 앞쪽에 모여 있으므로 id 순서로 읽으면 인덱스 없이도 빠르다
+            rows = list(
+                rows_to_archive.filter(id__gt=last_id)
+                .order_by("id")
+                .values(*ARCHIVE_FIELDS)[: options["batch_size"]]
+            )
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            # 파일에 먼저 기록(fsync)한 뒤에 삭제한다. 그 사이에 중단되면 다음 실행에서
+            # 같은 행이 한 번 더 기록될 수 있으므로, 읽는 쪽은 id 로 중복을 제거한다
+            for month, month_rows in _group_by_month(rows).items():
+                _append(output_dir / f"logins-{month}.jsonl.gz", month_rows)
+            Login.objects.filter(id__in=[row["id"] for row in rows]).delete()
+
+            archived += len(rows)
+            self.stdout.write(f"archived {archived} logins (last id {last_id})")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully archived {archived} logins older than {cutoff:%Y-%m-%d}"
+            )
+        )
+
+
+def _group_by_month(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(f"{row['login_at']:%Y-%m}", []).append(row)
+    return groups
+
+
+def _append(path: Path, rows: List[Dict[str, Any]]) -> None:
+    # gzip 파일에 이어 쓰면 멤버가 추가되며, gzip.open 으로 전체를 순서대로 읽을 수 있다
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as archive:
+            for row in rows:
+                record = {
+                    "id": row["id"],
+                    "user_id": row["user_num_id"],
+                    "login_at": row["login_at"].isoformat(),
+                    "logout_at": row["logout_at"] and row["logout_at"].isoformat(),
+                    "user_ip": row["user_ip"],
+                    "user_agent": row["agent__value"],
+                    "is_success": row["is_success"],
+                    "refresh_jti": row["refresh_jti"],
+                }
+                archive.write(json.dumps(record).encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
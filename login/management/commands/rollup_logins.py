@@ -0,0 +1,34 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from login.services import DEFAULT_LAG_SECONDS, LoginRollupService
+
+
+class Command(BaseCommand):
+    help = (
+        "마지막 집계 이후의 로그인 기록을 시간/일/IP 별 집계 테이블에 반영 "
+        "(cron 등으로 주기적으로 실행)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, default=5000, help="한 트랜잭션에서 집계할 행 수"
+        )
+        parser.add_argument(
+            "--lag-seconds",
+            type=int,
+            default=DEFAULT_LAG_SECONDS,
+            help="이보다 최근 기록은 다음 실행에서 집계 (아직 기록 중인 배치 대비)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="집계를 지우고 남아 있는 로그인 기록으로 다시 집계",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["rebuild"]:
+            LoginRollupService.rebuild()
+        count = LoginRollupService.run(options["batch_size"], options["lag_seconds"])
+        self.stdout.write(self.style.SUCCESS(f"Successfully rolled up {count} logins"))
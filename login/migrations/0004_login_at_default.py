@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("login", "0003_rename_login_id_login_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="login",
+            name="login_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
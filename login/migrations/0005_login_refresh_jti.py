@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("login", "0004_login_at_default"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="login",
+            name="refresh_jti",
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name="login",
+            index=models.Index(
+                fields=["user_num", "-login_at"], name="login_user_recent_idx"
+            ),
+        ),
+    ]
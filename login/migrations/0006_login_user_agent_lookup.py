@@ -0,0 +1,81 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:11
+
+import hashlib
+from typing import Any
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_user_agents(apps: Any, schema_editor: Any) -> None:
+    # 기존 user_agent 문자열을 user_agents 로 옮기고 id 로 연결 (id 범위별로 나눠 처리)
+    Login = apps.get_model("login", "Login")
+    UserAgent = apps.get_model("login", "UserAgent")
+    batch_size = 5000
+    last_id = 0
+    while True:
+        rows = list(
+            Login.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "user_agent")[:batch_size]
+        )
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        by_digest = {
+            hashlib.blake2b(value.encode(), digest_size=16).hexdigest(): value
+            for value in {value for _, value in rows}
+        }
+        UserAgent.objects.bulk_create(
+            [
+                UserAgent(digest=digest, value=value)
+                for digest, value in by_digest.items()
+            ],
+            ignore_conflicts=True,
+        )
+        agent_ids = {
+            by_digest[digest]: pk
+            for digest, pk in UserAgent.objects.filter(
+                digest__in=by_digest
+            ).values_list("digest", "id")
+        }
+        for value, agent_id in agent_ids.items():
+            Login.objects.filter(
+                id__in=[pk for pk, row_value in rows if row_value == value]
+            ).update(agent_id=agent_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("login", "0005_login_refresh_jti"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserAgent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("digest", models.CharField(max_length=32, unique=True)),
+                ("value", models.TextField()),
+            ],
+            options={
+                "db_table": "user_agents",
+            },
+        ),
+        migrations.AddField(
+            model_name="login",
+            name="agent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="login.useragent",
+            ),
+        ),
+        migrations.RunPython(copy_user_agents, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="login",
+            name="user_agent",
+        ),
+    ]
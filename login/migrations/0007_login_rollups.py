@@ -0,0 +1,91 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("login", "0006_login_user_agent_lookup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("last_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "rollup_watermarks",
+            },
+        ),
+        migrations.CreateModel(
+            name="LoginDailyUser",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("day", models.DateField()),
+                ("user_id", models.BigIntegerField()),
+            ],
+            options={
+                "db_table": "login_daily_users",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "user_id"), name="login_daily_user_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="LoginIpRollup",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("day", models.DateField()),
+                ("user_ip", models.CharField(max_length=50)),
+                ("successes", models.PositiveIntegerField(default=0)),
+                ("failures", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "login_ip_rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["day", "-failures"], name="login_ip_day_failures_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "user_ip"), name="login_ip_day_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="LoginRollup",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "hour"), ("day", "day")], max_length=4
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("successes", models.PositiveIntegerField(default=0)),
+                ("failures", models.PositiveIntegerField(default=0)),
+                ("unique_users", models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "login_rollups",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("granularity", "bucket_start"),
+                        name="login_rollup_bucket_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,18 +1,146 @@
+import hashlib
+from typing import Dict, Iterable
+
 from django.db import models
+from django.utils import timezone
 
 from user.models import User
 
 
+class UserAgentManager(models.Manager["UserAgent"]):
+    def resolve(self, values: Iterable[str]) -> Dict[str, int]:
+        # User-Agent 문자열 -> id. 없는 문자열은 새로 만든다 (동시 생성은 무시 후 재조회)
+        # Returns : {문자열: UserAgent id}
+        by_digest = {UserAgent.digest_of(value): value for value in set(values)}
+        if not by_digest:
+            return {}
+        self.bulk_create(
+            [
+                UserAgent(digest=digest, value=value)
+                for digest, value in by_digest.items()
+            ],
+            ignore_conflicts=True,
+        )
+        return {
+            by_digest[digest]: pk
+            for digest, pk in self.filter(digest__in=by_digest).values_list(
+                "digest", "id"
+            )
+        }
+
+
+class UserAgent(models.Model):
+    # 로그인 기록의 User-Agent 문자열 (같은 문자열은 한 행만 두고 id 로 참조)
+    id = models.BigAutoField(primary_key=True)
+    digest = models.CharField(max_length=32, unique=True)
+    value = models.TextField()
+
+    objects = UserAgentManager()
+
+    class Meta:
+        db_table = "user_agents"
+
+    def __str__(self) -> str:
+        return self.value
+
+    @staticmethod
+    def digest_of(value: str) -> str:
+        # 긴 문자열에 unique 인덱스를 걸지 않도록 해시를 키로 쓴다
+        return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
 class Login(models.Model):
     id = models.BigAutoField(primary_key=True)
     user_num = models.ForeignKey(User, on_delete=models.CASCADE)
-    login_at = models.DateTimeField(auto_now_add=True)
+    # 감사 기록은 나중에 모아서 쓰므로 이벤트 발생 시각을 직접 지정할 수 있어야 한다
+    login_at = models.DateTimeField(default=timezone.now, editable=False)
     logout_at = models.DateTimeField(
         null=True, blank=True
     )  # auto_now_add 제거, null/blank 허용
     user_ip = models.CharField(max_length=50)
-    user_agent = models.TextField()
+    # User-Agent 는 user_agents 테이블에 한 번만 저장하고 id 로 참조한다
+    agent = models.ForeignKey(
+        UserAgent, null=True, blank=True, on_delete=models.PROTECT
+    )
     is_success = models.BooleanField(default=True)  # is_successful -> is_success로 통일
+    # 이 로그인에서 발급한 refresh token 의 jti. 로그아웃 시 이 값으로 행을 바로 찾는다
+    # (기록을 나중에 모아 쓰므로 발급 시점에는 행 id 를 알 수 없다)
+    refresh_jti = models.CharField(max_length=64, null=True, blank=True, unique=True)
 
     class Meta:
         db_table = "logins"  # 테이블 이름 명시적 지정 (선택사항)
+        indexes = [
+            # jti 가 없는 (이전에 발급된) 토큰의 로그아웃: 사용자의 가장 최근 로그인
+            models.Index(
+                fields=["user_num", "-login_at"], name="login_user_recent_idx"
+            ),
+        ]
+
+
+class LoginRollup(models.Model):
+    # 시간/일 단위 로그인 집계 (rollup_logins 명령이 watermark 이후 행만 더한다)
+    HOUR = "hour"
+    DAY = "day"
+    GRANULARITY_CHOICES = [(HOUR, "hour"), (DAY, "day")]
+
+    id = models.BigAutoField(primary_key=True)
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    successes = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    # 성공한 로그인의 고유 사용자 수 (일 단위만, 시간 단위는 null)
+    unique_users = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = "login_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "bucket_start"], name="login_rollup_bucket_uniq"
+            ),
+        ]
+
+
+class LoginDailyUser(models.Model):
+    # 일별 로그인 성공 사용자 (DAU 를 증분으로 세기 위한 (day, user) 집합)
+    id = models.BigAutoField(primary_key=True)
+    day = models.DateField()
+    user_id = models.BigIntegerField()
+
+    class Meta:
+        db_table = "login_daily_users"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "user_id"], name="login_daily_user_uniq"
+            ),
+        ]
+
+
+class LoginIpRollup(models.Model):
+    # 일별 IP 별 로그인 성공/실패 수
+    id = models.BigAutoField(primary_key=True)
+    day = models.DateField()
+    user_ip = models.CharField(max_length=50)
+    successes = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "login_ip_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "user_ip"], name="login_ip_day_uniq"
+            ),
+        ]
+        indexes = [
+            # 하루 동안 실패가 많은 IP 순 조회
+            models.Index(fields=["day", "-failures"], name="login_ip_day_failures_idx"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    # 집계가 끝난 마지막 원본 행 id
+    name = models.CharField(max_length=50, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "rollup_watermarks"
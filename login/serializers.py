@@ -0,0 +1,30 @@
+from typing import Any, Optional
+
+from rest_framework import serializers
+
+from .models import LoginIpRollup, LoginRollup
+
+
+class LoginRollupSerializer(serializers.ModelSerializer[LoginRollup]):
+    failure_rate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LoginRollup
+        fields = (
+            "granularity",
+            "bucket_start",
+            "successes",
+            "failures",
+            "failure_rate",
+            "unique_users",
+        )
+
+    def get_failure_rate(self, obj: LoginRollup) -> Optional[float]:
+        total = obj.successes + obj.failures
+        return obj.failures / total if total else None
+
+
+class LoginIpRollupSerializer(serializers.ModelSerializer[LoginIpRollup]):
+    class Meta:
+        model = LoginIpRollup
+        fields = ("day", "user_ip", "successes", "failures")
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from django.db import models, transaction
+from django.db.models import Count
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from .models import Login, LoginDailyUser, LoginIpRollup, LoginRollup, RollupWatermark
+
+# rollup_watermarks 의 logins 집계 행 이름
+ROLLUP_NAME = "logins"
+
+# 기록 스레드가 아직 커밋하지 않은 행을 건너뛰지 않도록, 이보다 최근 행은 다음 실행에 집계
+DEFAULT_LAG_SECONDS = 300
+
+# (successes, failures) 증가량
+Increments = Dict[Tuple[Any, ...], Dict[str, int]]
+
+
+class LoginRollupService:
+    """
+    logins 원본 행을 시간/일/IP 별 집계 테이블로 증분 반영합니다.
+    watermark(마지막으로 집계한 id) 이후의 행만 읽고, 집계와 watermark 갱신을
+    한 트랜잭션에서 하므로 같은 행이 두 번 더해지지 않습니다.
+    조회 API 와 관리자 화면은 집계 테이블만 읽습니다.
+    """
+
+    @staticmethod
+    def run(batch_size: int = 5000, lag_seconds: int = DEFAULT_LAG_SECONDS) -> int:
+        # Returns : 집계한 원본 행 수
+        cutoff = timezone.now() - timedelta(seconds=lag_seconds)
+        total = 0
+        while True:
+            count = LoginRollupService.process_batch(batch_size, cutoff)
+            if not count:
+                return total
+            total += count
+
+    @staticmethod
+    def process_batch(batch_size: int, cutoff: datetime) -> int:
+        with transaction.atomic():
+            # 동시에 실행된 명령은 여기서 기다린다
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+                name=ROLLUP_NAME
+            )
+            rows = list(
+                Login.objects.filter(id__gt=watermark.last_id)
+                .order_by("id")
+                .values_list("id", "user_num_id", "login_at", "user_ip", "is_success")[
+                    :batch_size
+                ]
+            )
+            # id 순서에서 cutoff 이후 행을 만나면 거기서 멈춘다 (그 뒤 id 는 다음 실행에서)
+            ready = []
+            for row in rows:
+                if row[2] >= cutoff:
+                    break
+                ready.append(row)
+            if not ready:
+                return 0
+
+            LoginRollupService._apply(ready)
+            watermark.last_id = ready[-1][0]
+            watermark.save(update_fields=["last_id", "updated_at"])
+            return len(ready)
+
+    @staticmethod
+    def rebuild() -> None:
+        # 집계를 지우고 처음부터 다시 집계하도록 watermark 를 되돌린다
+        # (이미 아카이브된 기간의 집계는 되살릴 수 없으므로 주의)
+        with transaction.atomic():
+            for model in (LoginRollup, LoginIpRollup, LoginDailyUser, RollupWatermark):
+                model.objects.all().delete()
+
+    @staticmethod
+    def get_rollups(granularity: str, start: date, end: date) -> QuerySet[LoginRollup]:
+        # [start, end] 기간의 집계 (start, end 는 TIME_ZONE 기준 날짜)
+        tz = timezone.get_current_timezone()
+        return LoginRollup.objects.filter(
+            granularity=granularity,
+            bucket_start__gte=datetime.combine(start, datetime.min.time(), tz),
+            bucket_start__lt=datetime.combine(
+                end + timedelta(days=1), datetime.min.time(), tz
+            ),
+        ).order_by("bucket_start")
+
+    @staticmethod
+    def get_top_ips(day: date, limit: int) -> QuerySet[LoginIpRollup]:
+        # 하루 동안 실패가 많은 IP 순 (login_ip_day_failures_idx)
+        return LoginIpRollup.objects.filter(day=day).order_by("-failures", "user_ip")[
+            :limit
+        ]
+
+    @staticmethod
+    def _apply(rows: Sequence[Tuple[int, int, datetime, str, bool]]) -> None:
+        buckets: Increments = defaultdict(lambda: {"successes": 0, "failures": 0})
+        ips: Increments = defaultdict(lambda: {"successes": 0, "failures": 0})
+        daily_users = set()
+        for _, user_id, login_at, user_ip, is_success in rows:
+            local = timezone.localtime(login_at)
+            hour = local.replace(minute=0, second=0, microsecond=0)
+            day = hour.replace(hour=0)
+            field = "successes" if is_success else "failures"
+            buckets[(LoginRollup.HOUR, hour)][field] += 1
+            buckets[(LoginRollup.DAY, day)][field] += 1
+            ips[(local.date(), user_ip)][field] += 1
+            if is_success:
+                daily_users.add((local.date(), user_id))
+
+        _merge(LoginRollup, ("granularity", "bucket_start"), buckets)
+        _merge(LoginIpRollup, ("day", "user_ip"), ips)
+
+        # DAU: (day, user) 집합에 추가한 뒤 이번 배치에 나온 날짜만 다시 센다
+        LoginDailyUser.objects.bulk_create(
+            [LoginDailyUser(day=day, user_id=user_id) for day, user_id in daily_users],
+            ignore_conflicts=True,
+        )
+        days = {
+            bucket for granularity, bucket in buckets if granularity == LoginRollup.DAY
+        }
+        counts = dict(
+            LoginDailyUser.objects.filter(day__in={day.date() for day in days})
+            .values("day")
+            .annotate(count=Count("id"))
+            .values_list("day", "count")
+        )
+        for day in days:
+            LoginRollup.objects.filter(
+                granularity=LoginRollup.DAY, bucket_start=day
+            ).update(unique_users=counts.get(day.date(), 0))
+
+
+def _merge(
+    model: Type[models.Model], key_fields: Tuple[str, ...], increments: Increments
+) -> None:
+    # 있는 행은 더해서 bulk_update, 없는 행은 bulk_create (watermark 잠금으로 직렬화됨)
+    lookup = {
+        f"{field}__in": {key[index] for key in increments}
+        for index, field in enumerate(key_fields)
+    }
+    existing = {
+        tuple(getattr(obj, field) for field in key_fields): obj
+        for obj in model._default_manager.filter(**lookup)
+    }
+    updated: List[models.Model] = []
+    created: List[models.Model] = []
+    for key, values in increments.items():
+        obj: Optional[models.Model] = existing.get(key)
+        if obj is None:
+            created.append(model(**dict(zip(key_fields, key)), **values))
+            continue
+        for field, value in values.items():
+            setattr(obj, field, getattr(obj, field) + value)
+        updated.append(obj)
+    model._default_manager.bulk_update(updated, ["successes", "failures"])
+    model._default_manager.bulk_create(created)
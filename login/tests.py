@@ -1,3 +1,318 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.testing import QueryPlanAssertionsMixin
+from user.models import User
+
+from .audit import AUDIT_DROPPED, LoginAuditWriter
+from .models import Login, LoginIpRollup, LoginRollup, UserAgent
+
+
+class LoginAuditWriterTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="audituser",
+            password="testpass123",
+            nickname="audit",
+            email="audit@test.com",
+        )
+        self.meta = {"REMOTE_ADDR": "127.0.0.1", "HTTP_USER_AGENT": "test-agent"}
+
+    def test_events_are_buffered_until_flush(self) -> None:
+        writer = LoginAuditWriter(batch_size=10, autostart=False)
+        writer.record_login(self.user.id, self.meta)
+        writer.record_login(self.user.id, self.meta)
+        writer.record_logout(self.user.id)
+
+        # 요청 경로에서는 대기열에만 넣고 DB에는 쓰지 않는다
+        self.assertEqual(writer.pending(), 3)
+        self.assertFalse(Login.objects.exists())
+
+        # 처음 보는 User-Agent 등록/조회 2 + bulk_create 1 + last_login UPDATE 1
+        # + 로그아웃 조회/UPDATE 2
+        with self.assertNumQueries(6):
+            self.assertEqual(writer.flush(), 3)
+        self.assertEqual(writer.pending(), 0)
+
+        first, second = Login.objects.order_by("login_at", "id")
+        self.assertEqual(first.user_ip, "127.0.0.1")
+        self.assertIsNone(first.logout_at)
+        # 로그아웃은 가장 최근 로그인 기록에 남는다
+        self.assertIsNotNone(second.logout_at)
+        self.assertLessEqual(second.login_at, timezone.now())
+        self.assertLess(timezone.now() - second.login_at, timedelta(minutes=1))
+
+    def test_logout_targets_login_by_jti(self) -> None:
+        writer = LoginAuditWriter(autostart=False)
+        writer.record_login(self.user.id, self.meta, refresh_jti="first")
+        writer.record_login(self.user.id, self.meta, refresh_jti="second")
+        writer.flush()
+
+        # 먼저 로그인한 세션에서 로그아웃해도 그 세션의 행만 갱신된다
+        writer.record_logout(self.user.id, refresh_jti="first")
+        with self.assertNumQueries(1):
+            writer.flush()
+        self.assertIsNotNone(Login.objects.get(refresh_jti="first").logout_at)
+        self.assertIsNone(Login.objects.get(refresh_jti="second").logout_at)
+
+    def test_logout_with_unknown_jti_falls_back_to_latest_login(self) -> None:
+        # jti 를 저장하기 전에 로그인한 세션의 토큰으로 로그아웃하는 경우
+        writer = LoginAuditWriter(autostart=False)
+        writer.record_login(self.user.id, self.meta)
+        writer.record_login(self.user.id, self.meta)
+        writer.flush()
+
+        # jti 가 있는 다른 기기의 세션은 fallback 대상이 아니다
+        writer.record_login(self.user.id, self.meta, refresh_jti="other-device")
+        writer.flush()
+
+        writer.record_logout(self.user.id, refresh_jti="issued-before-migration")
+        # jti UPDATE 1 (0 행) + jti 없는 최근 로그인 조회/UPDATE 2
+        with self.assertNumQueries(3):
+            writer.flush()
+        first, second, other = Login.objects.order_by("login_at", "id")
+        self.assertIsNone(first.logout_at)
+        self.assertIsNotNone(second.logout_at)
+        self.assertIsNone(other.logout_at)
+
+        # jti 없는 기록이 없으면 아무 세션도 닫지 않는다
+        Login.objects.filter(refresh_jti__isnull=True).delete()
+        writer.record_logout(self.user.id, refresh_jti="unknown")
+        writer.flush()
+        self.assertIsNone(Login.objects.get().logout_at)
+
+    def test_full_queue_drops_events(self) -> None:
+        writer = LoginAuditWriter(max_queue_size=1, block_timeout_ms=0, autostart=False)
+        dropped = AUDIT_DROPPED.value(kind="login")
+        self.assertTrue(writer.record_login(self.user.id, self.meta))
+        self.assertFalse(writer.record_login(self.user.id, self.meta))
+        self.assertEqual(AUDIT_DROPPED.value(kind="login"), dropped + 1)
+
+        writer.flush()
+        self.assertEqual(Login.objects.count(), 1)
+
+
+@override_settings(LOGIN_AUDIT={"EAGER": True})
+class LoginAuditApiTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_login_and_logout_are_audited(self) -> None:
+        User.objects.create_user(
+            username="testuser",
+            password="testpass123",
+            nickname="testnick",
+            email="test@test.com",
+        )
+        response = self.client.post(
+            reverse("user:login"),
+            {"username": "testuser", "password": "testpass123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # LOGIN_AUDIT["EAGER"] 이면 요청 안에서 바로 기록된다
+        login = Login.objects.get()
+        self.assertIsNone(login.logout_at)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.client.post(
+            reverse("user:logout"), {"refresh": response.data["refresh"]}, format="json"
+        )
+        login.refresh_from_db()
+        self.assertIsNotNone(login.logout_at)
+        self.assertIsNotNone(login.refresh_jti)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class LoginQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    def test_latest_login_uses_index(self) -> None:
+        queryset = Login.objects.filter(user_num_id=1).order_by("-login_at")[:1]
+        self.assertUsesIndex(queryset, "login_user_recent_idx")
+
+
+class LoginArchiveTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="archiveuser",
+            password="testpass123",
+            nickname="archive",
+            email="archive@test.com",
+        )
+        self.output_dir = Path(tempfile.mkdtemp())
+
+    def _create_login(self, days_ago: int, agent: str = "agent-a") -> Login:
+        return Login.objects.create(
+            user_num=self.user,
+            user_ip="127.0.0.1",
+            agent_id=UserAgent.objects.resolve([agent])[agent],
+            login_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+    def test_user_agents_are_deduplicated(self) -> None:
+        writer = LoginAuditWriter(autostart=False)
+        meta = {"REMOTE_ADDR": "127.0.0.1", "HTTP_USER_AGENT": "same-browser"}
+        for _ in range(3):
+            writer.record_login(self.user.id, meta)
+        writer.flush()
+        self.assertEqual(UserAgent.objects.count(), 1)
+        self.assertEqual(
+            set(Login.objects.values_list("agent__value", flat=True)), {"same-browser"}
+        )
+
+    def test_old_logins_are_archived_by_month(self) -> None:
+        old = [self._create_login(400), self._create_login(370, "agent-b")]
+        recent = self._create_login(1)
+
+        call_command(
+            "archive_logins",
+            "--days",
+            "180",
+            "--batch-size",
+            "1",
+            "--output-dir",
+            str(self.output_dir),
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(list(Login.objects.all()), [recent])
+        records: List[Dict[str, Any]] = []
+        for path in sorted(self.output_dir.glob("logins-*.jsonl.gz")):
+            with gzip.open(path, "rt") as archive:
+                records.extend(json.loads(line) for line in archive)
+        self.assertEqual(
+            sorted(record["id"] for record in records), sorted(l.id for l in old)
+        )
+        self.assertEqual(
+            {record["user_agent"] for record in records}, {"agent-a", "agent-b"}
+        )
+
+    def test_dry_run_keeps_rows(self) -> None:
+        self._create_login(400)
+        stdout = StringIO()
+        call_command(
+            "archive_logins",
+            "--dry-run",
+            "--output-dir",
+            str(self.output_dir),
+            stdout=stdout,
+        )
+        self.assertIn("[dry-run] 1 logins", stdout.getvalue())
+        self.assertEqual(Login.objects.count(), 1)
+        self.assertFalse(any(self.output_dir.iterdir()))
+
+
+class LoginRollupTests(APITestCase):
+    def setUp(self) -> None:
+        self.users = [
+            User.objects.create_user(
+                username=f"rollup{i}",
+                password="testpass123",
+                nickname="rollup",
+                email=f"rollup{i}@test.com",
+            )
+            for i in range(2)
+        ]
+        self.day = (timezone.now() - timedelta(days=2)).replace(
+            hour=10, minute=0, second=0, microsecond=0
+        )
+
+    def _login(
+        self, user: User, at: Any, is_success: bool = True, ip: str = "10.0.0.1"
+    ) -> None:
+        Login.objects.create(
+            user_num=user, user_ip=ip, is_success=is_success, login_at=at
+        )
+
+    def _rollup(self) -> None:
+        call_command("rollup_logins", stdout=StringIO())
+
+    def test_rollups_are_incremental(self) -> None:
+        self._login(self.users[0], self.day + timedelta(minutes=5))
+        self._login(self.users[0], self.day + timedelta(minutes=10))
+        self._login(self.users[1], self.day + timedelta(hours=1), is_success=False)
+        self._rollup()
+
+        day = LoginRollup.objects.get(granularity=LoginRollup.DAY)
+        self.assertEqual((day.successes, day.failures, day.unique_users), (2, 1, 1))
+        self.assertEqual(
+            LoginRollup.objects.filter(granularity=LoginRollup.HOUR).count(), 2
+        )
+
+        # 다음 실행은 watermark 이후 행만 더한다
+        self._login(self.users[1], self.day + timedelta(hours=2), ip="10.0.0.2")
+        self._rollup()
+        self._rollup()
+        day.refresh_from_db()
+        self.assertEqual((day.successes, day.failures, day.unique_users), (3, 1, 2))
+        self.assertEqual(
+            list(
+                LoginIpRollup.objects.order_by("user_ip").values_list(
+                    "user_ip", "successes", "failures"
+                )
+            ),
+            [("10.0.0.1", 2, 1), ("10.0.0.2", 1, 0)],
+        )
+
+    def test_recent_rows_wait_for_lag(self) -> None:
+        self._login(self.users[0], timezone.now())
+        self._rollup()
+        self.assertFalse(LoginRollup.objects.exists())
+
+    def test_stats_api_reads_rollups(self) -> None:
+        self._login(self.users[0], self.day)
+        self._login(self.users[1], self.day, is_success=False)
+        self._rollup()
+        url = reverse("login:login-stats")
+        params = {
+            "start": self.day.date().isoformat(),
+            "end": self.day.date().isoformat(),
+        }
+
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(
+            self.client.get(url, params).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        admin = User.objects.create_user(
+            username="admin",
+            password="testpass123",
+            nickname="admin",
+            email="admin@test.com",
+            is_staff=True,
+        )
+        self.client.force_authenticate(admin)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["failure_rate"], 0.5)
+
+        response = self.client.get(
+            reverse("login:login-ip-stats"), {"day": self.day.date().isoformat()}
+        )
+        self.assertEqual(response.data[0]["user_ip"], "10.0.0.1")
+
+        # 잘못된 날짜나 범위를 벗어난 limit 은 기본값으로 바꾸지 않고 400
+        for stats_url, bad in (
+            (url, {"start": "2024-13-01"}),
+            (reverse("login:login-ip-stats"), {"day": "yesterday"}),
+            (reverse("login:login-ip-stats"), {"limit": "-1"}),
+            (reverse("login:login-ip-stats"), {"limit": "0"}),
+        ):
+            response = self.client.get(stats_url, bad)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = "login"
+
+urlpatterns = [
+    path("stats/", views.LoginStatsView.as_view(), name="login-stats"),
+    path("stats/ips/", views.LoginIpStatsView.as_view(), name="login-ip-stats"),
+]
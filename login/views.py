@@ -1,3 +1,83 @@
-from django.shortcuts import render
+from datetime import date, timedelta
+from typing import Optional
 
-# Create your views here.
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import LoginRollup
+from .serializers import LoginIpRollupSerializer, LoginRollupSerializer
+from .services import LoginRollupService
+
+# 한 번에 조회할 수 있는 최대 기간 (일)
+MAX_RANGE_DAYS = 366
+MAX_IP_LIMIT = 500
+
+
+class LoginStatsView(APIView):
+    # 로그인 집계 조회 API (관리자 전용, 원본 logins 테이블은 읽지 않음)
+    # ?granularity=day|hour&start=YYYY-MM-DD&end=YYYY-MM-DD (기본: 최근 7일, 일 단위)
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        granularity = request.query_params.get("granularity", LoginRollup.DAY)
+        if granularity not in (LoginRollup.HOUR, LoginRollup.DAY):
+            return Response(
+                {"error": "granularity must be 'hour' or 'day'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            end = _parse_date(request.query_params.get("end")) or timezone.localdate()
+            start = _parse_date(request.query_params.get("start")) or end - timedelta(
+                days=6
+            )
+        except ValueError:
+            return Response(
+                {"error": "start and end must be YYYY-MM-DD dates"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if start > end or (end - start).days >= MAX_RANGE_DAYS:
+            return Response(
+                {"error": f"Invalid date range (max {MAX_RANGE_DAYS} days)"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        rollups = LoginRollupService.get_rollups(granularity, start, end)
+        return Response(LoginRollupSerializer(rollups, many=True).data)
+
+
+class LoginIpStatsView(APIView):
+    # 하루 동안 실패가 많은 IP 목록 (관리자 전용)
+    # ?day=YYYY-MM-DD&limit=50
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        try:
+            day = _parse_date(request.query_params.get("day")) or timezone.localdate()
+        except ValueError:
+            return Response(
+                {"error": "day must be a YYYY-MM-DD date"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", 50))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_IP_LIMIT:
+            return Response(
+                {"error": f"limit must be an integer between 1 and {MAX_IP_LIMIT}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ips = LoginRollupService.get_top_ips(day, limit)
+        return Response(LoginIpRollupSerializer(ips, many=True).data)
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    # 값이 없으면 None (기본값 사용)
+    # Raises :
+    # - ValueError : YYYY-MM-DD 형식이 아닌 경우
+    if not value:
+        return None
+    return date.fromisoformat(value)
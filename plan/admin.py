@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PlanTemplate, PlanTemplateItem
+
+
+class PlanTemplateItemInline(admin.TabularInline):  # type: ignore[type-arg]
+    model = PlanTemplateItem
+    fields = ("ordering_num", "title")
+    ordering = ("ordering_num",)
+
+
+@admin.register(PlanTemplate)
+class PlanTemplateAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    # 적용한 사용자가 있는 템플릿의 항목은 바꾸지 말고 새 템플릿을 만든다
+    list_display = ("name", "created_at")
+    inlines = [PlanTemplateItemInline]
@@ -0,0 +1,152 @@
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandParser
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from plan.models import Plan
+from user.models import User
+
+# (이름, URL 이름) - 같은 목록을 동기 DRF 뷰와 async 뷰로 각각 요청한다
+TARGETS = [
+    ("plan (sync)", "plan:plan-list"),
+    ("plan (async)", "plan:plan-list-async"),
+    ("calendar (sync)", "calendar:calendar-list"),
+    ("calendar (async)", "calendar:calendar-list-async"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "ASGI 애플리케이션을 프로세스 안에서 직접 호출해 동기 뷰와 async 뷰의 "
+        "초당 요청 수와 p99 응답 시간을 비교하는 부하 테스트"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--concurrency", type=int, default=500, help="동시 연결(요청) 수"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=5000, help="뷰별 전체 요청 수"
+        )
+        parser.add_argument(
+            "--plans", type=int, default=100, help="임시 사용자에게 만들 plan 개수"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # 임시 사용자를 만들고 측정이 끝나면 데이터를 모두 지운다
+        user = User.objects.create_user(
+            username=f"bench_{uuid.uuid4().hex[:12]}",
+            password=None,
+            nickname="bench",
+            email=f"bench_{uuid.uuid4().hex}@example.com",
+        )
+        try:
+            Plan.objects.bulk_create(
+                [
+                    Plan(planner_id=user.id, ordering_num=i, title=f"Plan {i}")
+                    for i in range(options["plans"])
+                ]
+            )
+            token = str(getattr(RefreshToken.for_user(user), "access_token"))
+            self.stdout.write(
+                f"{'view':<18} {'req/s':>10} {'p50(ms)':>10} {'p99(ms)':>10} "
+                f"{'errors':>8}"
+            )
+            for name, url_name in TARGETS:
+                result = asyncio.run(
+                    self._run(
+                        reverse(url_name),
+                        token,
+                        options["concurrency"],
+                        options["requests"],
+                    )
+                )
+                self.stdout.write(
+                    f"{name:<18} {result['rps']:>10.1f} {result['p50']:>10.2f} "
+                    f"{result['p99']:>10.2f} {result['errors']:>8}"
+                )
+        finally:
+            Plan.objects.filter(planner_id=user.id).delete()
+            user.delete()
+
+    async def _run(
+        self, path: str, token: str, concurrency: int, total: int
+    ) -> Dict[str, Any]:
+        application = get_asgi_application()
+        latencies: List[float] = []
+        errors = 0
+        remaining = total
+
+        async def worker() -> None:
+            nonlocal errors, remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                status_code, _ = await _asgi_get(application, path, token)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            "rps": total / elapsed,
+            "p50": statistics.median(latencies),
+            "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+            "errors": errors,
+        }
+
+
+async def _asgi_get(application: Any, path: str, token: str) -> Tuple[int, bytes]:
+    # HTTP 서버 없이 ASGI 프로토콜로 GET 요청 하나를 보내고 (상태 코드, 본문)을 받는다
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    request_sent = False
+    disconnect = asyncio.Event()
+    status_code = 0
+    body: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # 응답이 끝날 때까지 연결을 유지한다
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                disconnect.set()
+
+    await application(scope, receive, send)
+    return status_code, b"".join(body)
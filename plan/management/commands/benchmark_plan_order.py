@@ -0,0 +1,90 @@
+import statistics
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from plan.models import Plan
+from plan.services import PlanService
+from user.models import User
+
+
+def legacy_update_plan_order(plans: List[Dict[str, Any]]) -> None:
+    # 기존 방식: plan 하나당 UPDATE 한 번 (autocommit)
+    for plan_data in plans:
+        Plan.objects.filter(id=plan_data["id"]).update(
+            ordering_num=plan_data["ordering_num"]
+        )
+
+
+class Command(BaseCommand):
+    help = "plan 순서 변경: 건별 UPDATE 루프와 일괄 UPDATE 비교 벤치마크"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000],
+            help="측정할 plan 개수 목록",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="크기별 반복 측정 횟수"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # 임시 사용자를 만들고 측정이 끝나면 데이터를 모두 지운다
+        user = User.objects.create_user(
+            username=f"bench_{uuid.uuid4().hex[:12]}",
+            password=None,
+            nickname="bench",
+            email=f"bench_{uuid.uuid4().hex}@example.com",
+        )
+        try:
+            self.stdout.write(
+                f"{'plans':>8} {'loop(ms)':>12} {'bulk(ms)':>12} {'speedup':>8}"
+            )
+            for size in options["sizes"]:
+                Plan.objects.filter(planner_id=user.id).delete()
+                Plan.objects.bulk_create(
+                    [
+                        Plan(planner_id=user.id, ordering_num=i, title=f"Plan {i}")
+                        for i in range(size)
+                    ]
+                )
+                ids = list(
+                    Plan.objects.filter(planner_id=user.id)
+                    .order_by("id")
+                    .values_list("id", flat=True)
+                )
+                # 매 측정마다 순서를 뒤집어 실제로 값이 바뀌도록 한다
+                orders = [
+                    {"id": plan_id, "ordering_num": size - i}
+                    for i, plan_id in enumerate(ids)
+                ]
+
+                loop_ms = self._measure(
+                    lambda: legacy_update_plan_order(orders), options["repeat"]
+                )
+                bulk_ms = self._measure(
+                    lambda: PlanService.update_plan_order(orders, user),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{size:>8} {loop_ms:>12.2f} {bulk_ms:>12.2f} "
+                    f"{loop_ms / bulk_ms:>7.1f}x"
+                )
+        finally:
+            Plan.objects.filter(planner_id=user.id).delete()
+            user.delete()
+
+    @staticmethod
+    def _measure(func: Callable[[], Any], repeat: int) -> float:
+        # 반복 측정값의 중앙값 (ms)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
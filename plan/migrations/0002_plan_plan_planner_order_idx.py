@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plan", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="plan",
+            index=models.Index(
+                fields=["planner_id", "ordering_num"], name="plan_planner_order_idx"
+            ),
+        ),
+    ]
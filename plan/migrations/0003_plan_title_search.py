@@ -0,0 +1,86 @@
+# 제목 검색용 역색인 (SQLite FTS5 / MySQL FULLTEXT)
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    # 한글 제목도 부분 일치로 찾을 수 있도록 문자 단위 trigram 토크나이저 사용.
+    # owner 열은 "<planner_id>" 형태로 저장해 사용자 범위를 색인 안에서 좁힌다.
+    """
+    CREATE VIRTUAL TABLE plan_title_search USING fts5(
+        title, owner, content='', tokenize='trigram'
+    )
+    """,
+    # 순위는 제목 일치도만 반영
+    """
+    INSERT INTO plan_title_search(plan_title_search, rank)
+    VALUES ('rank', 'bm25(1.0, 0.0)')
+    """,
+    """
+    CREATE TRIGGER plan_title_search_ai AFTER INSERT ON plan_plan
+    WHEN NOT new.is_deleted BEGIN
+        INSERT INTO plan_title_search(rowid, title, owner)
+        VALUES (new.id, new.title, '<' || new.planner_id || '>');
+    END
+    """,
+    """
+    CREATE TRIGGER plan_title_search_ad AFTER DELETE ON plan_plan
+    WHEN NOT old.is_deleted BEGIN
+        INSERT INTO plan_title_search(plan_title_search, rowid, title, owner)
+        VALUES ('delete', old.id, old.title, '<' || old.planner_id || '>');
+    END
+    """,
+    # 삭제 후 추가 순서가 보장되도록 하나의 트리거에서 처리
+    """
+    CREATE TRIGGER plan_title_search_au
+    AFTER UPDATE OF title, planner_id, is_deleted ON plan_plan BEGIN
+        INSERT INTO plan_title_search(plan_title_search, rowid, title, owner)
+        SELECT 'delete', old.id, old.title, '<' || old.planner_id || '>'
+        WHERE NOT old.is_deleted;
+        INSERT INTO plan_title_search(rowid, title, owner)
+        SELECT new.id, new.title, '<' || new.planner_id || '>'
+        WHERE NOT new.is_deleted;
+    END
+    """,
+    """
+    INSERT INTO plan_title_search(rowid, title, owner)
+    SELECT id, title, '<' || planner_id || '>' FROM plan_plan WHERE NOT is_deleted
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS plan_title_search_ai",
+    "DROP TRIGGER IF EXISTS plan_title_search_ad",
+    "DROP TRIGGER IF EXISTS plan_title_search_au",
+    "DROP TABLE IF EXISTS plan_title_search",
+]
+
+# MySQL은 ngram 파서(기본 토큰 길이 2)가 한글을 2글자 단위로 색인한다
+MYSQL_FORWARD = [
+    "ALTER TABLE plan_plan ADD FULLTEXT INDEX plan_title_ft (title) WITH PARSER ngram",
+]
+
+MYSQL_BACKWARD = [
+    "ALTER TABLE plan_plan DROP INDEX plan_title_ft",
+]
+
+
+def _run(statements: dict) -> object:
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plan", "0002_plan_plan_planner_order_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "mysql": MYSQL_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "mysql": MYSQL_BACKWARD}),
+        ),
+    ]
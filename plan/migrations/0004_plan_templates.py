@@ -0,0 +1,130 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:21
+
+import importlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# SQLite 는 plan_plan 에 FK 열을 더하거나 뺄 때 테이블을 다시 만들면서
+# 0003 의 검색 색인 트리거를 지우므로 다시 만든다 (색인 내용은 rowid 가 같아 그대로 유효)
+title_search = importlib.import_module("plan.migrations.0003_plan_title_search")
+SQLITE_TRIGGERS = [
+    sql for sql in title_search.SQLITE_FORWARD if "CREATE TRIGGER" in sql
+]
+
+
+def recreate_title_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in title_search.SQLITE_BACKWARD:
+        if "TRIGGER" in sql:
+            schema_editor.execute(sql)
+    for sql in SQLITE_TRIGGERS:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plan", "0003_plan_title_search"),
+    ]
+
+    operations = [
+        # 되돌릴 때는 template_item 열을 지운 뒤에 실행된다
+        migrations.RunPython(migrations.RunPython.noop, recreate_title_search_triggers),
+        migrations.CreateModel(
+            name="PlanTemplate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AppliedPlanTemplate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("planner_id", models.BigIntegerField()),
+                ("ordering_offset", models.BigIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "template",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="applications",
+                        to="plan.plantemplate",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PlanTemplateItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ordering_num", models.BigIntegerField()),
+                ("title", models.CharField(max_length=255)),
+                (
+                    "template",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="items",
+                        to="plan.plantemplate",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="plan",
+            name="template_item",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="plan.plantemplateitem",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="plan",
+            constraint=models.UniqueConstraint(
+                fields=("planner_id", "template_item"), name="plan_template_item_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="appliedplantemplate",
+            constraint=models.UniqueConstraint(
+                fields=("planner_id", "template"), name="plan_applied_template_uniq"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plantemplateitem",
+            index=models.Index(
+                fields=["template", "ordering_num"], name="plan_tpl_item_order_idx"
+            ),
+        ),
+        migrations.RunPython(recreate_title_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plan", "0004_plan_templates"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="plan",
+            index=models.Index(
+                fields=["planner_id", "start_date", "end_date"],
+                name="plan_planner_range_idx",
+            ),
+        ),
+    ]
@@ -5,6 +5,57 @@ from user.models import User
 # Create your models here.
 
 
+class PlanTemplate(models.Model):
+    """
+    여러 사용자가 함께 쓰는 plan 템플릿 (예: 기본 웨딩 체크리스트).
+    템플릿 항목은 변경하지 않습니다. 내용을 바꾸려면 새 템플릿을 만듭니다.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class PlanTemplateItem(models.Model):
+    template = models.ForeignKey(
+        PlanTemplate, on_delete=models.PROTECT, related_name="items"
+    )
+    # 템플릿 안에서의 순서 (적용한 사용자의 ordering_offset 을 더해 사용)
+    ordering_num = models.BigIntegerField()
+    title = models.CharField(max_length=255)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["template", "ordering_num"], name="plan_tpl_item_order_idx"
+            ),
+        ]
+
+
+class AppliedPlanTemplate(models.Model):
+    """
+    사용자가 적용한 템플릿. 템플릿 항목은 복사하지 않고 목록 조회 시 합쳐서 보여주며,
+    사용자가 항목을 수정/삭제/이동할 때만 그 항목의 Plan 행(template_item)을 만듭니다.
+    """
+
+    planner_id = models.BigIntegerField()  # Plan.planner_id 와 같은 값 (user id)
+    template = models.ForeignKey(
+        PlanTemplate, on_delete=models.PROTECT, related_name="applications"
+    )
+    # 템플릿 항목의 ordering_num 에 더할 값 (적용 시점의 목록 맨 뒤)
+    ordering_offset = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["planner_id", "template"], name="plan_applied_template_uniq"
+            ),
+        ]
+
+
 class Plan(models.Model):
     id = models.BigAutoField(primary_key=True)
     planner_id = models.BigIntegerField()  # ForeignKey 대신 원래대로
@@ -15,3 +66,31 @@ class Plan(models.Model):
     is_deleted = models.BooleanField(default=False)
     start_date = models.DateField(null=True)
     end_date = models.DateField(null=True)
+    # 템플릿 항목을 수정/삭제/이동해서 만들어진 행이면 원래 항목
+    template_item = models.ForeignKey(
+        PlanTemplateItem,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        indexes = [
+            # PlanService.get_plans: planner_id 조건 + (ordering_num, id) 정렬
+            models.Index(
+                fields=["planner_id", "ordering_num"], name="plan_planner_order_idx"
+            ),
+            # CalendarService.get_plans_in_range: 기간이 겹치는 plan
+            # (start_date 범위 탐색, end_date 는 인덱스 안에서 거른다)
+            models.Index(
+                fields=["planner_id", "start_date", "end_date"],
+                name="plan_planner_range_idx",
+            ),
+        ]
+        constraints = [
+            # 사용자마다 템플릿 항목 하나에 Plan 행 하나 (NULL 끼리는 겹치지 않는다)
+            models.UniqueConstraint(
+                fields=["planner_id", "template_item"], name="plan_template_item_uniq"
+            ),
+        ]
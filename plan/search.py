@@ -0,0 +1,96 @@
+from functools import lru_cache
+from typing import List
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Plan
+
+# 검색 결과 최대 개수 기본값
+SEARCH_RESULT_LIMIT = 100
+
+
+class BaseSearchBackend:
+    """
+    plan 제목 검색 백엔드.
+    search()는 관련도 순으로 정렬된 plan id 목록을 반환합니다.
+    """
+
+    def search(self, planner_id: int, keyword: str, limit: int) -> List[int]:
+        raise NotImplementedError
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    # 색인 없이 사용자의 plan 안에서 LIKE '%keyword%' 로 찾는다 (순위 없음)
+    def search(self, planner_id: int, keyword: str, limit: int) -> List[int]:
+        return list(
+            Plan.objects.filter(
+                planner_id=planner_id, is_deleted=False, title__icontains=keyword
+            )
+            .order_by("ordering_num", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+
+class SQLiteFTS5SearchBackend(IContainsSearchBackend):
+    # plan_title_search FTS5 테이블 (trigram 토크나이저, 트리거로 동기화)
+    # trigram은 3글자 이상부터 색인되므로 더 짧은 검색어는 LIKE로 처리한다
+    min_length = 3
+
+    def search(self, planner_id: int, keyword: str, limit: int) -> List[int]:
+        keyword = keyword.strip()
+        if len(keyword) < self.min_length:
+            return super().search(planner_id, keyword, limit)
+
+        query = f'owner:"<{planner_id}>" AND title:{_phrase(keyword)}'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rowid FROM plan_title_search "
+                "WHERE plan_title_search MATCH %s ORDER BY rank LIMIT %s",
+                [query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class MySQLFullTextSearchBackend(IContainsSearchBackend):
+    # plan_title_ft FULLTEXT 색인 (ngram 파서, 토큰 길이 2)
+    min_length = 2
+
+    def search(self, planner_id: int, keyword: str, limit: int) -> List[int]:
+        keyword = keyword.strip()
+        if len(keyword) < self.min_length:
+            return super().search(planner_id, keyword, limit)
+
+        query = _phrase(keyword)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id FROM plan_plan "
+                "WHERE MATCH(title) AGAINST (%s IN BOOLEAN MODE) "
+                "AND planner_id = %s AND is_deleted = 0 "
+                "ORDER BY MATCH(title) AGAINST (%s IN BOOLEAN MODE) DESC, id "
+                "LIMIT %s",
+                [query, planner_id, query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+def _phrase(keyword: str) -> str:
+    # 검색어 전체를 하나의 구문으로 감싸 연산자로 해석되지 않게 한다
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=1)
+def get_search_backend() -> BaseSearchBackend:
+    # settings.PLAN_SEARCH_BACKEND 가 있으면 그 클래스를, 없으면 DB 종류에 맞는 백엔드를 쓴다
+    path = getattr(settings, "PLAN_SEARCH_BACKEND", None)
+    if path:
+        backend_class = import_string(path)
+    elif connection.vendor == "sqlite":
+        backend_class = SQLiteFTS5SearchBackend
+    elif connection.vendor == "mysql":
+        backend_class = MySQLFullTextSearchBackend
+    else:
+        backend_class = IContainsSearchBackend
+    backend: BaseSearchBackend = backend_class()
+    return backend
@@ -5,7 +5,7 @@ from rest_framework import serializers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from plan.models import Plan
+from plan.models import Plan, PlanTemplate
 from plan.services import PlanService  # 이미 임포트 되어 있는 PlanService 사용
 from user.models import User as CustomUser  # 커스텀 User 모델
 
@@ -21,3 +21,20 @@ class PlanSerializer(serializers.ModelSerializer[Plan]):
         plans = PlanService.get_plans(cast(CustomUser, request.user), search_keyword)
         serializer = PlanSerializer(plans, many=True)
         return Response(serializer.data)
+
+
+class PlanBulkCreateSerializer(serializers.ModelSerializer[Plan]):
+    # 일괄 생성 항목. planner_id 는 요청 사용자, ordering_num 은 생략하면 서버가 부여
+    class Meta:
+        model = Plan
+        fields = ("title", "ordering_num", "start_date", "end_date")
+        extra_kwargs = {"ordering_num": {"required": False}}
+
+
+class PlanTemplateSerializer(serializers.ModelSerializer[PlanTemplate]):
+    # item_count 는 PlanService.get_templates 의 annotate 값
+    item_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = PlanTemplate
+        fields = ("id", "name", "item_count", "created_at")
@@ -1,28 +1,277 @@
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Min, Q, Value, When
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
+from calendars.services import CalendarService
+from common.bulk import bulk_insert
+from common.cache import VersionedListCache
+from common.ordering import ORDERING_GAP, assign_ordering_nums, move_between
+from sync.models import Change
+from sync.services import SyncService
 from user.models import User
 
-from .models import Plan
+from .models import AppliedPlanTemplate, Plan, PlanTemplate, PlanTemplateItem
+from .search import SEARCH_RESULT_LIMIT, get_search_backend
+from .templates import template_plans
+
+# 한 번의 UPDATE 문에 담을 최대 plan 수 (DB 파라미터 개수 제한 대비)
+ORDER_UPDATE_BATCH_SIZE = 500
+
+# 바뀌면 월간 달력 요약(CalendarMonth)을 다시 계산해야 하는 필드
+CALENDAR_FIELDS = ("start_date", "end_date", "is_deleted")
+
+# get_plans 결과. 템플릿을 적용한 사용자는 Plan 행과 템플릿 항목을 합친 목록
+PlanList = Union[QuerySet[Plan], List[Plan]]
 
 
 class PlanService:
+    # 사용자별 plan 목록 응답 캐시 (생성/수정/삭제/순서 변경 시 무효화)
+    list_cache = VersionedListCache("plan")
+
     @staticmethod
-    def get_plans(user: "User", search_keyword: Optional[str] = None) -> QuerySet[Plan]:
-        query = Plan.objects.filter(planner_id=user.id, is_deleted=False)  # 수정된 부분
+    def get_plans(
+        user: "User",
+        search_keyword: Optional[str] = None,
+        limit: int = SEARCH_RESULT_LIMIT,
+    ) -> PlanList:
+        applied = PlanService._applied(user)
         if search_keyword:
-            query = query.filter(title__icontains=search_keyword)
-        return query.order_by("ordering_num")
+            # 검색어가 있으면 검색 백엔드의 관련도 순서대로 최대 limit개 반환
+            ids = get_search_backend().search(user.id, search_keyword, limit)
+            if applied:
+                return PlanService._search_merged(
+                    user, applied, ids, search_keyword, limit
+                )
+            return PlanService._ranked(user, ids)
+        if applied:
+            return PlanService._merge(user, applied)
+        return PlanService._active(user).order_by("ordering_num")
+
+    @staticmethod
+    def _active(user: "User") -> QuerySet[Plan]:
+        return Plan.objects.filter(planner_id=user.id, is_deleted=False)  # 수정된 부분
+
+    @staticmethod
+    def _ranked(user: "User", ids: List[int]) -> QuerySet[Plan]:
+        # 검색 결과 id 목록의 순서(관련도 순)대로 정렬
+        return (
+            PlanService._active(user)
+            .filter(id__in=ids)
+            .order_by(
+                Case(
+                    *[
+                        When(id=plan_id, then=Value(rank))
+                        for rank, plan_id in enumerate(ids)
+                    ],
+                    output_field=IntegerField(),
+                )
+            )
+        )
+
+    # ----- 템플릿 (항목은 복사하지 않고, 바꾼 항목만 Plan 행으로 만든다) -----
+
+    @staticmethod
+    def get_templates() -> QuerySet[PlanTemplate]:
+        return PlanTemplate.objects.annotate(item_count=Count("items")).order_by("id")
+
+    @staticmethod
+    def apply_template(
+        template_id: int, user: "User"
+    ) -> Tuple[AppliedPlanTemplate, bool]:
+        # 템플릿 항목을 목록 맨 뒤에 이어 붙인다 (이미 적용했으면 그대로)
+        # Returns : (적용 정보, 새로 적용했는지 여부)
+        # Raises :
+        # - PlanTemplate.DoesNotExist : 템플릿을 찾을 수 없는 경우
+        template = PlanTemplate.objects.get(id=template_id)
+        with transaction.atomic():
+            first = template.items.aggregate(first=Min("ordering_num"))["first"]
+            applied, created = AppliedPlanTemplate.objects.get_or_create(
+                planner_id=user.id,
+                template=template,
+                defaults={
+                    "ordering_offset": PlanService._next_ordering_num(user)
+                    - (first or 0)
+                },
+            )
+            if created:
+                # 템플릿 항목은 -(항목 id) 의 plan 으로 동기화된다
+                SyncService.record(
+                    user.id,
+                    Change.PLAN,
+                    [-pk for pk in template.items.values_list("id", flat=True)],
+                )
+        if created:
+            PlanService.list_cache.invalidate(user.id)
+        return applied, created
+
+    @staticmethod
+    def _applied(user: "User") -> List[AppliedPlanTemplate]:
+        return list(AppliedPlanTemplate.objects.filter(planner_id=user.id))
+
+    @staticmethod
+    def _merge(user: "User", applied: List[AppliedPlanTemplate]) -> List[Plan]:
+        # 사용자의 Plan 행과 아직 바꾸지 않은 템플릿 항목을 (ordering_num, id) 순으로 합친다
+        # 삭제 표시된 템플릿 항목 행도 읽어, 그 항목이 다시 보이지 않게 한다
+        rows = list(
+            Plan.objects.filter(planner_id=user.id).filter(
+                Q(is_deleted=False) | Q(template_item__isnull=False)
+            )
+        )
+        overridden = {plan.template_item_id for plan in rows if plan.template_item_id}
+        plans = [plan for plan in rows if not plan.is_deleted]
+        plans.extend(template_plans(user.id, applied, overridden))
+        plans.sort(key=lambda plan: (plan.ordering_num, plan.id))
+        return plans
+
+    @staticmethod
+    def _search_merged(
+        user: "User",
+        applied: List[AppliedPlanTemplate],
+        ids: List[int],
+        search_keyword: str,
+        limit: int,
+    ) -> List[Plan]:
+        # 검색 색인에는 Plan 행만 있으므로, 템플릿 항목은 제목 부분 일치로 찾아 뒤에 붙인다
+        overridden = set(
+            Plan.objects.filter(
+                planner_id=user.id, template_item__isnull=False
+            ).values_list("template_item_id", flat=True)
+        )
+        plans = list(PlanService._ranked(user, ids))
+        plans.extend(template_plans(user.id, applied, overridden, search_keyword))
+        return plans[:limit]
+
+    @staticmethod
+    def _materialize(user: "User", plan_ids: Iterable[int]) -> Dict[int, int]:
+        # 템플릿 항목(음수 id)의 Plan 행을 만들고 {요청 id: Plan id} 를 반환
+        # 양수 id 는 그대로, 적용하지 않은 템플릿의 항목은 결과에서 빠진다
+        plan_ids = list(plan_ids)
+        mapping = {plan_id: plan_id for plan_id in plan_ids if plan_id >= 0}
+        item_ids = {-plan_id for plan_id in plan_ids if plan_id < 0}
+        if not item_ids:
+            return mapping
+
+        items = PlanTemplateItem.objects.filter(
+            id__in=item_ids, template__applications__planner_id=user.id
+        ).annotate(offset=F("template__applications__ordering_offset"))
+        with transaction.atomic():
+            # 이미 만들어진 항목은 unique 제약으로 건너뛴다
+            Plan.objects.bulk_create(
+                [
+                    Plan(
+                        planner_id=user.id,
+                        template_item_id=item.id,
+                        title=item.title,
+                        ordering_num=getattr(item, "offset") + item.ordering_num,
+                    )
+                    for item in items
+                ],
+                ignore_conflicts=True,
+            )
+            rows = Plan.objects.filter(
+                planner_id=user.id, template_item_id__in=item_ids
+            ).values_list("template_item_id", "id")
+            mapping.update({-item_id: plan_id for item_id, plan_id in rows})
+            # 만든 Plan 행과 함께, 그 항목의 가상 plan(음수 id)은 삭제로 보낸다
+            SyncService.record(
+                user.id,
+                Change.PLAN,
+                [mapping[-item_id] for item_id, _ in rows]
+                + [-item_id for item_id, _ in rows],
+            )
+        return mapping
+
+    @staticmethod
+    def _tail_query(user: "User") -> QuerySet[Any]:
+        # Plan 행과 적용한 템플릿 항목 각각의 마지막 정렬 번호 (UNION ALL 쿼리 한 번)
+        plans = (
+            Plan.objects.filter(planner_id=user.id)
+            .values("planner_id")
+            .annotate(last=Max("ordering_num"))
+            .values_list("last", flat=True)
+        )
+        templates = (
+            AppliedPlanTemplate.objects.filter(planner_id=user.id)
+            .values("planner_id")
+            .annotate(
+                last=Max(F("ordering_offset") + F("template__items__ordering_num"))
+            )
+            .values_list("last", flat=True)
+        )
+        return plans.union(templates, all=True)
+
+    @staticmethod
+    def _next_ordering_num(user: "User") -> int:
+        # 목록 맨 뒤에 추가할 때 사용할 정렬 번호 (템플릿 항목 포함)
+        return _after_last(list(PlanService._tail_query(user)))
+
+    @staticmethod
+    def _template_counts(user: "User") -> Dict[str, Any]:
+        return AppliedPlanTemplate.objects.filter(planner_id=user.id).aggregate(
+            items=Count("template__items"), applied=Max("created_at")
+        )
+
+    # ----- 목록 변경 -----
+
+    @staticmethod
+    def get_list_validators(user: "User") -> Tuple[int, Optional[datetime]]:
+        # 조건부 GET용 (활성 plan 수, 최종 수정 시각)
+        # 삭제된 plan도 updated_at 이 갱신되므로 최종 수정 시각 집계에 포함한다
+        def aggregate() -> Tuple[int, Optional[datetime]]:
+            result = Plan.objects.filter(planner_id=user.id).aggregate(
+                count=Count("id", filter=Q(is_deleted=False)),
+                overridden=Count("id", filter=Q(template_item__isnull=False)),
+                last=Max("updated_at"),
+            )
+            return _validators(result, PlanService._template_counts(user))
+
+        return PlanService.list_cache.get_or_build(
+            user.id, {}, aggregate, kind="validators"
+        )
 
     @staticmethod
     def create_plan(data: Dict[str, Any], user: "User") -> Plan:
         # id을 planner로 설정
         data["planner_id"] = user.id  # user가 아닌 id으로 설정
-        return Plan.objects.create(**data)
+        if data.get("ordering_num") is None:
+            # 순서를 주지 않으면 목록 맨 뒤에 추가
+            data["ordering_num"] = PlanService._next_ordering_num(user)
+        # 행과 변경 기록을 한 트랜잭션에 (delta sync 가 변경을 놓치지 않도록)
+        with transaction.atomic():
+            plan = Plan.objects.create(**data)
+            SyncService.record(user.id, Change.PLAN, [plan.id])
+            CalendarService.refresh_months(user.id, [(plan.start_date, plan.end_date)])
+        PlanService.list_cache.invalidate(user.id)
+        return plan
+
+    @staticmethod
+    def bulk_create_plans(items: List[Dict[str, Any]], user: "User") -> List[Plan]:
+        # 검증된 여러 plan 을 한 트랜잭션, 한 번의 INSERT 로 생성
+        # ordering_num 이 없는 항목은 요청 순서대로 목록 맨 뒤에 추가
+        with transaction.atomic():
+            plans = [Plan(planner_id=user.id, **item) for item in items]
+            assign_ordering_nums(
+                Plan.objects.filter(planner_id=user.id),
+                plans,
+                next_num=lambda: PlanService._next_ordering_num(user),
+            )
+            bulk_insert(Plan, plans)
+            SyncService.record(user.id, Change.PLAN, [plan.id for plan in plans])
+            CalendarService.refresh_months(
+                user.id, [(plan.start_date, plan.end_date) for plan in plans]
+            )
+        PlanService.list_cache.invalidate(user.id)
+        return plans
 
     @staticmethod
     def update_plan(plan_id: int, data: Dict[str, Any], user: "User") -> Plan:
+        # 템플릿 항목을 수정하면 그 항목의 Plan 행을 만들어 수정한다
+        plan_id = PlanService._materialize(user, [plan_id]).get(plan_id, plan_id)
         try:
             plan = Plan.objects.get(id=plan_id, planner_id=user.id)  # 수정된 부분
             print(f"Debug - Plan planner_id: {plan.planner_id}")
@@ -33,11 +282,19 @@ class PlanService:
                 raise PermissionError("Not authorized to update this plan")
 
             # 데이터 업데이트
+            previous = (plan.start_date, plan.end_date)
             for key, value in data.items():
                 if hasattr(plan, key):  # 해당 필드가 있는지 확인
                     setattr(plan, key, value)
 
-            plan.save()
+            with transaction.atomic():
+                plan.save()
+                SyncService.record(user.id, Change.PLAN, [plan.id])
+                if any(field in data for field in CALENDAR_FIELDS):
+                    CalendarService.refresh_months(
+                        user.id, [previous, (plan.start_date, plan.end_date)]
+                    )
+            PlanService.list_cache.invalidate(user.id)
             return plan
 
         except Plan.DoesNotExist:
@@ -45,15 +302,213 @@ class PlanService:
 
     @staticmethod
     def delete_plan(plan_id: int, user: "User") -> bool:
+        plan_id = PlanService._materialize(user, [plan_id]).get(plan_id, plan_id)
         plan = Plan.objects.get(id=plan_id, planner_id=user.id)  # user.id 사용
         plan.is_deleted = True
-        plan.save()
+        with transaction.atomic():
+            plan.save()
+            SyncService.record(user.id, Change.PLAN, [plan.id])
+            CalendarService.refresh_months(user.id, [(plan.start_date, plan.end_date)])
+        PlanService.list_cache.invalidate(user.id)
         return True
 
     @staticmethod
-    def update_plan_order(plans: List[Dict[str, Any]]) -> bool:
-        for plan_data in plans:
-            Plan.objects.filter(id=plan_data["id"]).update(
-                ordering_num=plan_data["ordering_num"]
+    def update_plan_order(
+        plans: List[Dict[str, Any]], user: "User"
+    ) -> List[Dict[str, Any]]:
+        # plan 순서 일괄 변경
+        # Args :
+        # - plans : [{"id": plan id, "ordering_num": 새 순서}, ...]
+        # - user : plan 소유자 (다른 사용자의 plan은 변경하지 않음)
+
+        # Returns :
+        # - 요청 순서대로 [{"id": plan id, "updated": 변경 여부}, ...]
+        #   (템플릿 항목은 새로 만든 Plan 행의 id)
+
+        # Raises :
+        # - ValueError : 요청 형식이 잘못된 경우
+        try:
+            orders = {int(item["id"]): int(item["ordering_num"]) for item in plans}
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Each item requires integer 'id' and 'ordering_num'")
+        mapping = PlanService._materialize(user, orders)
+        orders = {
+            mapping.get(plan_id, plan_id): ordering_num
+            for plan_id, ordering_num in orders.items()
+        }
+
+        ids = list(orders)
+        updated_ids: set[int] = set()
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        # 건별 UPDATE 대신 CASE WHEN 한 문장으로, 하나의 트랜잭션 안에서 처리
+        # (When 객체를 수천 개 컴파일하는 ORM 비용을 피하려고 SQL을 직접 만든다)
+        table = connection.ops.quote_name(Plan._meta.db_table)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(ids), ORDER_UPDATE_BATCH_SIZE):
+                batch = ids[start : start + ORDER_UPDATE_BATCH_SIZE]
+                updated_ids.update(
+                    Plan.objects.filter(planner_id=user.id, id__in=batch).values_list(
+                        "id", flat=True
+                    )
+                )
+                cases = " ".join(["WHEN %s THEN %s"] * len(batch))
+                placeholders = ", ".join(["%s"] * len(batch))
+                params: List[Any] = []
+                for plan_id in batch:
+                    params.extend([plan_id, orders[plan_id]])
+                params.extend([now, user.id, *batch])
+                cursor.execute(
+                    f"UPDATE {table} SET ordering_num = CASE id {cases} END, "
+                    f"updated_at = %s "
+                    f"WHERE planner_id = %s AND id IN ({placeholders})",
+                    params,
+                )
+            SyncService.record(user.id, Change.PLAN, sorted(updated_ids))
+
+        PlanService.list_cache.invalidate(user.id)
+        return [{"id": plan_id, "updated": plan_id in updated_ids} for plan_id in ids]
+
+    @staticmethod
+    def move_plan(
+        plan_id: int,
+        user: "User",
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+    ) -> Plan:
+        # plan 하나를 두 plan 사이로 이동 (이동한 plan 한 행만 수정)
+        # Raises :
+        # - Plan.DoesNotExist : plan을 찾을 수 없는 경우
+        # - ValueError : 이동 위치가 잘못된 경우
+        applied = PlanService._applied(user)
+        if applied:
+            plan_id, after_id, before_id = PlanService._materialize_neighbours(
+                user, applied, plan_id, after_id, before_id
             )
-        return True
+        with transaction.atomic():
+            plan = move_between(
+                Plan.objects.filter(planner_id=user.id, is_deleted=False),
+                plan_id,
+                after_id=after_id,
+                before_id=before_id,
+                on_rebalance=lambda ids: SyncService.record(user.id, Change.PLAN, ids),
+            )
+            SyncService.record(user.id, Change.PLAN, [plan.id])
+        PlanService.list_cache.invalidate(user.id)
+        return plan
+
+    @staticmethod
+    def _materialize_neighbours(
+        user: "User",
+        applied: List[AppliedPlanTemplate],
+        plan_id: int,
+        after_id: Optional[int],
+        before_id: Optional[int],
+    ) -> Tuple[int, Optional[int], Optional[int]]:
+        # 합친 목록에서 이동 위치의 양쪽 이웃을 찾아 이동할 plan 과 함께 Plan 행으로 만든다
+        # (Plan 행만 보는 move_between 이 사이의 템플릿 항목을 건너뛰지 않도록)
+        merged = PlanService._merge(user, applied)
+        if plan_id not in {plan.id for plan in merged}:
+            raise Plan.DoesNotExist(f"Plan with id {plan_id} does not exist")
+        others = [plan for plan in merged if plan.id != plan_id]
+        index = {plan.id: position for position, plan in enumerate(others)}
+        for neighbour_id in (after_id, before_id):
+            if neighbour_id is not None and neighbour_id not in index:
+                raise Plan.DoesNotExist(f"Plan with id {neighbour_id} does not exist")
+
+        if after_id is not None and before_id is None:
+            position = index[after_id] + 1
+            before_id = others[position].id if position < len(others) else None
+        elif before_id is not None and after_id is None:
+            position = index[before_id] - 1
+            after_id = others[position].id if position >= 0 else None
+
+        ids = [plan_id, *(i for i in (after_id, before_id) if i is not None)]
+        if after_id is not None and before_id is not None:
+            low = others[index[after_id]].ordering_num
+            high = others[index[before_id]].ordering_num
+            if high - low < 2:
+                # 전체 재정렬이 필요하면 템플릿 항목도 모두 Plan 행으로 만든다
+                ids = [plan.id for plan in merged]
+        mapping = PlanService._materialize(user, ids)
+        return (
+            mapping[plan_id],
+            None if after_id is None else mapping[after_id],
+            None if before_id is None else mapping[before_id],
+        )
+
+    # ----- async 뷰용 (Django async ORM, 스레드 풀을 거치지 않는다) -----
+
+    @staticmethod
+    async def aget_plans(
+        user: "User",
+        search_keyword: Optional[str] = None,
+        limit: int = SEARCH_RESULT_LIMIT,
+    ) -> PlanList:
+        # get_plans 의 async 버전 (QuerySet 자체는 지연 평가이므로
+        # 검색 백엔드 호출과 템플릿 합치기만 스레드에서 실행한다)
+        applied = [
+            item
+            async for item in AppliedPlanTemplate.objects.filter(planner_id=user.id)
+        ]
+        if search_keyword:
+            ids = await sync_to_async(get_search_backend().search)(
+                user.id, search_keyword, limit
+            )
+            if applied:
+                return await sync_to_async(PlanService._search_merged)(
+                    user, applied, ids, search_keyword, limit
+                )
+            return [plan async for plan in PlanService._ranked(user, ids)]
+        if applied:
+            return await sync_to_async(PlanService._merge)(user, applied)
+        return PlanService._active(user).order_by("ordering_num")
+
+    @staticmethod
+    async def aget_list_validators(user: "User") -> Tuple[int, Optional[datetime]]:
+        async def aggregate() -> Tuple[int, Optional[datetime]]:
+            result = await Plan.objects.filter(planner_id=user.id).aaggregate(
+                count=Count("id", filter=Q(is_deleted=False)),
+                overridden=Count("id", filter=Q(template_item__isnull=False)),
+                last=Max("updated_at"),
+            )
+            templates = await AppliedPlanTemplate.objects.filter(
+                planner_id=user.id
+            ).aaggregate(items=Count("template__items"), applied=Max("created_at"))
+            return _validators(result, templates)
+
+        return await PlanService.list_cache.aget_or_build(
+            user.id, {}, aggregate, kind="validators"
+        )
+
+    @staticmethod
+    async def acreate_plan(data: Dict[str, Any], user: "User") -> Plan:
+        # 행, 변경 기록, 월간 요약을 한 트랜잭션에 쓰므로 (async ORM 미지원)
+        # 동기 구현을 스레드에서 실행
+        return await sync_to_async(PlanService.create_plan)(data, user)
+
+    @staticmethod
+    async def aupdate_plan_order(
+        plans: List[Dict[str, Any]], user: "User"
+    ) -> List[Dict[str, Any]]:
+        # 트랜잭션이 필요하므로 (async ORM 미지원) 동기 구현을 스레드에서 실행
+        return await sync_to_async(PlanService.update_plan_order)(plans, user)
+
+
+def _after_last(lasts: List[Optional[int]]) -> int:
+    # 마지막 정렬 번호들 (행이 없으면 None) 다음 번호
+    last = max((value for value in lasts if value is not None), default=None)
+    return ORDERING_GAP if last is None else last + ORDERING_GAP
+
+
+def _validators(
+    plans: Dict[str, Any], templates: Dict[str, Any]
+) -> Tuple[int, Optional[datetime]]:
+    # (보이는 plan 수, 최종 수정 시각). 템플릿 항목 중 Plan 행이 만들어진 것은
+    # Plan 행 쪽에서 세므로 템플릿 항목 수에서 뺀다
+    count = plans["count"] + templates["items"] - plans["overridden"]
+    last = max(
+        (value for value in (plans["last"], templates["applied"]) if value is not None),
+        default=None,
+    )
+    return count, last
@@ -0,0 +1,54 @@
+from typing import Iterable, List, Optional
+
+from .models import AppliedPlanTemplate, Plan, PlanTemplateItem
+
+
+def template_plans(
+    planner_id: int,
+    applied: List[AppliedPlanTemplate],
+    overridden: Iterable[Optional[int]],
+    search_keyword: Optional[str] = None,
+    item_ids: Optional[Iterable[int]] = None,
+) -> List[Plan]:
+    # 템플릿 항목을 저장하지 않는 Plan 객체로 만든다.
+    # id 는 Plan 행과 겹치지 않도록 -(템플릿 항목 id) 를 쓴다
+    by_template = {item.template_id: item for item in applied}
+    items = PlanTemplateItem.objects.filter(template_id__in=by_template)
+    if search_keyword:
+        items = items.filter(title__icontains=search_keyword)
+    if item_ids is not None:
+        items = items.filter(id__in=item_ids)
+    skip = set(overridden)
+    plans = []
+    for item in items.order_by("ordering_num", "id"):
+        if item.id in skip:
+            continue
+        application = by_template[item.template_id]
+        plans.append(
+            Plan(
+                id=-item.id,
+                planner_id=planner_id,
+                ordering_num=application.ordering_offset + item.ordering_num,
+                title=item.title,
+                created_at=application.created_at,
+                updated_at=application.created_at,
+                template_item_id=item.id,
+            )
+        )
+    return plans
+
+
+def pending_template_plans(
+    planner_id: int, item_ids: Optional[Iterable[int]] = None
+) -> List[Plan]:
+    # 적용한 템플릿 항목 중 아직 Plan 행으로 만들지 않은 항목 (item_ids 로 한정 가능)
+    applied = list(AppliedPlanTemplate.objects.filter(planner_id=planner_id))
+    if not applied:
+        return []
+    overridden = Plan.objects.filter(
+        planner_id=planner_id, template_item__isnull=False
+    ).values_list("template_item_id", flat=True)
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        overridden = overridden.filter(template_item_id__in=item_ids)
+    return template_plans(planner_id, applied, overridden, item_ids=item_ids)
@@ -1,5 +1,10 @@
-from typing import Any, cast
+import json
+from typing import Any, Dict, List, cast
+from unittest import skipUnless
 
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
@@ -7,13 +12,20 @@ from rest_framework.response import Response
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from common.cache import CACHE_REQUESTS
+from common.pagination import KeysetPagination
+from common.testing import QueryPlanAssertionsMixin
 from user.models import User
 
-from .models import Plan
+from .models import Plan, PlanTemplate, PlanTemplateItem
+from .services import PlanService
 
 
 class PlanTests(APITestCase):
     def setUp(self) -> None:
+        # 테스트 간 목록 캐시가 섞이지 않도록 비운다
+        cache.clear()
+
         self.user = User.objects.create_user(
             username="testuser",  # user_id -> username으로 변경
             password="testpass123",
@@ -58,6 +70,24 @@ class PlanTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertNotIn("Test Plan", str(response.data))
 
+    def test_search_results_are_paged(self) -> None:
+        # 검색 결과도 page_size 에서 끊지 않고 Link 헤더로 다음 페이지를 이어 준다
+        for i in range(5):
+            Plan.objects.create(**{**self.plan_data, "ordering_num": i})
+        url = reverse("plan:plan-list")
+        ids: List[int] = []
+        next_url = f"{url}?search=Test&page_size=2"
+        while next_url:
+            response = self.client.get(next_url)
+            ids.extend(item["id"] for item in response.data)
+            link = response.headers.get("Link")
+            next_url = link[1 : link.index(">")] if link else ""
+        self.assertCountEqual(ids, Plan.objects.values_list("id", flat=True))
+
+        cursor = KeysetPagination().encode_cursor([-1])
+        response = self.client.get(f"{url}?search=Test&cursor={cursor}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_update_plan(self) -> None:
         plan = Plan.objects.create(**self.plan_data)
         url = reverse("plan:plan-update", args=[plan.id])
@@ -76,3 +106,450 @@ class PlanTests(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(Plan.objects.get(id=plan.id).is_deleted)
+
+    def test_update_plan_order(self) -> None:
+        plans = [
+            Plan.objects.create(**{**self.plan_data, "ordering_num": i})
+            for i in range(3)
+        ]
+        other_user = User.objects.create_user(
+            username="otheruser",
+            password="otherpass123",
+            nickname="othernick",
+            email="other@test.com",
+        )
+        other_plan = Plan.objects.create(
+            **{**self.plan_data, "planner_id": other_user.id, "ordering_num": 7}
+        )
+
+        url = reverse("plan:plan-list")
+        order_data = [
+            {"id": plans[0].id, "ordering_num": 3},
+            {"id": plans[2].id, "ordering_num": 1},
+            {"id": other_plan.id, "ordering_num": 1},
+        ]
+        response = self.client.patch(url, order_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"id": plans[0].id, "updated": True},
+                {"id": plans[2].id, "updated": True},
+                {"id": other_plan.id, "updated": False},
+            ],
+        )
+        self.assertEqual(Plan.objects.get(id=plans[0].id).ordering_num, 3)
+        self.assertEqual(Plan.objects.get(id=plans[1].id).ordering_num, 1)
+        self.assertEqual(Plan.objects.get(id=plans[2].id).ordering_num, 1)
+        # 다른 사용자의 plan은 변경되지 않아야 한다
+        self.assertEqual(Plan.objects.get(id=other_plan.id).ordering_num, 7)
+
+    def test_update_plan_order_invalid(self) -> None:
+        url = reverse("plan:plan-list")
+        response = self.client.patch(url, [{"id": 1}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_move_plan(self) -> None:
+        # 조밀한 순서(1, 2, 3)에서는 한 번 재정렬 후 이동한다
+        plans = [
+            Plan.objects.create(**{**self.plan_data, "ordering_num": i})
+            for i in range(1, 4)
+        ]
+        url = reverse("plan:plan-list")
+        response = self.client.patch(
+            url,
+            {"id": plans[2].id, "after_id": plans[0].id, "before_id": plans[1].id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ordered = list(
+            Plan.objects.order_by("ordering_num", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(ordered, [plans[0].id, plans[2].id, plans[1].id])
+
+        # 간격이 생긴 뒤에는 이동한 plan 한 행만 수정된다
+        before = dict(Plan.objects.values_list("id", "ordering_num"))
+        response = self.client.patch(
+            url, {"id": plans[0].id, "after_id": plans[1].id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        after = dict(Plan.objects.values_list("id", "ordering_num"))
+        self.assertEqual(after[plans[2].id], before[plans[2].id])
+        self.assertEqual(after[plans[1].id], before[plans[1].id])
+        self.assertGreater(after[plans[0].id], after[plans[1].id])
+
+    def test_move_plan_not_found(self) -> None:
+        plan = Plan.objects.create(**self.plan_data)
+        url = reverse("plan:plan-list")
+        response = self.client.patch(
+            url, {"id": plan.id, "after_id": 999}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_move_plan_with_same_neighbours(self) -> None:
+        plans = [
+            Plan.objects.create(**{**self.plan_data, "ordering_num": i})
+            for i in range(1, 3)
+        ]
+        response = self.client.patch(
+            reverse("plan:plan-list"),
+            {"id": plans[0].id, "after_id": plans[1].id, "before_id": plans[1].id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_plans_paginated(self) -> None:
+        for i in range(5):
+            Plan.objects.create(**{**self.plan_data, "ordering_num": i // 2})
+        url = reverse("plan:plan-list")
+
+        seen: list[int] = []
+        next_url = f"{url}?page_size=2"
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data), 2)
+            seen.extend(item["id"] for item in response.data)
+            link = response.headers.get("Link")
+            next_url = link[1 : link.index(">")] if link else ""
+
+        expected = list(
+            Plan.objects.order_by("ordering_num", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+        response = self.client.get(f"{url}?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # 형식은 맞지만 값의 타입이 정렬 필드와 다른 cursor
+        for values in (["x", "y"], [None, 1], [[1], 2]):
+            cursor = KeysetPagination().encode_cursor(values)
+            response = self.client.get(f"{url}?cursor={cursor}")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stream_plans(self) -> None:
+        for i in range(3):
+            Plan.objects.create(**{**self.plan_data, "ordering_num": i})
+        url = reverse("plan:plan-list")
+        response = self.client.get(f"{url}?stream=true")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(b"".join(cast(Any, response).streaming_content))
+        self.assertEqual([item["ordering_num"] for item in data], [0, 1, 2])
+
+        # 스트리밍도 검색어를 따른다
+        Plan.objects.create(**{**self.plan_data, "title": "Venue", "ordering_num": 3})
+        response = self.client.get(f"{url}?stream=true&search=Venue")
+        data = json.loads(b"".join(cast(Any, response).streaming_content))
+        self.assertEqual([item["title"] for item in data], ["Venue"])
+
+    def test_get_plans_cached_until_changed(self) -> None:
+        Plan.objects.create(**self.plan_data)
+        url = reverse("plan:plan-list")
+        self.client.get(url)
+
+        hits = CACHE_REQUESTS.value(cache="plan", result="hit")
+        # 캐시 적중 시에는 인증용 사용자 조회 외에 쿼리가 없어야 한다
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 1)
+        # 조건부 GET용 집계값과 목록 페이지 모두 캐시에서 읽는다
+        self.assertEqual(CACHE_REQUESTS.value(cache="plan", result="hit"), hits + 2)
+
+        # 생성 시 사용자 버전이 올라가 다음 조회는 새 목록을 읽는다
+        self.client.post(reverse("plan:plan-create"), self.plan_data, format="json")
+        response = self.client.get(url)
+        self.assertEqual(len(response.data), 2)
+
+        metrics = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('list_cache_requests_total{cache="plan",result="hit"}', metrics)
+
+    def test_get_plans_conditional(self) -> None:
+        plan = Plan.objects.create(**self.plan_data)
+        url = reverse("plan:plan-list")
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # 다른 페이지 조건은 다른 ETag를 가진다
+        response = self.client.get(f"{url}?page_size=1", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 삭제 후에는 ETag가 바뀌어 새 목록을 받는다
+        self.client.delete(reverse("plan:plan-delete", args=[plan.id]))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.data, [])
+
+    def test_async_create_and_list_plans(self) -> None:
+        url = reverse("plan:plan-create-async")
+        for _ in range(2):
+            response = self.client.post(url, self.plan_data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Plan.objects.filter(planner_id=self.user.id).count(), 2)
+
+        list_url = reverse("plan:plan-list-async")
+        response = self.client.get(f"{list_url}?page_size=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 1)
+        link = response.headers["Link"]
+        # 캐시에서 응답해도 Link 헤더를 유지한다
+        response = self.client.get(f"{list_url}?page_size=1")
+        self.assertEqual(response.headers["Link"], link)
+        response = self.client.get(link[1 : link.index(">")])
+        self.assertEqual(len(response.json()), 1)
+        self.assertNotIn("Link", response.headers)
+
+        # 동기 뷰와 같은 ETag 로 조건부 GET을 처리한다
+        etag = self.client.get(list_url).headers["ETag"]
+        response = self.client.get(reverse("plan:plan-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_async_views_require_authentication(self) -> None:
+        self.client.credentials()
+        response = self.client.get(reverse("plan:plan-list-async"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = self.client.get(reverse("plan:plan-list-async"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create_plans(self) -> None:
+        """여러 plan 을 한 요청, 한 번의 INSERT 로 생성"""
+        Plan.objects.create(**self.plan_data)
+        items: List[Dict[str, Any]] = [{"title": f"Plan {i}"} for i in range(80)]
+        items[0]["ordering_num"] = 5
+        # 인증 사용자 조회 1 + 정렬 번호 집계 1 + INSERT 1 + 변경 기록 INSERT 1
+        # + savepoint 2
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                reverse("plan:plan-bulk-create"), items, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["ids"]), 80)
+
+        created = Plan.objects.in_bulk(response.data["ids"])
+        self.assertEqual(created[response.data["ids"][0]].ordering_num, 5)
+        self.assertEqual(
+            [created[pk].ordering_num for pk in response.data["ids"][1:3]],
+            [1 + 1024, 1 + 2048],
+        )
+        self.assertTrue(
+            all(plan.planner_id == self.user.id for plan in created.values())
+        )
+
+    def test_bulk_create_plans_is_all_or_nothing(self) -> None:
+        items = [{"title": "ok"}, {"ordering_num": 3}]
+        response = self.client.post(
+            reverse("plan:plan-bulk-create"), items, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", response.data["error"][1])
+        self.assertFalse(Plan.objects.exists())
+
+        response = self.client.post(
+            reverse("plan:plan-bulk-create"), {"title": "x"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PlanTemplateTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass123",
+            nickname="testnick",
+            email="test@test.com",
+        )
+        self.template = PlanTemplate.objects.create(name="웨딩 체크리스트")
+        self.items = PlanTemplateItem.objects.bulk_create(
+            [
+                PlanTemplateItem(
+                    template=self.template, ordering_num=(i + 1) * 1024, title=title
+                )
+                for i, title in enumerate(["상견례", "웨딩홀 예약", "스드메", "청첩장"])
+            ]
+        )
+        refresh = RefreshToken.for_user(self.user)
+        access_token = cast(Any, refresh).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {str(access_token)}")
+
+    def _apply(self) -> Response:
+        return cast(
+            Response,
+            self.client.post(
+                reverse("plan:plan-template-apply", args=[self.template.id])
+            ),
+        )
+
+    def _titles(self) -> List[str]:
+        response = self.client.get(reverse("plan:plan-list"))
+        return [item["title"] for item in response.data]
+
+    def test_apply_template_without_copying_rows(self) -> None:
+        Plan.objects.create(planner_id=self.user.id, ordering_num=5000, title="예산")
+        response = self._apply()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._apply().status_code, status.HTTP_200_OK)
+
+        # 템플릿 항목은 기존 plan 뒤에 음수 id 로 보이고, Plan 행은 늘지 않는다
+        response = self.client.get(reverse("plan:plan-list"))
+        self.assertEqual(
+            [item["title"] for item in response.data],
+            ["예산", "상견례", "웨딩홀 예약", "스드메", "청첩장"],
+        )
+        self.assertEqual(response.data[1]["id"], -self.items[0].id)
+        self.assertEqual(response.data[1]["template_item"], self.items[0].id)
+        self.assertEqual(Plan.objects.count(), 1)
+
+        # 새 plan 은 템플릿 항목 뒤에 추가된다
+        self.client.post(
+            reverse("plan:plan-create"), {"title": "신혼여행"}, format="json"
+        )
+        self.assertEqual(self._titles()[-1], "신혼여행")
+
+        templates = self.client.get(reverse("plan:plan-template-list")).data
+        self.assertEqual(templates[0]["item_count"], 4)
+
+    def test_edit_and_delete_materialize_only_touched_items(self) -> None:
+        self._apply()
+        response = self.client.put(
+            reverse("plan:plan-update", args=[-self.items[1].id]),
+            {"title": "웨딩홀 계약"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(response.data["id"], 0)
+        self.client.delete(reverse("plan:plan-delete", args=[-self.items[2].id]))
+
+        self.assertEqual(self._titles(), ["상견례", "웨딩홀 계약", "청첩장"])
+        self.assertEqual(Plan.objects.filter(template_item__isnull=False).count(), 2)
+        # 조건부 GET 의 plan 수도 합친 목록 기준
+        self.assertEqual(PlanService.get_list_validators(self.user)[0], 3)
+
+        # 같은 템플릿을 적용한 다른 사용자에게는 영향이 없다
+        other = User.objects.create_user(
+            username="other", password="testpass123", nickname="o", email="o@test.com"
+        )
+        PlanService.apply_template(self.template.id, other)
+        self.assertEqual(
+            [plan.title for plan in PlanService.get_plans(other)],
+            ["상견례", "웨딩홀 예약", "스드메", "청첩장"],
+        )
+
+    def test_move_and_reorder_template_items(self) -> None:
+        Plan.objects.create(planner_id=self.user.id, ordering_num=1024, title="예산")
+        self._apply()
+        first, second, third, fourth = [-item.id for item in self.items]
+
+        # 맨 뒤 항목을 첫 항목 뒤로 (두 이웃 사이에 템플릿 항목이 남아 있어도 정확한 위치)
+        response = self.client.patch(
+            reverse("plan:plan-list"),
+            {"id": fourth, "after_id": first},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._titles(), ["예산", "상견례", "청첩장", "웨딩홀 예약", "스드메"]
+        )
+        # 이동한 항목과 양쪽 이웃만 Plan 행이 된다
+        self.assertFalse(Plan.objects.filter(template_item=self.items[2]).exists())
+
+        response = self.client.patch(
+            reverse("plan:plan-list"),
+            [{"id": third, "ordering_num": 0}],
+            format="json",
+        )
+        self.assertTrue(response.data["results"][0]["updated"])
+        self.assertEqual(self._titles()[0], "스드메")
+        self.assertEqual(Plan.objects.count(), 5)
+
+    def test_paginate_and_search_merged_list(self) -> None:
+        self._apply()
+        Plan.objects.create(planner_id=self.user.id, ordering_num=99999, title="본식")
+        url = reverse("plan:plan-list")
+        titles: List[str] = []
+        next_url = f"{url}?page_size=2"
+        while next_url:
+            response = self.client.get(next_url)
+            titles.extend(item["title"] for item in response.data)
+            link = response.headers.get("Link")
+            next_url = link[1 : link.index(">")] if link else ""
+        self.assertEqual(titles, ["상견례", "웨딩홀 예약", "스드메", "청첩장", "본식"])
+
+        response = self.client.get(f"{url}?search=웨딩")
+        self.assertEqual([item["title"] for item in response.data], ["웨딩홀 예약"])
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class PlanQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass123",
+            nickname="testnick",
+            email="test@test.com",
+        )
+
+    def test_get_plans_uses_index(self) -> None:
+        # 템플릿을 적용하지 않은 사용자는 QuerySet 을 받는다
+        plans = cast(QuerySet[Plan], PlanService.get_plans(self.user))
+        self.assertUsesIndex(plans, "plan_planner_order_idx")
+
+    def test_plan_page_uses_index(self) -> None:
+        paginator = KeysetPagination()
+        plans = (
+            cast(QuerySet[Plan], PlanService.get_plans(self.user))
+            .order_by(*paginator.ordering)
+            .filter(paginator._after([10, 3]))
+        )
+        self.assertUsesIndex(plans, "plan_planner_order_idx")
+
+
+class PlanSearchTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass123",
+            nickname="testnick",
+            email="test@test.com",
+        )
+
+    def _create(self, title: str, planner_id: int = 0) -> Plan:
+        return Plan.objects.create(
+            planner_id=planner_id or self.user.id, ordering_num=0, title=title
+        )
+
+    def test_search_korean_substring(self) -> None:
+        hall = self._create("웨딩홀 투어 예약")
+        dress = self._create("웨딩드레스 가봉")
+        self._create("스튜디오 촬영")
+        self._create("웨딩홀 계약", planner_id=self.user.id + 1)
+
+        plans = PlanService.get_plans(self.user, "웨딩홀")
+        self.assertEqual([plan.id for plan in plans], [hall.id])
+
+        plans = PlanService.get_plans(self.user, "웨딩")
+        self.assertEqual({plan.id for plan in plans}, {hall.id, dress.id})
+
+    def test_search_ranked_by_relevance(self) -> None:
+        weak = self._create("예약 확인 후 식장 답사 일정 정리 및 견적 비교")
+        strong = self._create("식장 답사")
+        plans = PlanService.get_plans(self.user, "식장 답사")
+        self.assertEqual([plan.id for plan in plans], [strong.id, weak.id])
+
+    def test_search_index_follows_updates(self) -> None:
+        plan = self._create("청첩장 주문")
+        PlanService.update_plan(plan.id, {"title": "모바일 청첩장"}, self.user)
+        self.assertEqual(
+            [p.id for p in PlanService.get_plans(self.user, "모바일")], [plan.id]
+        )
+        self.assertFalse(PlanService.get_plans(self.user, "주문"))
+
+        PlanService.delete_plan(plan.id, self.user)
+        self.assertFalse(PlanService.get_plans(self.user, "청첩장"))
@@ -1,12 +1,39 @@
-from django.urls import path
+from django.urls import path, register_converter
+from django.urls.converters import IntConverter
 
 from . import views
 
+
+class SignedIntConverter(IntConverter):
+    # 템플릿 항목 plan 은 음수 id 를 쓴다
+    regex = "-?[0-9]+"
+
+
+register_converter(SignedIntConverter, "signed_int")
+
 app_name = "plan"
 
 urlpatterns = [
     path("", views.PlanListView.as_view(), name="plan-list"),
     path("create/", views.PlanCreateView.as_view(), name="plan-create"),
-    path("<int:plan_id>/", views.PlanUpdateView.as_view(), name="plan-update"),
-    path("<int:plan_id>/delete/", views.PlanDeleteView.as_view(), name="plan-delete"),
+    path("bulk/", views.PlanBulkCreateView.as_view(), name="plan-bulk-create"),
+    path("templates/", views.PlanTemplateListView.as_view(), name="plan-template-list"),
+    path(
+        "templates/<int:template_id>/apply/",
+        views.PlanTemplateApplyView.as_view(),
+        name="plan-template-apply",
+    ),
+    # ASGI 전용 async 뷰
+    path("async/", views.AsyncPlanListView.as_view(), name="plan-list-async"),
+    path(
+        "async/create/",
+        views.AsyncPlanCreateView.as_view(),
+        name="plan-create-async",
+    ),
+    path("<signed_int:plan_id>/", views.PlanUpdateView.as_view(), name="plan-update"),
+    path(
+        "<signed_int:plan_id>/delete/",
+        views.PlanDeleteView.as_view(),
+        name="plan-delete",
+    ),
 ]
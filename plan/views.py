@@ -1,36 +1,114 @@
 from typing import Any, Dict, List, cast
 
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from plan.models import Plan
+from common.async_views import AsyncAPIView
+from common.bulk import validate_bulk
+from common.conditional import aconditional_list_response, conditional_list_response
+from common.ordering import optional_int
+from common.pagination import (
+    KeysetPagination,
+    astream_list_response,
+    is_stream_request,
+    stream_list_response,
+)
+from plan.models import Plan, PlanTemplate
 from user.models import User
 
-from .serializers import PlanSerializer
+from .serializers import (
+    PlanBulkCreateSerializer,
+    PlanSerializer,
+    PlanTemplateSerializer,
+)
 from .services import PlanService
 
 
 class PlanListView(APIView):
     permission_classes = [IsAuthenticated]  # 추가
 
-    def get(self, request: Request) -> Response:
-        search_keyword = request.query_params.get("search")
-        plans = PlanService.get_plans(cast(User, request.user), search_keyword)
-        serializer = PlanSerializer(plans, many=True)
-        return Response(serializer.data)
+    def get(self, request: Request) -> HttpResponseBase:
+        # 목록이 바뀌지 않았으면 집계 쿼리 한 번으로 304 응답
+        user = cast(User, request.user)
+        count, last_modified = PlanService.get_list_validators(user)
+        return conditional_list_response(
+            request,
+            f"plan:{user.id}",
+            count,
+            last_modified,
+            lambda: self._list(request, user),
+        )
+
+    def _list(self, request: Request, user: User) -> HttpResponseBase:
+        if is_stream_request(request):
+            # 검색어가 있으면 검색 결과(관련도 순)를 스트리밍한다
+            plans = PlanService.get_plans(user, request.query_params.get("search"))
+            return stream_list_response(plans, PlanSerializer)
+
+        paginator = KeysetPagination()
+
+        def build() -> Dict[str, Any]:
+            search_keyword = request.query_params.get("search")
+            if search_keyword:
+                # 검색 결과는 관련도 순. 다음 페이지는 순위 위치 cursor 로 이어 읽는다
+                plans = PlanService.get_plans(
+                    user, search_keyword, limit=_search_limit(paginator, request)
+                )
+                page = paginator.paginate_ranked(plans, request)
+                return paginator.get_payload(PlanSerializer(page, many=True).data)
+
+            page = paginator.paginate_queryset(
+                PlanService.get_plans(user), request, view=self
+            )
+            return paginator.get_payload(PlanSerializer(page, many=True).data)
+
+        payload = PlanService.list_cache.get_or_build(
+            user.id, request.query_params, build
+        )
+        return paginator.get_payload_response(request, payload)
 
     def patch(self, request: Request) -> Response:
         """plan 순서 업데이트"""
+        if isinstance(request.data, dict):
+            return self._move(request)
+
         order_data = cast(List[Dict[str, Any]], request.data)  # 타입 캐스팅
-        success = PlanService.update_plan_order(order_data)
-        if success:
-            return Response({"message": "Successfully updated order"})
-        return Response(
-            {"error": "Failed to update order"}, status=status.HTTP_400_BAD_REQUEST
-        )
+        if not isinstance(order_data, list):
+            return Response(
+                {"error": "Failed to update order"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            results = PlanService.update_plan_order(
+                order_data, cast(User, request.user)
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": "Successfully updated order", "results": results})
+
+    def _move(self, request: Request) -> Response:
+        """plan 하나를 after_id 뒤, before_id 앞으로 이동"""
+        try:
+            plan = PlanService.move_plan(
+                int(request.data["id"]),
+                cast(User, request.user),
+                after_id=optional_int(request.data.get("after_id")),
+                before_id=optional_int(request.data.get("before_id")),
+            )
+        except Plan.DoesNotExist:
+            return Response(
+                {"error": "Plan not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = PlanSerializer(plan)
+        return Response(serializer.data)
 
 
 class PlanCreateView(APIView):
@@ -42,6 +120,21 @@ class PlanCreateView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class PlanBulkCreateView(APIView):
+    # plan 일괄 생성 API (요청 본문은 plan 배열). 생성된 id 를 요청 순서대로 반환
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        try:
+            items = validate_bulk(PlanBulkCreateSerializer, request.data)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        plans = PlanService.bulk_create_plans(items, cast(User, request.user))
+        return Response(
+            {"ids": [plan.id for plan in plans]}, status=status.HTTP_201_CREATED
+        )
+
+
 class PlanUpdateView(APIView):
     permission_classes = [IsAuthenticated]  # 추가
 
@@ -72,3 +165,124 @@ class PlanDeleteView(APIView):
         """plan 삭제 (soft delete)"""
         PlanService.delete_plan(plan_id, cast(User, request.user))
         return Response({"message": "Successfully deleted"})
+
+
+class PlanTemplateListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        serializer = PlanTemplateSerializer(PlanService.get_templates(), many=True)
+        return Response(serializer.data)
+
+
+class PlanTemplateApplyView(APIView):
+    # 템플릿 항목을 내 plan 목록 맨 뒤에 추가 (항목은 복사하지 않고 목록 조회 시 합친다)
+    # 템플릿에서 온 plan 은 음수 id 로 보이며, 수정/삭제/이동하면 새 id 의 plan 이 된다
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request, template_id: int) -> Response:
+        try:
+            applied, created = PlanService.apply_template(
+                template_id, cast(User, request.user)
+            )
+        except PlanTemplate.DoesNotExist:
+            return Response(
+                {"error": "Template not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(
+            {"template_id": applied.template_id, "applied_at": applied.created_at},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class AsyncPlanListView(AsyncAPIView):
+    # PlanListView 의 async 버전 (ASGI 에서 스레드 풀을 거치지 않는다)
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        user = cast(User, request.user)
+        count, last_modified = await PlanService.aget_list_validators(user)
+        return await aconditional_list_response(
+            request,
+            f"plan:{user.id}",
+            count,
+            last_modified,
+            lambda: self._list(request, user),
+        )
+
+    async def _list(self, request: HttpRequest, user: User) -> HttpResponseBase:
+        if is_stream_request(request):
+            return astream_list_response(
+                await PlanService.aget_plans(user, request.GET.get("search")),
+                PlanSerializer,
+            )
+
+        paginator = KeysetPagination()
+
+        async def build() -> Dict[str, Any]:
+            search_keyword = request.GET.get("search")
+            if search_keyword:
+                plans = await PlanService.aget_plans(
+                    user, search_keyword, limit=_search_limit(paginator, request)
+                )
+                page = paginator.paginate_ranked(plans, request)
+                return paginator.get_payload(PlanSerializer(page, many=True).data)
+
+            page = await paginator.apaginate_queryset(
+                await PlanService.aget_plans(user), request
+            )
+            return paginator.get_payload(PlanSerializer(page, many=True).data)
+
+        try:
+            payload = await PlanService.list_cache.aget_or_build(
+                user.id, request.GET, build
+            )
+        except NotFound as e:
+            return self.error(e.detail, status.HTTP_404_NOT_FOUND)
+        response = self.respond(payload["results"])
+        link = paginator.get_payload_link_header(request, payload)
+        if link is not None:
+            response["Link"] = link
+        return response
+
+    async def patch(self, request: HttpRequest) -> HttpResponseBase:
+        """plan 순서 업데이트 (목록) 또는 plan 하나 이동 (객체)"""
+        data = self.data
+        user = cast(User, request.user)
+        if isinstance(data, dict):
+            try:
+                plan = await sync_to_async(PlanService.move_plan)(
+                    int(data["id"]),
+                    user,
+                    after_id=optional_int(data.get("after_id")),
+                    before_id=optional_int(data.get("before_id")),
+                )
+            except Plan.DoesNotExist:
+                return self.error("Plan not found", status.HTTP_404_NOT_FOUND)
+            except (KeyError, TypeError, ValueError) as e:
+                return self.error(e, status.HTTP_400_BAD_REQUEST)
+            return self.respond(PlanSerializer(plan).data)
+
+        if not isinstance(data, list):
+            return self.error("Failed to update order", status.HTTP_400_BAD_REQUEST)
+        try:
+            results = await PlanService.aupdate_plan_order(data, user)
+        except ValueError as e:
+            return self.error(e, status.HTTP_400_BAD_REQUEST)
+        return self.respond(
+            {"message": "Successfully updated order", "results": results}
+        )
+
+
+class AsyncPlanCreateView(AsyncAPIView):
+    # PlanCreateView 의 async 버전
+
+    async def post(self, request: HttpRequest) -> HttpResponseBase:
+        if not isinstance(self.data, dict):
+            return self.error("Invalid plan data", status.HTTP_400_BAD_REQUEST)
+        plan = await PlanService.acreate_plan(self.data, cast(User, request.user))
+        return self.respond(PlanSerializer(plan).data, status.HTTP_201_CREATED)
+
+
+def _search_limit(paginator: KeysetPagination, request: HttpRequest) -> int:
+    # 요청한 페이지와 다음 페이지 존재 여부를 알 수 있을 만큼의 검색 결과 수
+    return paginator.get_offset(request) + paginator.get_page_size(request) + 1
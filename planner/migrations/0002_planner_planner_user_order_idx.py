@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("planner", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="planner",
+            index=models.Index(
+                fields=["user", "ordering_num"], name="planner_user_order_idx"
+            ),
+        ),
+    ]
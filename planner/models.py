@@ -26,6 +26,12 @@ class Planner(models.Model):
         ordering = ["ordering_num"]  # 정렬 우선 순위에 따라 정렬
         verbose_name = "플래너"
         verbose_name_plural = "플래너들"
+        indexes = [
+            # 사용자별 플래너 목록: user 조건, ordering_num 정렬
+            models.Index(
+                fields=["user", "ordering_num"], name="planner_user_order_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -23,6 +23,10 @@ class PlannerSerializer(serializers.ModelSerializer):  # type: ignore
             "created_at",
             "updated_at",
         ]  # 직렬화할 필드 목록
+        # ordering_num을 생략하면 서버에서 목록 맨 뒤 순서를 부여합니다.
+        extra_kwargs = {"ordering_num": {"required": False}}
+        # user 는 요청 사용자로 정해지므로 입력으로 받지 않습니다.
+        read_only_fields = ["user"]
 
     def create(self, validated_data: Dict[str, Any]) -> Planner:
         """
@@ -0,0 +1,184 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, Max, QuerySet
+
+from common.bulk import bulk_insert
+from common.cache import VersionedListCache
+from common.ordering import (
+    anext_ordering_num,
+    assign_ordering_nums,
+    move_between,
+    next_ordering_num,
+)
+from sync.models import Change
+from sync.services import SyncService
+from user.models import User
+
+from .models import Planner
+
+
+class PlannerService:
+    # 사용자별 플래너 목록 응답 캐시 (생성/수정/삭제/이동 시 무효화)
+    list_cache = VersionedListCache("planner")
+
+    @staticmethod
+    def get_planners(user: "User") -> QuerySet[Planner]:
+        # 사용자의 플래너 목록 (정렬은 KeysetPagination 이 담당)
+        return Planner.objects.filter(user_id=user.id)
+
+    @staticmethod
+    def get_list_validators(user: "User") -> Tuple[int, Optional[datetime]]:
+        # 조건부 GET용 (플래너 수, 최종 수정 시각)
+        # 플래너는 실제로 삭제되므로 삭제는 개수 변화로 드러난다
+        def aggregate() -> Tuple[int, Optional[datetime]]:
+            result = Planner.objects.filter(user_id=user.id).aggregate(
+                count=Count("id"), last=Max("updated_at")
+            )
+            return result["count"], result["last"]
+
+        return PlannerService.list_cache.get_or_build(
+            user.id, {}, aggregate, kind="validators"
+        )
+
+    @staticmethod
+    def next_ordering_num(user: "User") -> int:
+        # 새 플래너를 목록 맨 뒤에 추가할 때의 정렬 번호
+        return next_ordering_num(Planner.objects.filter(user_id=user.id))
+
+    @staticmethod
+    def bulk_create_planners(
+        items: List[Dict[str, Any]], user: "User"
+    ) -> List[Planner]:
+        # 검증된 여러 플래너를 한 트랜잭션, 한 번의 INSERT 로 생성
+        # ordering_num 이 없는 항목은 요청 순서대로 목록 맨 뒤에 추가
+        with transaction.atomic():
+            planners = [Planner(user_id=user.pk, **item) for item in items]
+            assign_ordering_nums(Planner.objects.filter(user_id=user.pk), planners)
+            bulk_insert(Planner, planners)
+            SyncService.record(
+                user.pk, Change.PLANNER, [planner.id for planner in planners]
+            )
+        PlannerService.list_cache.invalidate(user.pk)
+        return planners
+
+    @staticmethod
+    def move_planner(
+        planner_id: int,
+        user: "User",
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+    ) -> Planner:
+        # 플래너 하나를 두 플래너 사이로 이동 (이동한 플래너 한 행만 수정)
+        # Raises :
+        # - Planner.DoesNotExist : 플래너를 찾을 수 없는 경우
+        # - ValueError : 이동 위치가 잘못된 경우
+        with transaction.atomic():
+            planner = move_between(
+                Planner.objects.filter(user_id=user.id),
+                planner_id,
+                after_id=after_id,
+                before_id=before_id,
+                on_rebalance=lambda ids: SyncService.record(
+                    user.id, Change.PLANNER, ids
+                ),
+            )
+            SyncService.record(user.id, Change.PLANNER, [planner.id])
+        PlannerService.list_cache.invalidate(user.id)
+        return planner
+
+    # ----- async 뷰용 (Django async ORM, 스레드 풀을 거치지 않는다) -----
+
+    @staticmethod
+    async def aget_list_validators(user: "User") -> Tuple[int, Optional[datetime]]:
+        async def aggregate() -> Tuple[int, Optional[datetime]]:
+            result = await Planner.objects.filter(user_id=user.id).aaggregate(
+                count=Count("id"), last=Max("updated_at")
+            )
+            return result["count"], result["last"]
+
+        return await PlannerService.list_cache.aget_or_build(
+            user.id, {}, aggregate, kind="validators"
+        )
+
+    @staticmethod
+    async def acreate_planner(user: "User", data: Dict[str, Any]) -> Planner:
+        # data : PlannerSerializer 로 검증된 데이터
+        if data.get("ordering_num") is None:
+            data["ordering_num"] = await anext_ordering_num(
+                Planner.objects.filter(user_id=user.id)
+            )
+
+        # 행과 변경 기록을 한 트랜잭션에 (async ORM 미지원, 스레드에서 실행)
+        @sync_to_async
+        def create() -> Planner:
+            with transaction.atomic():
+                planner = Planner.objects.create(**{**data, "user_id": user.id})
+                SyncService.record(user.id, Change.PLANNER, [planner.id])
+            return planner
+
+        planner = await create()
+        await PlannerService.list_cache.ainvalidate(user.id)
+        return planner
+
+    @staticmethod
+    async def aget_planner(planner_id: int, user: "User") -> Planner:
+        # Raises :
+        # - Planner.DoesNotExist : 플래너를 찾을 수 없는 경우
+        return await Planner.objects.aget(id=planner_id, user_id=user.id)
+
+    @staticmethod
+    async def aupdate_planner(
+        planner_id: int, user: "User", data: Dict[str, Any]
+    ) -> Planner:
+        # data : PlannerSerializer(partial=True) 로 검증된 데이터
+        # Raises :
+        # - Planner.DoesNotExist : 플래너를 찾을 수 없는 경우
+        planner = await Planner.objects.aget(id=planner_id, user_id=user.id)
+        for key, value in data.items():
+            setattr(planner, key, value)
+
+        @sync_to_async
+        def save() -> None:
+            with transaction.atomic():
+                planner.save()
+                SyncService.record(user.id, Change.PLANNER, [planner.id])
+
+        await save()
+        await PlannerService.list_cache.ainvalidate(user.id)
+        return planner
+
+    @staticmethod
+    async def adelete_planner(planner_id: int, user: "User") -> bool:
+        # Raises :
+        # - Planner.DoesNotExist : 플래너를 찾을 수 없는 경우
+
+        @sync_to_async
+        def delete() -> None:
+            with transaction.atomic():
+                deleted, _ = Planner.objects.filter(
+                    id=planner_id, user_id=user.id
+                ).delete()
+                if not deleted:
+                    raise Planner.DoesNotExist(
+                        f"Planner with id {planner_id} does not exist"
+                    )
+                SyncService.record(user.id, Change.PLANNER, [planner_id])
+
+        await delete()
+        await PlannerService.list_cache.ainvalidate(user.id)
+        return True
+
+    @staticmethod
+    async def amove_planner(
+        planner_id: int,
+        user: "User",
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+    ) -> Planner:
+        # 재정렬에 트랜잭션이 필요하므로 동기 구현을 스레드에서 실행
+        return await sync_to_async(PlannerService.move_planner)(
+            planner_id, user, after_id=after_id, before_id=before_id
+        )
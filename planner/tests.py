@@ -1,15 +1,22 @@
 import uuid  # UUID 모듈을 사용하여 고유한 문자열 생성
+from unittest import skipUnless
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from common.testing import QueryPlanAssertionsMixin
+
 from .models import Planner
 
 User = get_user_model()
 
 
+@override_settings(LOGIN_AUDIT={"EAGER": True})
 class PlannerTests(APITestCase):
     """
     Planner API에 대한 테스트 케이스
@@ -20,6 +27,9 @@ class PlannerTests(APITestCase):
         각 테스트 메서드 실행 전에 호출되는 메서드.
         테스트 사용자 및 초기 데이터를 설정합니다.
         """
+        # 테스트 간 목록 캐시가 섞이지 않도록 비운다
+        cache.clear()
+
         # 고유한 이메일 주소 생성 (테스트 사용자 생성에 필요)
         unique_email = f"testuser_{uuid.uuid4()}@example.com"
 
@@ -70,3 +80,104 @@ class PlannerTests(APITestCase):
 
         # 삭제된 플래너가 데이터베이스에 존재하지 않는지 확인
         self.assertFalse(Planner.objects.filter(id=self.planner.id).exists())
+
+    def test_move_planner(self) -> None:
+        """
+        플래너를 맨 앞으로 이동하는 API 테스트
+        """
+        second = Planner.objects.create(
+            user=self.user, ordering_num=2, title="Second Planner"
+        )
+
+        response = self.client.patch(
+            reverse("planner-detail", kwargs={"pk": second.id}),
+            {"before_id": self.planner.id},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Planner.objects.values_list("id", flat=True)),
+            [second.id, self.planner.id],
+        )
+        # 이동한 플래너만 수정되어야 한다
+        self.planner.refresh_from_db()
+        self.assertEqual(self.planner.ordering_num, 1)
+
+    def test_list_planners_only_own(self) -> None:
+        """
+        플래너 목록에는 로그인한 사용자의 플래너만 포함되어야 한다
+        """
+        other_user = User.objects.create_user(
+            username="otheruser",
+            email=f"other_{uuid.uuid4()}@example.com",
+            password="otherpass123",
+        )
+        Planner.objects.create(user=other_user, ordering_num=1, title="Other")
+
+        response = self.client.get(self.planner_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data], [self.planner.id])
+
+    def test_async_planner_views(self) -> None:
+        """
+        async 플래너 API로 생성, 조회, 수정, 이동, 삭제를 수행하는 테스트
+        """
+        list_url = reverse("planner-list-create-async")
+        response = self.client.post(list_url, {"title": "Async"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = response.json()
+        self.assertEqual(created["user"], self.user.id)
+        # ordering_num 을 생략하면 목록 맨 뒤에 추가된다
+        self.assertGreater(created["ordering_num"], self.planner.ordering_num)
+
+        response = self.client.get(list_url)
+        self.assertEqual(
+            [item["id"] for item in response.json()], [self.planner.id, created["id"]]
+        )
+
+        detail_url = reverse("planner-detail-async", kwargs={"pk": created["id"]})
+        response = self.client.patch(detail_url, {"title": "Renamed"}, format="json")
+        self.assertEqual(response.json()["title"], "Renamed")
+        response = self.client.patch(
+            detail_url, {"before_id": self.planner.id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Planner.objects.values_list("id", flat=True)),
+            [created["id"], self.planner.id],
+        )
+
+        response = self.client.delete(detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.get(detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_planners(self) -> None:
+        """여러 플래너를 한 번에 생성하고 id 를 요청 순서대로 반환"""
+        response = self.client.post(
+            reverse("planner-bulk-create"),
+            [{"title": "A"}, {"title": "B"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        planners = Planner.objects.in_bulk(response.data["ids"])
+        self.assertEqual(
+            [planners[pk].title for pk in response.data["ids"]], ["A", "B"]
+        )
+        self.assertEqual(
+            [planners[pk].ordering_num for pk in response.data["ids"]], [1025, 2049]
+        )
+        self.assertTrue(all(p.user_id == self.user.id for p in planners.values()))
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class PlannerQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """
+    플래너 목록 쿼리가 인덱스를 사용하는지 검사
+    """
+
+    def test_list_planners_uses_index(self) -> None:
+        planners = Planner.objects.filter(user_id=1).order_by("ordering_num", "id")
+        self.assertUsesIndex(planners, "planner_user_order_idx")
@@ -1,10 +1,29 @@
 from django.urls import path
 
-from .views import PlannerDetailView, PlannerListCreateView
+from .views import (
+    AsyncPlannerDetailView,
+    AsyncPlannerListCreateView,
+    PlannerBulkCreateView,
+    PlannerDetailView,
+    PlannerListCreateView,
+)
 
 urlpatterns = [
     # 플래너 목록 조회 및 생성
     path("create/", PlannerListCreateView.as_view(), name="planner-list-create"),
+    # 플래너 일괄 생성
+    path("bulk/", PlannerBulkCreateView.as_view(), name="planner-bulk-create"),
     # 특정 플래너 조회, 수정 및 삭제
     path("<int:pk>/", PlannerDetailView.as_view(), name="planner-detail"),
+    # ASGI 전용 async 뷰
+    path(
+        "async/",
+        AsyncPlannerListCreateView.as_view(),
+        name="planner-list-create-async",
+    ),
+    path(
+        "async/<int:pk>/",
+        AsyncPlannerDetailView.as_view(),
+        name="planner-detail-async",
+    ),
 ]
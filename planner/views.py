@@ -1,12 +1,34 @@
-from typing import Any  # Any 타입을 사용하기 위해 추가
+from typing import Any, Dict, cast  # Any 타입을 사용하기 위해 추가
 
 from django.contrib.auth import get_user_model  # User 모델을 가져오기 위해 추가
+from django.db import transaction
 from django.db.models import QuerySet  # QuerySet 타입을 사용하기 위해 추가
-from rest_framework import generics, permissions
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+
+from common.async_views import AsyncAPIView
+from common.bulk import validate_bulk
+from common.conditional import aconditional_list_response, conditional_list_response
+from common.ordering import optional_int
+from common.pagination import (
+    KeysetPagination,
+    astream_list_response,
+    is_stream_request,
+    stream_list_response,
+)
+from sync.models import Change
+from sync.services import SyncService
+from user.models import User as CustomUser  # 커스텀 User 모델
 
 from .models import Planner
 from .serializers import PlannerSerializer
+from .services import PlannerService
 
 User = get_user_model()  # 현재 프로젝트의 User 모델 가져오기
 
@@ -22,6 +44,48 @@ class PlannerListCreateView(
     serializer_class = PlannerSerializer  # 사용할 직렬화 클래스 지정
     permission_classes = [permissions.IsAuthenticated]  # 인증된 사용자만 접근 가능
 
+    def get_queryset(self) -> QuerySet[Planner]:
+        """
+        현재 로그인한 사용자의 플래너만 반환합니다.
+        정렬과 페이지 구분은 KeysetPagination((ordering_num, id))이 담당합니다.
+        """
+        return self.queryset.filter(user_id=self.request.user.pk)
+
+    def list(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """
+        ?stream=true 이면 페이지 구분 없이 전체 목록을 스트리밍합니다.
+        목록이 바뀌지 않았으면 집계 쿼리 한 번으로 304를 응답합니다.
+        """
+        user = cast(CustomUser, request.user)
+        count, last_modified = PlannerService.get_list_validators(user)
+        return conditional_list_response(
+            request,
+            f"planner:{user.id}",
+            count,
+            last_modified,
+            lambda: self._list(request),
+        )
+
+    def _list(self, request: Request) -> HttpResponseBase:
+        if is_stream_request(request):
+            return stream_list_response(
+                self.get_queryset().order_by("ordering_num", "id"),
+                PlannerSerializer,
+            )
+
+        paginator = cast(KeysetPagination, self.paginator)
+
+        def build() -> Dict[str, Any]:
+            page = self.paginate_queryset(self.get_queryset())
+            return paginator.get_payload(self.get_serializer(page, many=True).data)
+
+        payload = PlannerService.list_cache.get_or_build(
+            cast(int, request.user.pk), request.query_params, build
+        )
+        return paginator.get_payload_response(request, payload)
+
     def perform_create(
         self, serializer: BaseSerializer[Any]
     ) -> None:  # BaseSerializer에 Any 타입 매개변수 추가
@@ -29,8 +93,39 @@ class PlannerListCreateView(
         새 플래너를 생성할 때 호출되는 메서드.
         현재 로그인한 사용자를 플래너의 사용자 필드에 자동으로 설정합니다.
         """
-        if isinstance(self.request.user, User):  # 사용자 타입 확인
-            serializer.save(user=self.request.user)  # 현재 사용자로 플래너를 저장
+        # request.user 는 토큰으로 만든 가벼운 사용자 객체일 수 있으므로 id 로 저장
+        user = cast(CustomUser, self.request.user)
+        extra = {}
+        if serializer.validated_data.get("ordering_num") is None:
+            # 순서를 주지 않으면 목록 맨 뒤에 추가
+            extra["ordering_num"] = PlannerService.next_ordering_num(user)
+        # 현재 사용자로 플래너를 저장하고, 같은 트랜잭션에 변경을 기록
+        with transaction.atomic():
+            planner = serializer.save(user_id=user.pk, **extra)
+            SyncService.record(user.pk, Change.PLANNER, [planner.id])
+        PlannerService.list_cache.invalidate(user.pk)
+
+
+class PlannerBulkCreateView(APIView):
+    """
+    플래너 일괄 생성 API (요청 본문은 플래너 배열).
+    생성된 id 를 요청 순서대로 반환합니다.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        try:
+            items = validate_bulk(PlannerSerializer, request.data)
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        planners = PlannerService.bulk_create_planners(
+            items, cast(CustomUser, request.user)
+        )
+        return Response(
+            {"ids": [planner.id for planner in planners]},
+            status=status.HTTP_201_CREATED,
+        )
 
 
 class PlannerDetailView(
@@ -50,6 +145,155 @@ class PlannerDetailView(
         """
         if self.request.user.is_authenticated:
             return self.queryset.filter(
-                user=self.request.user
+                user_id=self.request.user.pk
             )  # 인증된 사용자의 경우 필터링 수행
         return self.queryset.none()  # 비인증 사용자의 경우 빈 쿼리셋 반환
+
+    def perform_update(self, serializer: BaseSerializer[Any]) -> None:
+        """
+        플래너 수정 후 변경을 기록하고 목록 캐시를 무효화합니다.
+        """
+        user_id = cast(int, self.request.user.pk)
+        with transaction.atomic():
+            super().perform_update(serializer)
+            SyncService.record(
+                user_id, Change.PLANNER, [cast(Planner, serializer.instance).id]
+            )
+        PlannerService.list_cache.invalidate(user_id)
+
+    def perform_destroy(self, instance: Planner) -> None:
+        """
+        플래너 삭제 후 변경을 기록하고 목록 캐시를 무효화합니다.
+        """
+        planner_id = instance.id
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            SyncService.record(instance.user_id, Change.PLANNER, [planner_id])
+        PlannerService.list_cache.invalidate(instance.user_id)
+
+    def patch(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        after_id / before_id 가 주어지면 플래너를 두 플래너 사이로 이동하고,
+        그렇지 않으면 일반적인 부분 수정을 수행합니다.
+        """
+        if "after_id" not in request.data and "before_id" not in request.data:
+            return super().patch(request, *args, **kwargs)
+
+        try:
+            planner = PlannerService.move_planner(
+                int(kwargs["pk"]),
+                cast(CustomUser, request.user),
+                after_id=optional_int(request.data.get("after_id")),
+                before_id=optional_int(request.data.get("before_id")),
+            )
+        except Planner.DoesNotExist:
+            return Response(
+                {"error": "Planner not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except (TypeError, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(planner).data)
+
+
+class AsyncPlannerListCreateView(AsyncAPIView):
+    """
+    PlannerListCreateView 의 async 버전 (ASGI 에서 스레드 풀을 거치지 않습니다)
+    """
+
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        user = cast(CustomUser, request.user)
+        count, last_modified = await PlannerService.aget_list_validators(user)
+        return await aconditional_list_response(
+            request,
+            f"planner:{user.id}",
+            count,
+            last_modified,
+            lambda: self._list(request, user),
+        )
+
+    async def _list(self, request: HttpRequest, user: CustomUser) -> HttpResponseBase:
+        planners = PlannerService.get_planners(user)
+        if is_stream_request(request):
+            return astream_list_response(
+                planners.order_by("ordering_num", "id"), PlannerSerializer
+            )
+
+        paginator = KeysetPagination()
+
+        async def build() -> Dict[str, Any]:
+            page = await paginator.apaginate_queryset(planners, request)
+            return paginator.get_payload(PlannerSerializer(page, many=True).data)
+
+        try:
+            payload = await PlannerService.list_cache.aget_or_build(
+                user.id, request.GET, build
+            )
+        except NotFound as e:
+            return self.error(e.detail, status.HTTP_404_NOT_FOUND)
+        response = self.respond(payload["results"])
+        link = paginator.get_payload_link_header(request, payload)
+        if link is not None:
+            response["Link"] = link
+        return response
+
+    async def post(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        새 플래너를 생성합니다. ordering_num 을 생략하면 목록 맨 뒤에 추가합니다.
+        """
+        serializer = PlannerSerializer(data=self.data)
+        if not serializer.is_valid():
+            return self.respond(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        planner = await PlannerService.acreate_planner(
+            cast(CustomUser, request.user), dict(serializer.validated_data)
+        )
+        return self.respond(PlannerSerializer(planner).data, status.HTTP_201_CREATED)
+
+
+class AsyncPlannerDetailView(AsyncAPIView):
+    """
+    PlannerDetailView 의 async 버전
+    """
+
+    async def get(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        try:
+            planner = await PlannerService.aget_planner(
+                pk, cast(CustomUser, request.user)
+            )
+        except Planner.DoesNotExist:
+            return self.error("Planner not found", status.HTTP_404_NOT_FOUND)
+        return self.respond(PlannerSerializer(planner).data)
+
+    async def patch(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        """
+        after_id / before_id 가 주어지면 플래너를 두 플래너 사이로 이동하고,
+        그렇지 않으면 일반적인 부분 수정을 수행합니다.
+        """
+        user = cast(CustomUser, request.user)
+        data = self.data if isinstance(self.data, dict) else {}
+        try:
+            if "after_id" in data or "before_id" in data:
+                planner = await PlannerService.amove_planner(
+                    pk,
+                    user,
+                    after_id=optional_int(data.get("after_id")),
+                    before_id=optional_int(data.get("before_id")),
+                )
+            else:
+                serializer = PlannerSerializer(data=data, partial=True)
+                if not serializer.is_valid():
+                    return self.respond(serializer.errors, status.HTTP_400_BAD_REQUEST)
+                planner = await PlannerService.aupdate_planner(
+                    pk, user, dict(serializer.validated_data)
+                )
+        except Planner.DoesNotExist:
+            return self.error("Planner not found", status.HTTP_404_NOT_FOUND)
+        except (TypeError, ValueError) as e:
+            return self.error(e, status.HTTP_400_BAD_REQUEST)
+        return self.respond(PlannerSerializer(planner).data)
+
+    async def delete(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        try:
+            await PlannerService.adelete_planner(pk, cast(CustomUser, request.user))
+        except Planner.DoesNotExist:
+            return self.error("Planner not found", status.HTTP_404_NOT_FOUND)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# 변경 알림 : 응답 키 ("plans", "planners", "calendars") -> 바뀐 id 목록
+Message = Dict[str, List[int]]
+
+
+class Subscription:
+    """
+    한 연결(SSE 응답)의 알림 대기열.
+    받은 알림은 쌓아 두지 않고 종류별 id 집합으로 합치므로, 순서 변경처럼 짧은
+    시간에 연달아 오는 알림도 메모리를 늘리지 않고 한 번의 알림으로 전달됩니다.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._pending: Dict[str, Dict[int, None]] = {}
+        self._ready = asyncio.Event()
+
+    def put(self, message: Message) -> None:
+        # 구독한 이벤트 루프에서만 호출된다 (broker 가 call_soon_threadsafe 로 넘긴다)
+        for key, ids in message.items():
+            self._pending.setdefault(key, {}).update(dict.fromkeys(ids))
+        self._ready.set()
+
+    async def get(self, timeout: float, window: float = 0.0) -> Optional[Message]:
+        # 알림이 오면 window 초 동안 더 모은 뒤 합쳐서 반환, timeout 안에 없으면 None
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if window:
+            await asyncio.sleep(window)
+        pending, self._pending = self._pending, {}
+        self._ready.clear()
+        return {key: list(ids) for key, ids in pending.items()}
+
+
+class BaseBroker:
+    """
+    소유자(channel)별 변경 알림 pub/sub.
+    publish() 는 어느 스레드에서든 호출할 수 있고, subscribe() 는 알림을 받을
+    이벤트 루프 안에서 호출합니다. 여러 프로세스로 서비스할 때는 같은 인터페이스로
+    외부 pub/sub (예: Redis) 를 쓰는 broker 를 SYNC["BROKER"] 에 지정합니다.
+    """
+
+    def publish(self, channel: int, message: Message) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: int) -> Subscription:
+        raise NotImplementedError
+
+    def unsubscribe(self, channel: int, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    # 같은 프로세스 안의 구독자에게만 전달한다 (ASGI 워커 하나 또는 개발 서버용)
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: int, message: Message) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 연결
+                self.unsubscribe(channel, subscription)
+
+    def subscribe(self, channel: int) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel: int, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(channel)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[channel]
+
+
+@lru_cache(maxsize=1)
+def get_broker() -> BaseBroker:
+    # settings.SYNC["BROKER"] 가 있으면 그 클래스를, 없으면 InProcessBroker 를 쓴다
+    path = getattr(settings, "SYNC", {}).get("BROKER")
+    broker_class = import_string(path) if path else InProcessBroker
+    broker: BaseBroker = broker_class()
+    return broker
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("owner_id", models.BigIntegerField()),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("plan", "plan"),
+                            ("planner", "planner"),
+                            ("calendar", "calendar"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "sync_changes",
+                "indexes": [
+                    models.Index(
+                        fields=["owner_id", "id"], name="sync_change_owner_seq_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class Change(models.Model):
+    """
+    plan / planner / calendar 변경 기록 (delta sync 용 변경 순번).
+    id 가 단조 증가하는 순번이며, 클라이언트는 마지막으로 받은 순번(cursor)
+    이후의 기록만 받아 해당 행의 현재 상태를 내려받습니다.
+    """
+
+    PLAN = "plan"
+    PLANNER = "planner"
+    CALENDAR = "calendar"
+    KIND_CHOICES = [(PLAN, "plan"), (PLANNER, "planner"), (CALENDAR, "calendar")]
+
+    id = models.BigAutoField(primary_key=True)
+    owner_id = models.BigIntegerField()  # user id
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "sync_changes"
+        indexes = [
+            # SyncService.get_changes: owner_id 조건 + id(순번) 범위/정렬
+            models.Index(fields=["owner_id", "id"], name="sync_change_owner_seq_idx"),
+        ]
@@ -0,0 +1,137 @@
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from calendars.models import Calendar
+from plan.models import Plan
+from plan.templates import pending_template_plans
+from planner.models import Planner
+
+from .broker import get_broker
+from .models import Change
+
+DEFAULTS: Dict[str, Any] = {
+    # 한 번에 읽는 최대 변경 기록 수
+    "PAGE_SIZE": 1000,
+    # 이보다 최근 변경은 다음 동기화에서 다시 보낸다 (늦게 커밋되는 순번 대비)
+    "LAG_SECONDS": 5,
+    # 변경 알림 pub/sub (BaseBroker 하위 클래스 경로, 없으면 InProcessBroker)
+    "BROKER": None,
+    # 알림이 없을 때 연결 유지용 주석을 보내는 간격 (초)
+    "HEARTBEAT_SECONDS": 15,
+    # 첫 알림 뒤 이 시간 동안 온 알림을 합쳐서 한 번에 보낸다 (연속 순서 변경 등)
+    "COALESCE_SECONDS": 0.5,
+}
+
+# 응답 키 -> (Change.kind, 모델, 소유자 필드)
+KINDS: Dict[str, Tuple[str, Any, str]] = {
+    "plans": (Change.PLAN, Plan, "planner_id"),
+    "planners": (Change.PLANNER, Planner, "user_id"),
+    "calendars": (Change.CALENDAR, Calendar, "planner_id"),
+}
+
+
+def get_option(name: str) -> Any:
+    return {**DEFAULTS, **getattr(settings, "SYNC", {})}[name]
+
+
+# Change.kind -> 응답 키
+KEYS = {kind: key for key, (kind, _, _) in KINDS.items()}
+
+
+class SyncService:
+    """
+    오프라인 클라이언트용 delta sync.
+    각 서비스가 행을 만들거나 바꾸거나 삭제할 때 record() 로 변경 순번을 남기고,
+    get_changes() 는 cursor 이후 순번에 해당하는 행의 현재 상태(soft delete 포함)와
+    실제로 삭제된 행의 id 를 돌려줍니다. 기록과 함께 broker 로 변경 알림을 보내므로
+    클라이언트는 폴링 대신 /sync/events/ 를 구독하다가 알림이 오면 get_changes() 를 부릅니다.
+    """
+
+    @staticmethod
+    def record(owner_id: int, kind: str, object_ids: Iterable[int]) -> None:
+        # 변경 기록을 INSERT 한 번으로 남기고 (호출한 쪽 트랜잭션 안에서),
+        # 커밋된 뒤에 구독 중인 연결로 알린다
+        ids = list(dict.fromkeys(object_ids))
+        if not ids:
+            return
+        Change.objects.bulk_create(
+            [Change(owner_id=owner_id, kind=kind, object_id=pk) for pk in ids]
+        )
+        transaction.on_commit(lambda: get_broker().publish(owner_id, {KEYS[kind]: ids}))
+
+    @staticmethod
+    def get_snapshot(owner_id: int) -> Dict[str, Any]:
+        # cursor 가 없는 첫 동기화: 삭제되지 않은 전체 행과 이후 동기화에 쓸 cursor
+        # cursor 를 먼저 구하므로, 그 사이 바뀐 행은 다음 동기화에서 한 번 더 받는다
+        threshold = timezone.now() - timedelta(seconds=get_option("LAG_SECONDS"))
+        cursor = Change.objects.filter(
+            owner_id=owner_id, created_at__lt=threshold
+        ).aggregate(last=Max("id"))["last"]
+        # plan 은 목록 API 와 같이 적용한 템플릿의 항목(음수 id)까지 합친다
+        plans = list(
+            Plan.objects.filter(planner_id=owner_id, is_deleted=False).order_by("id")
+        )
+        return {
+            "plans": pending_template_plans(owner_id) + plans,
+            "planners": list(Planner.objects.filter(user_id=owner_id).order_by("id")),
+            "calendars": list(
+                Calendar.objects.filter(planner_id=owner_id, is_deleted=False).order_by(
+                    "id"
+                )
+            ),
+            "deleted": {key: [] for key in KINDS},
+            "cursor": cursor or 0,
+            "more": False,
+        }
+
+    @staticmethod
+    def get_changes(
+        owner_id: int, since: int, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        # since 이후 변경된 행 (종류별 쿼리 한 번씩, sync_change_owner_seq_idx)
+        # Returns : {"plans": [...], "planners": [...], "calendars": [...],
+        #            "deleted": {"plans": [id, ...], ...}, "cursor": int, "more": bool}
+        limit = limit or get_option("PAGE_SIZE")
+        rows = list(
+            Change.objects.filter(owner_id=owner_id, id__gt=since)
+            .order_by("id")
+            .values_list("id", "kind", "object_id", "created_at")[: limit + 1]
+        )
+        more = len(rows) > limit
+        rows = rows[:limit]
+
+        cursor = rows[-1][0] if rows else since
+        threshold = timezone.now() - timedelta(seconds=get_option("LAG_SECONDS"))
+        for change_id, _, _, created_at in rows:
+            if created_at >= threshold:
+                # 최근 구간부터는 cursor 를 앞당기지 않는다 (다음에 다시 보낸다)
+                cursor, more = change_id - 1, False
+                break
+
+        result: Dict[str, Any] = {"deleted": {}, "cursor": cursor, "more": more}
+        for key, (kind, model, owner_field) in KINDS.items():
+            ids = list(dict.fromkeys(row[2] for row in rows if row[1] == kind))
+            objs: List[Any] = (
+                list(
+                    model._default_manager.filter(
+                        id__in=ids, **{owner_field: owner_id}
+                    ).order_by("id")
+                )
+                if ids
+                else []
+            )
+            found = {obj.id for obj in objs}
+            item_ids = [-pk for pk in ids if pk < 0]
+            if key == "plans" and item_ids:
+                # 음수 id 는 적용한 템플릿 항목. 이미 Plan 행으로 만든 항목은 삭제로 보낸다
+                virtual = pending_template_plans(owner_id, item_ids)
+                objs = virtual + objs
+                found.update(obj.id for obj in virtual)
+            result[key] = objs
+            result["deleted"][key] = [pk for pk in ids if pk not in found]
+        return result
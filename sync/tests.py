@@ -0,0 +1,223 @@
+import threading
+from typing import Any, cast
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from calendars.models import Calendar
+from calendars.services import CalendarService
+from plan.models import Plan, PlanTemplate, PlanTemplateItem
+from plan.services import PlanService
+from planner.models import Planner
+from planner.services import PlannerService
+from user.models import User
+
+from .broker import InProcessBroker, get_broker
+from .models import Change
+from .services import SyncService
+
+
+@override_settings(SYNC={"LAG_SECONDS": 0})
+class SyncTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass123",
+            nickname="testnick",
+            email="test@test.com",
+        )
+        refresh = RefreshToken.for_user(self.user)
+        access_token = cast(Any, refresh).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {str(access_token)}")
+        self.url = reverse("sync:sync")
+
+    def test_snapshot_then_changes_with_tombstones(self) -> None:
+        # 첫 동기화는 전체 목록, 이후에는 바뀐 행과 실제로 삭제된 행의 id 만
+        kept = PlanService.create_plan({"title": "Kept"}, self.user)
+        removed = PlanService.create_plan({"title": "Removed"}, self.user)
+        planner = PlannerService.bulk_create_planners([{"title": "P"}], self.user)[0]
+        calendar = CalendarService.create_calendar(self.user.id)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [p["id"] for p in response.data["plans"]], [kept.id, removed.id]
+        )
+        self.assertEqual(len(response.data["planners"]), 1)
+        self.assertEqual(len(response.data["calendars"]), 1)
+        cursor = response.data["cursor"]
+        self.assertEqual(cursor, Change.objects.latest("id").id)
+
+        PlanService.delete_plan(removed.id, self.user)
+        self.client.delete(reverse("planner-detail", args=[planner.id]))
+        CalendarService.update_calendar(calendar.id, self.user.id, {})
+
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # soft delete 된 plan 은 is_deleted 인 행으로, 삭제된 플래너는 id 로
+        self.assertEqual([p["id"] for p in response.data["plans"]], [removed.id])
+        self.assertTrue(response.data["plans"][0]["is_deleted"])
+        self.assertEqual(response.data["planners"], [])
+        self.assertEqual(response.data["deleted"]["planners"], [planner.id])
+        self.assertEqual([c["id"] for c in response.data["calendars"]], [calendar.id])
+        self.assertFalse(response.data["more"])
+
+        # 그 뒤로 바뀐 것이 없으면 빈 응답과 같은 cursor
+        again = self.client.get(self.url, {"since": response.data["cursor"]})
+        self.assertEqual(again.data["plans"], [])
+        self.assertEqual(again.data["cursor"], response.data["cursor"])
+
+    def test_applied_template_items_are_synced(self) -> None:
+        # 템플릿 항목은 목록 API 와 같은 음수 id 의 plan 으로 보낸다
+        template = PlanTemplate.objects.create(name="체크리스트")
+        items = PlanTemplateItem.objects.bulk_create(
+            [
+                PlanTemplateItem(template=template, ordering_num=i, title=f"항목 {i}")
+                for i in range(2)
+            ]
+        )
+        cursor = self.client.get(self.url).data["cursor"]
+        PlanService.apply_template(template.id, self.user)
+
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(
+            [p["id"] for p in response.data["plans"]], [-items[0].id, -items[1].id]
+        )
+        snapshot = self.client.get(self.url)
+        self.assertCountEqual(
+            [p["id"] for p in snapshot.data["plans"]],
+            [p.id for p in PlanService.get_plans(self.user)],
+        )
+
+        # 항목을 수정하면 Plan 행이 생기고 가상 plan 은 삭제로 보낸다
+        plan = PlanService.update_plan(-items[0].id, {"title": "바꿈"}, self.user)
+        response = self.client.get(self.url, {"since": snapshot.data["cursor"]})
+        self.assertEqual([p["id"] for p in response.data["plans"]], [plan.id])
+        self.assertEqual(response.data["deleted"]["plans"], [-items[0].id])
+
+    def test_changes_are_paged_and_scoped_to_owner(self) -> None:
+        other = User.objects.create_user(
+            username="other", password="pass12345", nickname="o", email="o@test.com"
+        )
+        PlanService.create_plan({"title": "Other"}, other)
+        PlanService.bulk_create_plans(
+            [{"title": f"Plan {i}"} for i in range(3)], self.user
+        )
+
+        with override_settings(SYNC={"LAG_SECONDS": 0, "PAGE_SIZE": 2}):
+            first = self.client.get(self.url, {"since": 0})
+            self.assertEqual(len(first.data["plans"]), 2)
+            self.assertTrue(first.data["more"])
+            second = self.client.get(self.url, {"since": first.data["cursor"]})
+        self.assertEqual(len(second.data["plans"]), 1)
+        self.assertFalse(second.data["more"])
+        self.assertNotIn("Other", [p["title"] for p in second.data["plans"]])
+
+    def test_recent_changes_hold_the_cursor_back(self) -> None:
+        # 최근 구간의 변경은 보내되 cursor 는 그 앞에 머문다 (다음에 다시 받는다)
+        plan = PlanService.create_plan({"title": "Fresh"}, self.user)
+        with override_settings(SYNC={"LAG_SECONDS": 60}):
+            response = self.client.get(self.url, {"since": 0})
+        self.assertEqual([p["id"] for p in response.data["plans"]], [plan.id])
+        self.assertEqual(response.data["cursor"], 0)
+
+    def test_write_is_rolled_back_when_recording_fails(self) -> None:
+        # 행만 바뀌고 변경 기록이 없으면 delta 클라이언트가 그 행을 영영 받지 못한다
+        with mock.patch.object(
+            Change.objects, "bulk_create", side_effect=DatabaseError("boom")
+        ):
+            with self.assertRaises(DatabaseError):
+                PlanService.create_plan({"title": "Lost"}, self.user)
+            with self.assertRaises(DatabaseError):
+                CalendarService.create_calendar(self.user.id)
+        self.assertFalse(Plan.objects.exists())
+        self.assertFalse(Calendar.objects.exists())
+
+    async def test_async_write_is_rolled_back_when_recording_fails(self) -> None:
+        with mock.patch.object(
+            Change.objects, "bulk_create", side_effect=DatabaseError("boom")
+        ):
+            with self.assertRaises(DatabaseError):
+                await PlannerService.acreate_planner(self.user, {"title": "Lost"})
+        self.assertFalse(await Planner.objects.aexists())
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get(self.url, {"since": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+
+
+class SyncEventsTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass123",
+            nickname="testnick",
+            email="test@test.com",
+        )
+        self.token = str(cast(Any, RefreshToken.for_user(self.user)).access_token)
+
+    async def test_broker_coalesces_rapid_messages(self) -> None:
+        # 다른 스레드에서 연달아 보낸 알림이 한 번의 알림으로 합쳐진다
+        broker = InProcessBroker()
+        subscription = broker.subscribe(1)
+        for ids in ([3, 1], [1, 2]):
+            thread = threading.Thread(target=broker.publish, args=(1, {"plans": ids}))
+            thread.start()
+            thread.join()
+        broker.publish(2, {"plans": [9]})
+
+        message = await subscription.get(timeout=1, window=0.01)
+        self.assertEqual(message, {"plans": [3, 1, 2]})
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+        broker.unsubscribe(1, subscription)
+        broker.publish(1, {"plans": [4]})
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    def _create_calendar(self) -> Calendar:
+        # 알림은 커밋된 뒤에 보낸다
+        with self.captureOnCommitCallbacks(execute=True):
+            return CalendarService.create_calendar(self.user.id)
+
+    async def test_recorded_changes_are_published(self) -> None:
+        subscription = get_broker().subscribe(self.user.id)
+        try:
+            calendar = await sync_to_async(self._create_calendar)()
+            message = await subscription.get(timeout=1)
+        finally:
+            get_broker().unsubscribe(self.user.id, subscription)
+        self.assertEqual(message, {"calendars": [calendar.id]})
+
+    @override_settings(SYNC={"COALESCE_SECONDS": 0.01})
+    async def test_event_stream(self) -> None:
+        response = await AsyncClient().get(
+            reverse("sync:sync-events"),
+            headers={"authorization": f"Bearer {self.token}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        content = aiter(getattr(response, "streaming_content"))
+        self.assertEqual(await anext(content), b"retry: 3000\n\n")
+        # 연속 순서 변경 알림은 하나의 change 이벤트로
+        get_broker().publish(self.user.id, {"plans": [1]})
+        get_broker().publish(self.user.id, {"plans": [2], "planners": [7]})
+        event = await anext(content)
+        await content.aclose()
+        self.assertEqual(
+            event,
+            b'event: change\ndata: {"plans": [1, 2], "planners": [7]}\n\n',
+        )
+
+    async def test_event_stream_requires_authentication(self) -> None:
+        response = await AsyncClient().get(reverse("sync:sync-events"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
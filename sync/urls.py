@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+app_name = "sync"
+
+urlpatterns = [
+    path("", views.SyncView.as_view(), name="sync"),
+    # ASGI 전용 변경 알림 스트림
+    path("events/", views.SyncEventsView.as_view(), name="sync-events"),
+]
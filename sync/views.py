@@ -0,0 +1,94 @@
+import json
+from typing import Any, AsyncIterator, Dict, cast
+
+from django.http import HttpRequest, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from calendars.serializers import CalendarSerializer
+from common.async_views import AsyncAPIView
+from plan.serializers import PlanSerializer
+from planner.serializers import PlannerSerializer
+from user.models import User
+
+from .broker import get_broker
+from .services import SyncService, get_option
+
+SERIALIZERS: Dict[str, Any] = {
+    "plans": PlanSerializer,
+    "planners": PlannerSerializer,
+    "calendars": CalendarSerializer,
+}
+
+
+class SyncView(APIView):
+    # 오프라인 클라이언트용 변경분 조회
+    # ?since=<cursor> 이후 생성/수정/삭제된 행만 반환 (soft delete 된 행은
+    # is_deleted / is_delete 가 true 인 행으로, 실제로 삭제된 행은 deleted 의 id 로)
+    # since 가 없으면 전체 목록과 첫 cursor 를 반환. more 가 true 면 바로 다시 요청한다
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        user = cast(User, request.user)
+        since = request.query_params.get("since")
+        if since is None:
+            result = SyncService.get_snapshot(user.id)
+        else:
+            try:
+                cursor = int(since)
+                if cursor < 0:
+                    raise ValueError(since)
+            except ValueError:
+                return Response(
+                    {"error": "'since' must be a non-negative integer cursor"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            result = SyncService.get_changes(user.id, cursor)
+
+        payload = {
+            key: serializer(result[key], many=True).data
+            for key, serializer in SERIALIZERS.items()
+        }
+        payload.update(
+            deleted=result["deleted"], cursor=result["cursor"], more=result["more"]
+        )
+        return Response(payload)
+
+
+class SyncEventsView(AsyncAPIView):
+    # 변경 알림 스트림 (Server-Sent Events, ASGI 전용)
+    # 사용자의 plan/planner/calendar 가 바뀌면 종류별 id 를 담은 change 이벤트를 보낸다
+    # 알림에는 행 내용이 없으므로 클라이언트는 받을 때마다 /sync/?since= 로 가져온다
+    # (다시 연결한 직후에도 한 번 가져와야 끊긴 사이의 변경을 놓치지 않는다)
+
+    async def get(self, request: HttpRequest) -> StreamingHttpResponse:
+        user = cast(User, request.user)
+        response = StreamingHttpResponse(
+            _events(user.id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx 가 응답을 모아 두지 않도록
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+async def _events(owner_id: int) -> AsyncIterator[str]:
+    broker = get_broker()
+    subscription = broker.subscribe(owner_id)
+    heartbeat = get_option("HEARTBEAT_SECONDS")
+    window = get_option("COALESCE_SECONDS")
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            message = await subscription.get(heartbeat, window)
+            if message is None:
+                # 프록시가 유휴 연결을 끊지 않도록 주석 한 줄
+                yield ": ping\n\n"
+                continue
+            yield f"event: change\ndata: {json.dumps(message)}\n\n"
+    finally:
+        # 클라이언트가 끊으면 ASGI 핸들러가 generator 를 취소한다
+        broker.unsubscribe(owner_id, subscription)
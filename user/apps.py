@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self) -> None:
+        # 권한 변경 시 토큰을 폐기하는 post_save receiver 등록
+        from . import authentication  # noqa: F401
@@ -0,0 +1,154 @@
+from functools import cached_property
+from typing import Any, Callable, Optional, cast
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from .models import User
+
+# 토큰에 담는 사용자 정보 claim (USER_ID_CLAIM 은 username)
+USER_PK_CLAIM = "id"
+TOKEN_VERSION_CLAIM = "ver"
+STATELESS_CLAIMS = (USER_PK_CLAIM, "is_active", "is_staff", TOKEN_VERSION_CLAIM)
+
+# 캐시에 둔 토큰 버전의 유지 시간 (초). 만료되면 한 컬럼만 다시 조회한다
+TOKEN_VERSION_CACHE_TIMEOUT = 24 * 60 * 60
+
+# 사용자가 삭제되어 버전을 찾을 수 없을 때의 값 (어떤 토큰 버전과도 일치하지 않음)
+MISSING_VERSION = -1
+
+
+class StatelessRefreshToken(RefreshToken):
+    """
+    id, is_active, is_staff, 토큰 버전을 claim 으로 담는 refresh token.
+    여기서 만든 access token 에도 같은 claim 이 복사됩니다.
+    """
+
+    @classmethod
+    def for_user(cls, user: Any) -> "StatelessRefreshToken":
+        token = cast(StatelessRefreshToken, super().for_user(user))
+        token[USER_PK_CLAIM] = user.pk
+        token["is_active"] = user.is_active
+        token["is_staff"] = user.is_staff
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class StatelessUser(TokenUser):
+    """
+    토큰 claim 만으로 만든 가벼운 사용자 객체 (DB 조회 없음).
+    user.id / user.pk 는 User 모델과 같은 숫자 id 입니다.
+    """
+
+    @cached_property
+    def id(self) -> int:  # type: ignore[override]
+        return int(self.token[USER_PK_CLAIM])
+
+    @property
+    def pk(self) -> int:  # type: ignore[override]
+        return self.id
+
+    @property
+    def is_active(self) -> bool:  # type: ignore[override]
+        return bool(self.token.get("is_active", False))
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    서명된 claim 을 믿고 요청마다 User 를 조회하지 않는 JWT 인증.
+    비활성화 등으로 폐기된 토큰은 캐시에 둔 사용자별 토큰 버전으로 걸러냅니다.
+    claim 이 없는 이전 토큰은 기존처럼 DB 에서 사용자를 조회합니다.
+    """
+
+    def get_user(self, validated_token: Token) -> Any:
+        if not is_stateless_token(validated_token):
+            return super().get_user(validated_token)
+        user = StatelessUser(validated_token)
+        check_token_version(user, get_token_version(user.id))
+        return user
+
+    async def aget_user(self, validated_token: Token) -> Any:
+        # async 뷰용 get_user
+        if not is_stateless_token(validated_token):
+            # 이전 토큰은 드물므로 동기 DB 조회를 스레드에서 실행한다
+            get_user = cast(Callable[[Token], Any], super().get_user)
+            return await sync_to_async(get_user)(validated_token)
+        stateless_user = StatelessUser(validated_token)
+        check_token_version(stateless_user, await aget_token_version(stateless_user.id))
+        return stateless_user
+
+
+def is_stateless_token(token: Token) -> bool:
+    return all(claim in token for claim in STATELESS_CLAIMS)
+
+
+def check_token_version(user: StatelessUser, current_version: int) -> None:
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    if user.token.get(TOKEN_VERSION_CLAIM) != current_version:
+        raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+
+
+def get_token_version(user_id: int) -> int:
+    # 캐시에 없을 때만 token_version 한 컬럼을 조회한다
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _load_version(
+            User.objects.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        cache.set(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return int(version)
+
+
+async def aget_token_version(user_id: int) -> int:
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = _load_version(
+            await User.objects.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .afirst()
+        )
+        await cache.aset(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return int(version)
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    # 토큰 버전을 올려 지금까지 발급된 토큰을 모두 폐기한다
+    User.objects.filter(pk=user_id).update(token_version=F("token_version") + 1)
+    cache.delete(_version_key(user_id))
+
+
+@receiver(post_save, sender=User)
+def _revoke_on_claim_change(
+    sender: Any, instance: User, created: bool, **kwargs: Any
+) -> None:
+    # 토큰 claim (is_active / is_staff) 이 바뀌면 이전 권한을 담은 토큰을 폐기한다
+    # (QuerySet.update 는 signal 을 보내지 않으므로 deactivate_user 처럼 직접 폐기한다)
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not set(update_fields) & set(User.CLAIM_FIELDS):
+        return
+    if created or not instance.claims_changed():
+        return
+    revoke_user_tokens(instance.pk)
+    # 이 객체를 다시 저장해도 폐기 전 버전으로 돌아가지 않도록
+    instance.refresh_from_db(fields=["token_version"])
+    instance.mark_claims_saved()
+
+
+def _load_version(version: Optional[int]) -> int:
+    return MISSING_VERSION if version is None else version
+
+
+def _version_key(user_id: int) -> str:
+    return f"user:token_version:{user_id}"
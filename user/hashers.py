@@ -0,0 +1,62 @@
+from typing import Any, Dict
+
+from django.conf import settings
+from django.contrib.auth.hashers import (  # type: ignore[attr-defined]
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# 비밀번호 해시 비용 기본값. 서버에서 benchmark_password_hashers 명령으로 측정해
+# settings.PASSWORD_HASHING 에 지정한다. 값을 바꾸면 다음 로그인 때 자동으로 다시 해시된다
+DEFAULTS: Dict[str, Any] = {
+    "SCRYPT_WORK_FACTOR": 2**14,
+    "SCRYPT_BLOCK_SIZE": 8,
+    "SCRYPT_PARALLELISM": 1,
+    "PBKDF2_ITERATIONS": PBKDF2PasswordHasher.iterations,
+    "ARGON2_TIME_COST": Argon2PasswordHasher.time_cost,
+    "ARGON2_MEMORY_COST": Argon2PasswordHasher.memory_cost,
+    "ARGON2_PARALLELISM": Argon2PasswordHasher.parallelism,
+}
+
+# scrypt 가 쓸 수 있는 최대 메모리 (128 * n * r 바이트가 필요, OpenSSL 기본값은 32MiB)
+SCRYPT_MAXMEM = 256 * 1024 * 1024
+
+
+def get_option(name: str) -> Any:
+    return {**DEFAULTS, **getattr(settings, "PASSWORD_HASHING", {})}[name]
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):  # type: ignore[misc]
+    """
+    PASSWORD_HASHING 의 SCRYPT_* 값으로 비용을 정하는 scrypt 해셔.
+    표준 라이브러리(hashlib.scrypt)만 사용하며, 해시 형식은 Django 기본 scrypt 와 같습니다.
+    """
+
+    maxmem = SCRYPT_MAXMEM
+
+    def __init__(self) -> None:
+        self.work_factor = get_option("SCRYPT_WORK_FACTOR")
+        self.block_size = get_option("SCRYPT_BLOCK_SIZE")
+        self.parallelism = get_option("SCRYPT_PARALLELISM")
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PASSWORD_HASHING 의 PBKDF2_ITERATIONS 로 반복 횟수를 정하는 PBKDF2 해셔.
+    """
+
+    def __init__(self) -> None:
+        self.iterations = get_option("PBKDF2_ITERATIONS")
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    PASSWORD_HASHING 의 ARGON2_* 값으로 비용을 정하는 argon2 해셔.
+    argon2-cffi 가 설치된 경우에만 PASSWORD_HASHERS 맨 앞에 둘 수 있습니다.
+    """
+
+    def __init__(self) -> None:
+        self.time_cost = get_option("ARGON2_TIME_COST")
+        self.memory_cost = get_option("ARGON2_MEMORY_COST")
+        self.parallelism = get_option("ARGON2_PARALLELISM")
@@ -0,0 +1,169 @@
+import importlib
+import importlib.util
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from user.hashers import (
+    SCRYPT_MAXMEM,
+    TunedPBKDF2PasswordHasher,
+    TunedScryptPasswordHasher,
+)
+
+PASSWORD = "benchmark-password"
+
+# (설정 값, 측정값 ms) 목록
+Results = List[Tuple[Dict[str, Any], float]]
+
+
+class Command(BaseCommand):
+    help = (
+        "현재 서버에서 비밀번호 해시 비용을 측정하고, "
+        "목표 지연 시간에 맞는 PASSWORD_HASHING 값을 추천"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100,
+            help="로그인 한 번의 비밀번호 검증에 허용할 시간 (ms)",
+        )
+        parser.add_argument(
+            "--samples", type=int, default=3, help="설정별 반복 측정 횟수"
+        )
+        parser.add_argument(
+            "--algorithms",
+            nargs="+",
+            choices=["scrypt", "pbkdf2", "argon2"],
+            default=["scrypt", "pbkdf2", "argon2"],
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        target = options["target_ms"]
+        samples = options["samples"]
+        recommended: Dict[str, Any] = {}
+
+        for algorithm in options["algorithms"]:
+            if algorithm == "argon2" and not _argon2_available():
+                self.stdout.write("argon2: argon2-cffi 가 설치되어 있지 않아 건너뜀")
+                continue
+            results = getattr(self, f"_benchmark_{algorithm}")(target, samples)
+            self.stdout.write(f"{algorithm}:")
+            for params, elapsed in results:
+                mark = "*" if elapsed <= target else " "
+                self.stdout.write(f"  {mark} {_format(params):<50} {elapsed:>9.1f} ms")
+            best = _best_within(results, target)
+            if best is not None:
+                recommended.update(best)
+
+        if not recommended:
+            self.stdout.write(self.style.WARNING("목표 시간 안에 드는 설정이 없습니다"))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n추천 설정 (목표 {target:g} ms, * 표시 중 최대 비용):"
+            )
+        )
+        self.stdout.write("PASSWORD_HASHING = {")
+        for key, value in recommended.items():
+            self.stdout.write(f'    "{key}": {value},')
+        self.stdout.write("}")
+
+    def _benchmark_scrypt(self, target: float, samples: int) -> Results:
+        # 메모리(128 * n * r)와 시간이 n 에 비례하므로 n 을 두 배씩 늘려가며 측정
+        results: Results = []
+        hasher = TunedScryptPasswordHasher()
+        block_size, parallelism = 8, 1
+        work_factor = 2**12
+        while 128 * work_factor * block_size <= SCRYPT_MAXMEM:
+            elapsed = _measure(
+                lambda: hasher.encode(
+                    PASSWORD, hasher.salt(), work_factor, block_size, parallelism
+                ),
+                samples,
+            )
+            results.append(
+                (
+                    {
+                        "SCRYPT_WORK_FACTOR": work_factor,
+                        "SCRYPT_BLOCK_SIZE": block_size,
+                        "SCRYPT_PARALLELISM": parallelism,
+                    },
+                    elapsed,
+                )
+            )
+            if elapsed > target:
+                break
+            work_factor *= 2
+        return results
+
+    def _benchmark_pbkdf2(self, target: float, samples: int) -> Results:
+        # 시간이 반복 횟수에 비례하므로 한 번 측정해 목표 반복 횟수를 계산한 뒤 확인
+        hasher = TunedPBKDF2PasswordHasher()
+        base = 100_000
+        elapsed = _measure(
+            lambda: hasher.encode(PASSWORD, hasher.salt(), base), samples
+        )
+        iterations = max(10_000, int(base * target / elapsed) // 10_000 * 10_000)
+        checked = _measure(
+            lambda: hasher.encode(PASSWORD, hasher.salt(), iterations), samples
+        )
+        return [
+            ({"PBKDF2_ITERATIONS": base}, elapsed),
+            ({"PBKDF2_ITERATIONS": iterations}, checked),
+        ]
+
+    def _benchmark_argon2(self, target: float, samples: int) -> Results:
+        # 메모리 64MiB 고정, time_cost 를 늘려가며 측정
+        results: Results = []
+        argon2: Any = importlib.import_module("argon2")
+        memory_cost, parallelism = 65536, 2
+        for time_cost in range(1, 11):
+            elapsed = _measure(
+                lambda: argon2.PasswordHasher(
+                    time_cost=time_cost,
+                    memory_cost=memory_cost,
+                    parallelism=parallelism,
+                ).hash(PASSWORD),
+                samples,
+            )
+            results.append(
+                (
+                    {
+                        "ARGON2_TIME_COST": time_cost,
+                        "ARGON2_MEMORY_COST": memory_cost,
+                        "ARGON2_PARALLELISM": parallelism,
+                    },
+                    elapsed,
+                )
+            )
+            if elapsed > target:
+                break
+        return results
+
+
+def _measure(func: Callable[[], Any], samples: int) -> float:
+    # 반복 측정값의 중앙값 (ms)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _best_within(results: Results, target: float) -> Optional[Dict[str, Any]]:
+    # 목표 시간 안에 드는 설정 중 가장 비용이 큰 (가장 느린) 설정
+    within = [(params, elapsed) for params, elapsed in results if elapsed <= target]
+    return max(within, key=lambda item: item[1])[0] if within else None
+
+
+def _format(params: Dict[str, Any]) -> str:
+    return ", ".join(f"{key}={value}" for key, value in params.items())
+
+
+def _argon2_available() -> bool:
+    return importlib.util.find_spec("argon2") is not None
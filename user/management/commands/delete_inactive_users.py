@@ -1,28 +1,162 @@
+import time
 from datetime import timedelta
-from typing import Any
+from typing import Any, Dict, List, Type
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import models, transaction
 from django.utils import timezone
 
+from calendars.models import Calendar, CalendarMonth
+from login.models import Login
+from plan.models import AppliedPlanTemplate, Plan
+from planner.models import Planner
+from sync.models import Change
 from user.models import User
 
 
 class Command(BaseCommand):
-    help = "60일 이상 비활성화된 회원 데이터 삭제"
+    help = (
+        "60일 이상 비활성화된 회원 데이터 삭제. "
+        "id 순서로 batch-size 명씩 나눠 각각 짧은 트랜잭션으로 삭제하고, "
+        "소유 회원이 없어진 Plan/적용한 템플릿/Calendar/월간 요약도 정리"
+    )
 
-    def handle(self, *args: tuple[str, ...], **kwargs: dict[str, Any]) -> None:
-        # 60일 전 날짜 계산
-        deletion_date = timezone.now() - timedelta(days=60)
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days", type=int, default=60, help="비활성화 후 삭제까지의 기간 (일)"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="한 트랜잭션에서 삭제할 회원 수"
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="batch 사이에 쉬는 시간 (초). 운영 DB 의 잠금/복제 지연 완화용",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="삭제하지 않고 대상 수만 출력"
+        )
+        parser.add_argument(
+            "--resume-from",
+            type=int,
+            default=0,
+            help="이 id 보다 큰 회원부터 처리 (중단된 실행의 마지막 id)",
+        )
+        parser.add_argument(
+            "--skip-orphans",
+            action="store_true",
+            help="소유 회원이 없어진 Plan/Calendar 정리를 건너뜀",
+        )
 
-        # is_active=False이고 updated_at이 60일 이전인 유저 조회
-        users = User.objects.filter(is_active=False, updated_at__lte=deletion_date)
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.batch_size = options["batch_size"]
+        self.sleep = options["sleep"]
+        self.dry_run = options["dry_run"]
+        prefix = "[dry-run] " if self.dry_run else ""
 
-        # 삭제된 유저 수 카운트
-        count = users.count()
+        deletion_date = timezone.now() - timedelta(days=options["days"])
+        # is_active=False이고 updated_at이 기준일 이전인 유저
+        users = User.objects.filter(is_active=False, updated_at__lte=deletion_date)
 
-        # 유저 삭제
-        users.delete()
+        totals: Dict[str, int] = {}
+        last_id = options["resume_from"]
+        batch_num = 0
+        while True:
+            user_ids = list(
+                users.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[: self.batch_size]
+            )
+            if not user_ids:
+                break
+            batch_num += 1
+            counts = self._delete_users(user_ids)
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+            last_id = user_ids[-1]
+            self.stdout.write(
+                f"{prefix}batch {batch_num}: users {user_ids[0]}..{last_id} "
+                f"{_format_counts(counts)} (--resume-from {last_id})"
+            )
+            self._pause()
 
         self.stdout.write(
-            self.style.SUCCESS(f"Successfully deleted {count} inactive users")
+            self.style.SUCCESS(
+                f"{prefix}Successfully deleted {totals.get('users', 0)} inactive users "
+                f"{_format_counts(totals)}"
+            )
         )
+
+        if not options["skip_orphans"]:
+            for model in (Plan, AppliedPlanTemplate, Calendar, CalendarMonth):
+                count = self._sweep_orphans(model)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{prefix}Successfully deleted {count} orphaned "
+                        f"{model._meta.verbose_name_plural}"
+                    )
+                )
+
+    def _delete_users(self, user_ids: List[int]) -> Dict[str, int]:
+        # 자식 행을 먼저 id 조건으로 직접 삭제해, User 삭제 시 collector 가
+        # 관련 행을 메모리로 불러오지 않게 한다
+        # (Plan/AppliedPlanTemplate/Calendar/CalendarMonth 는 FK 가 없어 직접 지워야 함.
+        #  이 테이블들의 planner_id 에는 Planner pk 가 아니라 user id 가 들어 있다)
+        planner_ids = list(
+            Planner.objects.filter(user_id__in=user_ids).values_list("pk", flat=True)
+        )
+        querysets = {
+            "plans": Plan.objects.filter(planner_id__in=user_ids),
+            "plan_templates": AppliedPlanTemplate.objects.filter(
+                planner_id__in=user_ids
+            ),
+            "calendars": Calendar.objects.filter(planner_id__in=user_ids),
+            "calendar_months": CalendarMonth.objects.filter(planner_id__in=user_ids),
+            "planners": Planner.objects.filter(pk__in=planner_ids),
+            "changes": Change.objects.filter(owner_id__in=user_ids),
+            "logins": Login.objects.filter(user_num_id__in=user_ids),
+            "users": User.objects.filter(pk__in=user_ids),
+        }
+        if self.dry_run:
+            return {key: queryset.count() for key, queryset in querysets.items()}
+        with transaction.atomic():
+            return {
+                key: queryset.delete()[1].get(queryset.model._meta.label, 0)
+                for key, queryset in querysets.items()
+            }
+
+    def _sweep_orphans(self, model: Type[models.Model]) -> int:
+        # planner_id (user id) 가 가리키는 회원이 없는 행을 id 순서로 batch-size 개씩 확인해 삭제
+        deleted = 0
+        last_id = 0
+        while True:
+            rows = list(
+                model._default_manager.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", "planner_id")[: self.batch_size]
+            )
+            if not rows:
+                return deleted
+            last_id = rows[-1][0]
+            existing = set(
+                User.objects.filter(
+                    pk__in={planner_id for _, planner_id in rows}
+                ).values_list("pk", flat=True)
+            )
+            orphan_ids = [pk for pk, planner_id in rows if planner_id not in existing]
+            if not orphan_ids:
+                continue
+            if self.dry_run:
+                deleted += len(orphan_ids)
+            else:
+                deleted += model._default_manager.filter(pk__in=orphan_ids).delete()[0]
+            self._pause()
+
+    def _pause(self) -> None:
+        if self.sleep and not self.dry_run:
+            time.sleep(self.sleep)
+
+
+def _format_counts(counts: Dict[str, int]) -> str:
+    return "(" + ", ".join(f"{key}={value}" for key, value in counts.items()) + ")"
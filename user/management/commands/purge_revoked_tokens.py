@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from user.revocation import revocation_list
+
+
+class Command(BaseCommand):
+    help = "만료된 refresh token 폐기 기록 삭제 (주기적으로 실행)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="한 번에 삭제할 행 수"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count = revocation_list.db_store.purge_expired(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully purged {count} expired revoked tokens")
+        )
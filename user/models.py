@@ -48,10 +48,45 @@ class User(AbstractBaseUser, PermissionsMixin):
     verification_code = models.CharField(max_length=6, null=True, blank=True)
     code_created_at = models.DateTimeField(null=True, blank=True)
 
+    # JWT claim 에 담기는 토큰 버전. 올리면 이전에 발급된 토큰이 모두 폐기된다
+    token_version = models.PositiveIntegerField(default=0)
+
     objects = CustomUserManager()
 
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["nickname", "email"]
 
+    # JWT claim 에 담기는 권한 필드. 바뀌어 저장되면 발급된 토큰을 폐기한다
+    CLAIM_FIELDS = ("is_active", "is_staff")
+
     def __str__(self) -> str:
         return self.username
+
+    @classmethod
+    def from_db(cls, db: Any, field_names: Any, values: Any) -> "User":
+        user = super().from_db(db, field_names, values)
+        user.mark_claims_saved()
+        return user
+
+    def mark_claims_saved(self) -> None:
+        # 저장된 (토큰에 담겼을 수 있는) claim 필드 값을 기억한다
+        self._saved_claims = {
+            name: self.__dict__[name]
+            for name in self.CLAIM_FIELDS
+            if name in self.__dict__
+        }
+
+    def claims_changed(self) -> bool:
+        saved = getattr(self, "_saved_claims", {})
+        return any(getattr(self, name) != value for name, value in saved.items())
+
+
+class RevokedToken(models.Model):
+    # 로그아웃 등으로 폐기된 refresh token (jti 기준).
+    # 토큰 만료 후에는 의미가 없으므로 purge_revoked_tokens 명령으로 정리한다
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "revoked_tokens"
@@ -0,0 +1,234 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from common.bloom import BloomFilter
+from common.metrics import Counter
+
+from .models import RevokedToken
+
+REVOCATION_CHECKS = Counter(
+    "token_revocation_checks_total",
+    "Refresh token revocation checks by the layer that answered",
+    ["result"],
+)
+
+DEFAULTS: Dict[str, Any] = {
+    # Bloom filter 크기 (폐기된 토큰 수가 이를 넘으면 다음 재구성 때 두 배로)
+    "BLOOM_CAPACITY": 100000,
+    "BLOOM_ERROR_RATE": 0.001,
+    # 다른 프로세스의 폐기를 반영하기 위해 세대 번호를 확인하는 주기 (ms)
+    "REFRESH_INTERVAL_MS": 1000,
+}
+
+GENERATION_KEY = "revoked:generation"
+
+# 세대 번호별로 그 세대에 폐기한 jti 를 남기는 캐시 키
+GENERATION_LOG_KEY = "revoked:log:{}"
+
+# 밀린 세대가 이보다 많으면 jti 를 하나씩 받지 않고 Bloom filter 를 다시 만든다
+MAX_DELTA = 1000
+
+
+class CacheRevocationStore:
+    # jti 별 캐시 항목. 토큰의 남은 수명만큼만 유지된다
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        timeout = (expires_at - timezone.now()).total_seconds()
+        if timeout > 0:
+            cache.set(self._key(jti), True, max(1, int(timeout)))
+
+    def is_revoked(self, jti: str) -> bool:
+        return bool(cache.get(self._key(jti), False))
+
+    @staticmethod
+    def _key(jti: str) -> str:
+        return f"revoked:jti:{jti}"
+
+
+class DatabaseRevocationStore:
+    # 캐시가 비워져도 폐기가 유지되도록 하는 영구 저장소 (revoked_tokens 테이블)
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=jti, expires_at=expires_at)], ignore_conflicts=True
+        )
+
+    def get_expiry(self, jti: str) -> Optional[datetime]:
+        # 아직 만료되지 않은 폐기 기록이면 만료 시각, 아니면 None
+        return (
+            RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now())
+            .values_list("expires_at", flat=True)
+            .first()
+        )
+
+    def active_jtis(self) -> Iterator[str]:
+        return (
+            RevokedToken.objects.filter(expires_at__gt=timezone.now())
+            .values_list("jti", flat=True)
+            .iterator(chunk_size=5000)
+        )
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        # 만료된 기록을 batch_size 개씩 삭제 (긴 잠금을 피한다)
+        # Returns : 삭제된 행 수
+        deleted = 0
+        while True:
+            jtis = list(
+                RevokedToken.objects.filter(expires_at__lte=timezone.now()).values_list(
+                    "jti", flat=True
+                )[:batch_size]
+            )
+            if not jtis:
+                return deleted
+            deleted += RevokedToken.objects.filter(jti__in=jtis).delete()[0]
+
+
+class TokenRevocationList:
+    """
+    refresh token 폐기 목록.
+    폐기는 DB와 캐시에 함께 기록하고, 조회는 Bloom filter → 캐시 → DB 순서로 합니다.
+    대부분의 토큰은 폐기되지 않았으므로 Bloom filter 에서 저장소 조회 없이 끝납니다.
+    폐기할 때마다 캐시의 세대 번호를 올리고 그 세대에 jti 를 남기므로, 다른 프로세스는
+    밀린 세대의 jti 만 기존 Bloom filter 에 더합니다. 세대 기록이 사라졌거나 filter 가
+    용량을 넘으면 잠금 밖에서 DB 로 다시 만듭니다.
+    세대 번호는 REFRESH_INTERVAL_MS 마다 확인하므로, 다른 프로세스에서 폐기한 토큰은
+    그동안 이 프로세스에서 폐기되지 않은 것으로 보일 수 있습니다 (0 이면 매번 확인).
+    """
+
+    def __init__(
+        self,
+        bloom_capacity: int = DEFAULTS["BLOOM_CAPACITY"],
+        bloom_error_rate: float = DEFAULTS["BLOOM_ERROR_RATE"],
+        refresh_interval_ms: int = DEFAULTS["REFRESH_INTERVAL_MS"],
+    ) -> None:
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.refresh_interval = refresh_interval_ms / 1000
+        self.cache_store = CacheRevocationStore()
+        self.db_store = DatabaseRevocationStore()
+        self._bloom: Optional[BloomFilter] = None
+        self._generation: Optional[int] = None
+        self._next_check = 0.0
+        self._building = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "TokenRevocationList":
+        options = {**DEFAULTS, **getattr(settings, "TOKEN_REVOCATION", {})}
+        return cls(
+            bloom_capacity=options["BLOOM_CAPACITY"],
+            bloom_error_rate=options["BLOOM_ERROR_RATE"],
+            refresh_interval_ms=options["REFRESH_INTERVAL_MS"],
+        )
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        if expires_at <= timezone.now():
+            return  # 이미 만료된 토큰은 폐기할 필요가 없다
+        self.db_store.revoke(jti, expires_at)
+        self.cache_store.revoke(jti, expires_at)
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        # 다른 프로세스가 Bloom filter 에 더하도록 세대 번호를 올리고 그 세대에 jti 를 남긴다
+        try:
+            generation = cache.incr(GENERATION_KEY)
+        except ValueError:
+            # 세대 번호가 새로 시작되면 다른 프로세스는 Bloom filter 를 다시 만든다
+            cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+            return
+        timeout = (expires_at - timezone.now()).total_seconds()
+        cache.set(GENERATION_LOG_KEY.format(generation), jti, max(1, int(timeout)))
+        with self._lock:
+            if self._generation == generation - 1:
+                self._generation = generation  # 이미 더했으므로 건너뛴다
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._current_bloom():
+            REVOCATION_CHECKS.inc(result="bloom_negative")
+            return False
+        if self.cache_store.is_revoked(jti):
+            REVOCATION_CHECKS.inc(result="cache_hit")
+            return True
+
+        # 캐시에서 밀려났거나 Bloom filter 오탐인 경우에만 DB 를 조회한다
+        expires_at = self.db_store.get_expiry(jti)
+        if expires_at is None:
+            REVOCATION_CHECKS.inc(result="false_positive")
+            return False
+        REVOCATION_CHECKS.inc(result="db_hit")
+        self.cache_store.revoke(jti, expires_at)
+        return True
+
+    def _current_bloom(self) -> BloomFilter:
+        # 캐시/DB 조회는 잠금 밖에서 한다 (잠금은 filter 교체와 추가에만)
+        with self._lock:
+            now = time.monotonic()
+            if self._bloom is not None and now < self._next_check:
+                return self._bloom
+            self._next_check = now + self.refresh_interval
+            bloom, known = self._bloom, self._generation
+        generation = self._get_generation()
+        if bloom is not None and generation == known:
+            return bloom
+
+        jtis = self._revoked_since(known, generation) if bloom is not None else None
+        with self._lock:
+            if (
+                bloom is not None
+                and self._bloom is bloom
+                and jtis is not None
+                and bloom.count + len(jtis) <= bloom.capacity
+            ):
+                for jti in jtis:
+                    bloom.add(jti)
+                self._generation = max(generation, self._generation or 0)
+                return bloom
+            if self._building and self._bloom is not None:
+                # 다른 스레드가 다시 만드는 중이면 그동안은 기존 filter 를 쓴다
+                return self._bloom
+            self._building = True
+        try:
+            fresh = self._build_bloom()
+        finally:
+            with self._lock:
+                self._building = False
+        with self._lock:
+            self._bloom, self._generation = fresh, generation
+            return fresh
+
+    @staticmethod
+    def _revoked_since(known: Optional[int], generation: int) -> Optional[List[str]]:
+        # known 이후 세대에 폐기된 jti. 기록이 하나라도 없으면 None (다시 만들어야 한다)
+        if known is None or not 0 < generation - known <= MAX_DELTA:
+            return None
+        keys = [GENERATION_LOG_KEY.format(g) for g in range(known + 1, generation + 1)]
+        found = cache.get_many(keys)
+        if len(found) != len(keys):
+            return None
+        return [str(jti) for jti in found.values()]
+
+    def _build_bloom(self) -> BloomFilter:
+        jtis = list(self.db_store.active_jtis())
+        return BloomFilter.from_items(
+            jtis,
+            capacity=max(self.bloom_capacity, len(jtis) * 2),
+            error_rate=self.bloom_error_rate,
+        )
+
+    @staticmethod
+    def _get_generation() -> int:
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+            generation = cache.get(GENERATION_KEY, 0)
+        return int(generation)
+
+
+# 프로세스 전역 폐기 목록 (설정은 TOKEN_REVOCATION)
+revocation_list = TokenRevocationList.from_settings()
@@ -5,6 +5,7 @@ from django.contrib.auth.hashers import make_password
 from rest_framework import serializers  # DRF에서 제공하는 직렬화(Serializer) 도구
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from .authentication import StatelessRefreshToken
 from .models import User  # 사용자 정의 모델 임포트
 
 
@@ -25,6 +26,9 @@ class VerificationSerializer(serializers.Serializer[Any]):
 
 # JWT 인증 시 사용자 정보를 검증하고 토큰을 반환하는 Custom Serializer
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # UserService.handle_login 과 같이 사용자 정보 claim 을 담은 토큰을 발급
+    token_class = StatelessRefreshToken
+
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
         # attrs는 요청에서 전달된 데이터를 포함하는 딕셔너리
         # 요청 데이터에서 username 추출
@@ -2,12 +2,35 @@
 from typing import Any, Dict, Optional, cast
 
 from django.contrib.auth.hashers import make_password
-from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
 
-from login.models import Login
+from common.metrics import Histogram
+from login.audit import audit_writer
 
+from .authentication import (
+    TOKEN_VERSION_CLAIM,
+    USER_PK_CLAIM,
+    StatelessRefreshToken,
+    get_token_version,
+    is_stateless_token,
+    revoke_user_tokens,
+)
 from .models import User
+from .revocation import revocation_list
+from .throttling import login_throttle
+
+LOGIN_PHASE_SECONDS = Histogram(
+    "login_phase_seconds",
+    "LoginView latency by phase (lookup, hash, token, audit)",
+    ["phase"],
+)
+
+# 로그인에 필요한 컬럼 (비밀번호 검증, 활성 확인, 토큰 claim).
+# 인증 코드 등 나머지 컬럼은 읽지 않는다
+LOGIN_FIELDS = ("id", "username", "password", "is_active", "is_staff", "token_version")
 
 
 class UserService:
@@ -20,28 +43,60 @@ class UserService:
         user: User,
         request_meta: Dict[str, Any],
         is_success: bool = True,
-    ) -> Optional[Login]:
-        try:
-            return Login.objects.create(
-                user_num_id=user.id,
-                user_ip=request_meta.get("REMOTE_ADDR", ""),
-                user_agent=request_meta.get("HTTP_USER_AGENT", ""),
-                is_success=is_success,
-            )
-        except Exception as e:
-            print(f"Error creating login record: {str(e)}")
-            return None
+        refresh_jti: Optional[str] = None,
+    ) -> bool:
+        # 로그인 기록은 대기열에만 넣고, DB 기록은 audit_writer 스레드가 모아서 한다
+        # Returns : 대기열이 가득 차 기록이 버려졌으면 False
+        return audit_writer.record_login(
+            user.id, request_meta, is_success, refresh_jti=refresh_jti
+        )
+
+    @staticmethod
+    def get_login_user(username: str) -> User:
+        # 없으면 User.DoesNotExist
+        with LOGIN_PHASE_SECONDS.time(phase="lookup"):
+            return cast(User, User.objects.only(*LOGIN_FIELDS).get(username=username))
+
+    @staticmethod
+    def check_login_password(user: User, password: str) -> bool:
+        # 해시 비용이 바뀌었으면 check_password 가 password 컬럼만 다시 저장한다
+        with LOGIN_PHASE_SECONDS.time(phase="hash"):
+            return user.check_password(password)
+
+    @staticmethod
+    def get_login_retry_after(
+        username: str, request_meta: Dict[str, Any]
+    ) -> Optional[int]:
+        # 실패 횟수 제한에 걸렸으면 Retry-After 초 (비밀번호 해시 전에 확인)
+        return login_throttle.check(request_meta.get("REMOTE_ADDR", ""), username)
+
+    @staticmethod
+    def handle_failed_login(
+        username: str, request_meta: Dict[str, Any], user: Optional[User] = None
+    ) -> None:
+        login_throttle.record_failure(request_meta.get("REMOTE_ADDR", ""), username)
+        if user is not None:
+            # 존재하는 계정의 실패만 로그인 기록에 남긴다 (기록은 대기열에서 모아 쓴다)
+            UserService.create_login_record(user, request_meta, is_success=False)
 
     @staticmethod
     def handle_login(user: User, request_meta: Dict[str, Any]) -> Dict[str, str]:
         try:
-            refresh = RefreshToken.for_user(user)
-            tokens = {
-                "refresh": str(refresh),
-                "access": str(cast(RefreshToken, refresh).access_token),
-            }
+            # id, is_active, is_staff, 토큰 버전을 claim 으로 담아 요청마다 사용자 조회를 생략
+            with LOGIN_PHASE_SECONDS.time(phase="token"):
+                refresh = StatelessRefreshToken.for_user(user)
+                tokens = {
+                    "refresh": str(refresh),
+                    "access": str(cast(RefreshToken, refresh).access_token),
+                }
 
-            UserService.create_login_record(user, request_meta)
+            # 로그아웃 시 refresh token 의 jti 로 이 로그인 기록을 찾는다.
+            # last_login 도 기록 스레드가 로그인 기록과 함께 갱신한다
+            with LOGIN_PHASE_SECONDS.time(phase="audit"):
+                UserService.create_login_record(
+                    user, request_meta, refresh_jti=refresh[jwt_settings.JTI_CLAIM]
+                )
+                login_throttle.reset_username(user.username)
             return tokens
         except Exception as e:
             print(f"Error handling login: {str(e)}")
@@ -50,29 +105,55 @@ class UserService:
     @staticmethod
     def handle_logout(user: User, refresh_token: str) -> bool:
         try:
-            try:
-                login = (
-                    Login.objects.filter(user_num_id=user.id)
-                    .order_by("-login_at")
-                    .first()
-                )
-                if login:
-                    login.logout_at = timezone.now()
-                    login.save()
-            except Exception as e:
-                print(f"Error updating login record: {e}")
+            token = UserService.get_refresh_token(user, refresh_token)
+            jti = None
+            if token is not None:
+                # refresh token 을 폐기해 더 이상 access token 을 발급받지 못하게 한다
+                jti = str(token[jwt_settings.JTI_CLAIM])
+                revocation_list.revoke(jti, datetime_from_epoch(token["exp"]))
+
+            # 로그아웃 시각도 로그인 기록과 같은 대기열을 거쳐 기록한다
+            audit_writer.record_logout(user.id, jti)
 
             return True
         except Exception as e:
             print(f"Logout error: {e}")
             return False
 
+    @staticmethod
+    def get_refresh_token(user: User, refresh_token: str) -> Optional[RefreshToken]:
+        # 사용자 본인의 유효한 refresh token 이면 토큰 객체, 아니면 None
+        try:
+            token = RefreshToken(cast(Any, refresh_token))
+        except TokenError:
+            return None
+        if token.get(jwt_settings.USER_ID_CLAIM) != getattr(
+            user, jwt_settings.USER_ID_FIELD
+        ):
+            return None
+        if jwt_settings.JTI_CLAIM not in token:
+            return None
+        return token
+
     @staticmethod
     def is_token_blacklisted(refresh_token: str) -> bool:
-        # Redis 제거로 인해 항상 False 반환
-        return False
+        # 로그아웃으로 폐기되었거나 토큰 버전이 바뀐 (비활성화 등) 토큰이면 True
+        try:
+            token = RefreshToken(cast(Any, refresh_token))
+        except TokenError:
+            return False  # 잘못된 토큰은 호출한 쪽에서 처리
+        if jwt_settings.JTI_CLAIM in token and revocation_list.is_revoked(
+            str(token[jwt_settings.JTI_CLAIM])
+        ):
+            return True
+        if not is_stateless_token(token):
+            return False
+        return bool(
+            token[TOKEN_VERSION_CLAIM] != get_token_version(token[USER_PK_CLAIM])
+        )
 
     @staticmethod
     def deactivate_user(user: User) -> None:
-        user.is_active = False
-        user.save()
+        # 요청의 user 는 토큰으로 만든 가벼운 객체일 수 있으므로 save() 대신 UPDATE
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        revoke_user_tokens(user.pk)
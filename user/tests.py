@@ -1,15 +1,39 @@
-from typing import Any, Dict
+from datetime import timedelta
+from io import StringIO
+from typing import Any, Dict, cast
 
-from django.test import TestCase
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from .models import User
+from calendars.models import Calendar, CalendarMonth
+from calendars.services import CalendarService
+from common.bloom import BloomFilter
+from login.models import Login
+from plan.models import AppliedPlanTemplate, Plan, PlanTemplate
+from plan.services import PlanService
+from planner.models import Planner
 
+from .hashers import TunedScryptPasswordHasher
+from .models import RevokedToken, User
+from .revocation import GENERATION_KEY, GENERATION_LOG_KEY, TokenRevocationList
+from .services import LOGIN_PHASE_SECONDS
+from .throttling import SlidingWindowCounter, login_throttle
 
+
+@override_settings(LOGIN_AUDIT={"EAGER": True})
 class UserTests(APITestCase):
     def setUp(self) -> None:
+        # 테스트 간 토큰 버전 캐시가 섞이지 않도록 비운다
+        cache.clear()
+
         self.test_data = {
             "username": "testuser",
             "password": "testpass123",
@@ -99,6 +123,402 @@ class UserTests(APITestCase):
         )
         self.assertEqual(login_response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def _login(self) -> Dict[str, str]:
+        self.test_signup()
+        response = self.client.post(
+            reverse("user:login"),
+            {"username": "testuser", "password": "testpass123"},
+            format="json",
+        )
+        return cast(Dict[str, str], response.data)
+
+    def test_stateless_authentication_skips_user_query(self) -> None:
+        tokens = self._login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        url = reverse("plan:plan-list")
+        self.client.get(url)
+
+        # 토큰 claim 으로 사용자를 만들고 토큰 버전은 캐시에서 읽으므로,
+        # 목록 캐시까지 적중하면 쿼리가 하나도 없어야 한다
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deactivate_revokes_issued_tokens(self) -> None:
+        tokens = self._login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(
+            self.client.get(reverse("plan:plan-list")).status_code,
+            status.HTTP_200_OK,
+        )
+        self.client.patch(reverse("user:deactivate"))
+
+        # 비활성화로 토큰 버전이 올라가 이미 발급된 토큰은 거부된다
+        response = self.client.get(reverse("plan:plan-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(reverse("plan:plan-list-async"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(
+            reverse("user:token-refresh"), {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claim_change_revokes_issued_tokens(self) -> None:
+        tokens = self._login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        user = User.objects.get(username="testuser")
+        user.nickname = "renamed"
+        user.save()
+        response = self.client.get(reverse("plan:plan-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # 토큰에 담긴 is_staff 가 바뀌면 (관리자 화면 등) 이미 발급된 토큰은 거부된다
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse("plan:plan-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # 같은 객체를 다시 저장해도 폐기가 풀리지 않는다
+        user.save()
+        self.assertEqual(User.objects.get(pk=user.pk).token_version, 1)
+
+    def test_logout_revokes_refresh_token(self) -> None:
+        tokens = self._login()
+        other = self.client.post(
+            reverse("user:login"),
+            {"username": "testuser", "password": "testpass123"},
+            format="json",
+        ).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.client.post(reverse("user:logout"), {"refresh": tokens["refresh"]})
+
+        url = reverse("user:token-refresh")
+        response = self.client.post(url, {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # 다른 세션의 refresh token 은 그대로 사용할 수 있다
+        response = self.client.post(url, {"refresh": other["refresh"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def testDown(self) -> None:
         # 테스트 종료 후 실행되는 메서드
         User.objects.all().delete()
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.revocations = TokenRevocationList(bloom_capacity=100)
+        self.expires_at = timezone.now() + timedelta(days=1)
+
+    def test_bloom_filter_has_no_false_negatives(self) -> None:
+        bloom = BloomFilter.from_items([f"jti-{i}" for i in range(100)], capacity=100)
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(100)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 100)
+
+    def test_not_revoked_check_skips_storage(self) -> None:
+        self.revocations.revoke("revoked", self.expires_at)
+        self.assertTrue(self.revocations.is_revoked("revoked"))
+
+        # 폐기되지 않은 토큰은 Bloom filter 에서 바로 판단한다
+        with self.assertNumQueries(0):
+            self.assertFalse(self.revocations.is_revoked("not-revoked"))
+
+    def test_revocation_survives_cache_loss(self) -> None:
+        self.revocations.revoke("revoked", self.expires_at)
+        cache.clear()
+
+        # 다른 프로세스처럼 새 목록을 만들어도 DB 에서 Bloom filter 를 다시 만든다
+        revocations = TokenRevocationList(bloom_capacity=100)
+        self.assertTrue(revocations.is_revoked("revoked"))
+        self.assertFalse(revocations.is_revoked("not-revoked"))
+
+    def test_other_process_revocations_are_added_as_delta(self) -> None:
+        # 다른 프로세스의 폐기는 DB 전체를 다시 읽지 않고 기존 filter 에 더한다
+        other = TokenRevocationList(bloom_capacity=100, refresh_interval_ms=0)
+        self.assertFalse(other.is_revoked("revoked"))
+        self.revocations.revoke("revoked", self.expires_at)
+        with self.assertNumQueries(0):
+            self.assertTrue(other.is_revoked("revoked"))
+            self.assertFalse(other.is_revoked("not-revoked"))
+
+        # 세대 기록이 사라졌으면 DB 로 다시 만든다
+        self.revocations.revoke("lost", self.expires_at)
+        cache.delete(GENERATION_LOG_KEY.format(cache.get(GENERATION_KEY)))
+        cache.delete("revoked:jti:lost")
+        self.assertTrue(other.is_revoked("lost"))
+
+    def test_purge_expired_revocations(self) -> None:
+        self.revocations.revoke("active", self.expires_at)
+        RevokedToken.objects.create(
+            jti="expired", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        call_command("purge_revoked_tokens", stdout=StringIO())
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["active"]
+        )
+
+
+@override_settings(LOGIN_AUDIT={"EAGER": True})
+class PasswordHashingTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_login_upgrades_legacy_hash(self) -> None:
+        # 이전 PBKDF2 해시는 로그인 성공 시 현재 scrypt 설정으로 다시 해시된다
+        user = User.objects.create(
+            username="legacy",
+            nickname="legacy",
+            email="legacy@test.com",
+            password=make_password("testpass123", hasher="pbkdf2_sha256"),
+        )
+        response = self.client.post(
+            reverse("user:login"),
+            {"username": "legacy", "password": "testpass123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertTrue(user.check_password("testpass123"))
+
+    def test_cost_change_requires_rehash(self) -> None:
+        encoded = TunedScryptPasswordHasher().encode(
+            "testpass123", TunedScryptPasswordHasher().salt()
+        )
+        self.assertFalse(TunedScryptPasswordHasher().must_update(encoded))
+        with override_settings(PASSWORD_HASHING={"SCRYPT_WORK_FACTOR": 2**15}):
+            self.assertTrue(TunedScryptPasswordHasher().must_update(encoded))
+
+    def test_benchmark_recommends_settings(self) -> None:
+        stdout = StringIO()
+        call_command(
+            "benchmark_password_hashers",
+            "--algorithms",
+            "pbkdf2",
+            "--samples",
+            "1",
+            "--target-ms",
+            "1000",
+            stdout=stdout,
+        )
+        self.assertIn('"PBKDF2_ITERATIONS"', stdout.getvalue())
+
+
+@override_settings(LOGIN_AUDIT={"EAGER": True})
+class LoginThrottleTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        login_throttle.clear_local()
+        self.user = User.objects.create_user(
+            username="target",
+            password="testpass123",
+            nickname="target",
+            email="target@test.com",
+        )
+        self.url = reverse("user:login")
+
+    def tearDown(self) -> None:
+        login_throttle.clear_local()
+
+    def _login(self, password: str) -> Any:
+        return self.client.post(
+            self.url, {"username": "target", "password": password}, format="json"
+        )
+
+    def test_repeated_failures_lock_username(self) -> None:
+        for _ in range(5):
+            self.assertEqual(
+                self._login("wrong").status_code, status.HTTP_401_UNAUTHORIZED
+            )
+        # 실패는 is_success=False 로 기록된다
+        self.assertEqual(
+            Login.objects.filter(user_num=self.user, is_success=False).count(), 5
+        )
+
+        # 잠긴 동안에는 올바른 비밀번호도 DB 조회와 해시 없이 거절된다
+        with self.assertNumQueries(0):
+            response = self._login("testpass123")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_local_precheck_skips_cache(self) -> None:
+        for _ in range(5):
+            self._login("wrong")
+        self.assertEqual(
+            self._login("wrong").status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        # 한 번 차단으로 판단하면 캐시 카운터가 사라져도 프로세스 안에서 거절한다
+        cache.clear()
+        self.assertEqual(
+            self._login("wrong").status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_success_resets_username_failures(self) -> None:
+        for _ in range(4):
+            self._login("wrong")
+        self.assertEqual(self._login("testpass123").status_code, status.HTTP_200_OK)
+        for _ in range(4):
+            self.assertEqual(
+                self._login("wrong").status_code, status.HTTP_401_UNAUTHORIZED
+            )
+
+    def test_sliding_window_estimate(self) -> None:
+        counter = SlidingWindowCounter("test", limit=10, window_seconds=100)
+        # 이전 구간 10회, 현재 구간 25% 경과: 10 * 0.75 = 7.5 < 10
+        self.assertIsNone(counter.retry_after(10, 0, now=1025))
+        # 이전 구간 10회 + 현재 5회: 12.5 >= 10, 이전 비중이 0.5 이하가 되는 75초에 풀림
+        self.assertEqual(counter.retry_after(10, 5, now=1025), 25)
+        # 현재 구간만으로 한도: 다음 구간에서 비중이 0.5 가 될 때까지
+        self.assertEqual(counter.retry_after(0, 20, now=1000), 150)
+
+
+@override_settings(LOGIN_AUDIT={"EAGER": True})
+class LoginPathTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        login_throttle.clear_local()
+        self.user = User.objects.create_user(
+            username="fast",
+            password="testpass123",
+            nickname="fast",
+            email="fast@test.com",
+            verification_code="123456",
+        )
+
+    def _login(self) -> Any:
+        return self.client.post(
+            reverse("user:login"),
+            {"username": "fast", "password": "testpass123"},
+            format="json",
+        )
+
+    def test_lookup_reads_only_login_columns(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self._login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and User._meta.db_table in query["sql"]
+        ]
+        self.assertEqual(len(user_selects), 1)
+        self.assertNotIn("verification_code", user_selects[0])
+        self.assertNotIn("email", user_selects[0])
+
+    def test_audit_write_updates_last_login(self) -> None:
+        self.assertIsNone(self.user.last_login)
+        self._login()
+        self.user.refresh_from_db()
+        login = Login.objects.get(user_num=self.user)
+        self.assertEqual(self.user.last_login, login.login_at)
+
+    def test_phase_timings_are_recorded(self) -> None:
+        before = {
+            phase: LOGIN_PHASE_SECONDS.count(phase=phase)
+            for phase in ("lookup", "hash", "token", "audit")
+        }
+        self._login()
+        for phase, count in before.items():
+            self.assertEqual(LOGIN_PHASE_SECONDS.count(phase=phase), count + 1)
+
+        metrics = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('login_phase_seconds_bucket{phase="hash",le="+Inf"}', metrics)
+
+    def test_metrics_are_limited_to_allowed_ips(self) -> None:
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(METRICS={"ALLOWED_IPS": ["203.0.113.0/24"]}):
+            response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class DeleteInactiveUsersTests(TestCase):
+    def setUp(self) -> None:
+        self.inactive = [
+            self._create_user(f"old{i}", is_active=False) for i in range(3)
+        ]
+        self.active = self._create_user("active", is_active=True)
+        User.objects.filter(pk__in=[u.pk for u in self.inactive]).update(
+            updated_at=timezone.now() - timedelta(days=61)
+        )
+        self.planner = Planner.objects.create(
+            user=self.inactive[0], ordering_num=1, title="old"
+        )
+        # Plan/Calendar 의 planner_id 는 서비스가 채우는 user id
+        PlanService.create_plan({"title": "plan"}, self.inactive[0])
+        CalendarService.create_calendar(self.inactive[0].id)
+        Login.objects.create(user_num=self.inactive[0], user_ip="")
+        self.kept_planner = Planner.objects.create(
+            user=self.active, ordering_num=1, title="kept"
+        )
+        self.kept_plan = PlanService.create_plan({"title": "kept"}, self.active)
+        self.kept_calendar = CalendarService.create_calendar(self.active.id)
+
+    @staticmethod
+    def _create_user(username: str, is_active: bool) -> User:
+        return User.objects.create_user(
+            username=username,
+            password="testpass123",
+            nickname=username,
+            email=f"{username}@test.com",
+            is_active=is_active,
+        )
+
+    def _run(self, *args: str) -> str:
+        stdout = StringIO()
+        call_command("delete_inactive_users", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_deletes_in_batches_with_related_rows(self) -> None:
+        output = self._run("--batch-size", "2")
+        self.assertIn("batch 2:", output)
+        self.assertEqual(
+            list(User.objects.values_list("pk", flat=True)), [self.active.pk]
+        )
+        self.assertFalse(Planner.objects.filter(pk=self.planner.pk).exists())
+        self.assertFalse(Login.objects.exists())
+        self.assertEqual(list(Plan.objects.all()), [self.kept_plan])
+        self.assertEqual(list(Calendar.objects.all()), [self.kept_calendar])
+
+    def test_dry_run_keeps_rows(self) -> None:
+        output = self._run("--dry-run")
+        self.assertIn("[dry-run] Successfully deleted 3 inactive users", output)
+        self.assertIn("plans=1", output)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Plan.objects.count(), 2)
+
+    def test_resume_from_last_id(self) -> None:
+        self._run("--resume-from", str(self.inactive[0].pk), "--skip-orphans")
+        self.assertTrue(User.objects.filter(pk=self.inactive[0].pk).exists())
+        self.assertFalse(User.objects.filter(pk=self.inactive[1].pk).exists())
+
+    def test_sweeps_orphaned_plans_and_calendars(self) -> None:
+        # 회원이 없는 user id 의 행만 지우고, 활성 회원의 행은 남긴다
+        missing_user_id = self.active.id + 1000
+        Plan.objects.create(planner_id=missing_user_id, ordering_num=1, title="x")
+        Calendar.objects.create(planner_id=missing_user_id)
+        output = self._run("--batch-size", "1", "--resume-from", str(self.active.pk))
+        self.assertIn("Successfully deleted 1 orphaned plans", output)
+        self.assertIn("Successfully deleted 1 orphaned calendars", output)
+        self.assertFalse(Plan.objects.filter(planner_id=missing_user_id).exists())
+        self.assertTrue(Plan.objects.filter(pk=self.kept_plan.pk).exists())
+        self.assertTrue(Calendar.objects.filter(pk=self.kept_calendar.pk).exists())
+
+    def test_applied_templates_are_keyed_by_user(self) -> None:
+        template = PlanTemplate.objects.create(name="wedding")
+        for user in (self.inactive[0], self.active):
+            AppliedPlanTemplate.objects.create(planner_id=user.id, template=template)
+        self._run()
+        self.assertEqual(
+            list(AppliedPlanTemplate.objects.values_list("planner_id", flat=True)),
+            [self.active.id],
+        )
+
+    def test_calendar_months_are_keyed_by_user(self) -> None:
+        for user in (self.inactive[0], self.active):
+            CalendarService.get_month(user.id, 2024, 6)
+        self._run()
+        self.assertEqual(
+            list(CalendarMonth.objects.values_list("planner_id", flat=True)),
+            [self.active.id],
+        )
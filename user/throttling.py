@@ -0,0 +1,190 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.metrics import Counter
+
+LOGIN_THROTTLE_EVENTS = Counter(
+    "login_throttle_events_total",
+    "Login attempts rejected by the limiter or counted as failures",
+    ["result"],
+)
+
+DEFAULTS: Dict[str, Any] = {
+    # IP 별 실패 허용 횟수와 기간 (여러 계정을 돌아가며 시도하는 credential stuffing)
+    "IP_LIMIT": 20,
+    "IP_WINDOW_SECONDS": 60,
+    # 계정별 실패 허용 횟수와 기간 (한 계정에 대한 brute force)
+    "USERNAME_LIMIT": 5,
+    "USERNAME_WINDOW_SECONDS": 300,
+    # 차단 중인 식별자를 프로세스 안에 기억해 두는 최대 개수
+    "LOCAL_CACHE_SIZE": 10000,
+}
+
+
+class SlidingWindowCounter:
+    """
+    캐시에 둔 고정 구간 카운터 두 개로 근사하는 sliding window 실패 횟수.
+    추정값 = 이전 구간 횟수 × (이전 구간이 창에 남은 비율) + 현재 구간 횟수
+    """
+
+    def __init__(self, scope: str, limit: int, window_seconds: int) -> None:
+        self.scope = scope
+        self.limit = limit
+        self.window = window_seconds
+
+    def keys(self, ident: str, now: float) -> Tuple[str, str]:
+        # (이전 구간 키, 현재 구간 키)
+        index = int(now // self.window)
+        return self._key(ident, index - 1), self._key(ident, index)
+
+    def hit(self, ident: str, now: float) -> None:
+        key = self.keys(ident, now)[1]
+        # 다음 구간에서 이전 구간으로 읽히므로 창 두 개만큼 유지한다
+        cache.add(key, 0, self.window * 2)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, self.window * 2)
+
+    def retry_after(self, previous: int, current: int, now: float) -> Optional[int]:
+        # 추가 실패가 없을 때 추정값이 limit 아래로 내려가기까지 남은 초, 차단이 아니면 None
+        elapsed = (now % self.window) / self.window
+        if previous * (1 - elapsed) + current < self.limit:
+            return None
+        if current < self.limit:
+            # 이 구간 안에서 이전 구간 비중이 줄어들면 풀린다
+            release = 1 - (self.limit - current) / previous
+        else:
+            # 다음 구간으로 넘어간 뒤 현재 구간 횟수의 비중이 줄어들어야 풀린다
+            release = 2 - self.limit / current
+        return max(1, math.ceil((release - elapsed) * self.window))
+
+    def _key(self, ident: str, index: int) -> str:
+        return f"login:fail:{self.scope}:{ident}:{index}"
+
+
+class LoginThrottle:
+    """
+    /user/login/ 의 IP 별, 계정별 실패 횟수 제한.
+    비밀번호 해시 전에 check() 로 확인하므로, 차단된 요청은 해시 계산 없이
+    캐시 조회 한 번 (get_many) 으로 거절됩니다. 한 번 차단으로 판단한 식별자는
+    풀릴 시각까지 프로세스 안에 기억해 두어 캐시도 조회하지 않습니다.
+    실패 횟수만 세므로 로그인에 성공하는 사용자는 제한을 받지 않습니다.
+    """
+
+    def __init__(
+        self,
+        ip_limit: int = DEFAULTS["IP_LIMIT"],
+        ip_window_seconds: int = DEFAULTS["IP_WINDOW_SECONDS"],
+        username_limit: int = DEFAULTS["USERNAME_LIMIT"],
+        username_window_seconds: int = DEFAULTS["USERNAME_WINDOW_SECONDS"],
+        local_cache_size: int = DEFAULTS["LOCAL_CACHE_SIZE"],
+    ) -> None:
+        self.counters = {
+            "ip": SlidingWindowCounter("ip", ip_limit, ip_window_seconds),
+            "username": SlidingWindowCounter(
+                "username", username_limit, username_window_seconds
+            ),
+        }
+        self.local_cache_size = local_cache_size
+        # (scope, 식별자) -> 차단이 풀리는 시각 (time.time())
+        self._blocked_until: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "LoginThrottle":
+        options = {**DEFAULTS, **getattr(settings, "LOGIN_THROTTLE", {})}
+        return cls(
+            ip_limit=options["IP_LIMIT"],
+            ip_window_seconds=options["IP_WINDOW_SECONDS"],
+            username_limit=options["USERNAME_LIMIT"],
+            username_window_seconds=options["USERNAME_WINDOW_SECONDS"],
+            local_cache_size=options["LOCAL_CACHE_SIZE"],
+        )
+
+    def check(self, ip: str, username: str) -> Optional[int]:
+        # Returns : 차단 중이면 Retry-After 초, 아니면 None
+        now = time.time()
+        idents = self._idents(ip, username)
+
+        # 프로세스 안에서 이미 차단으로 판단한 식별자는 캐시도 보지 않는다
+        local = self._local_retry_after(idents, now)
+        if local is not None:
+            LOGIN_THROTTLE_EVENTS.inc(result="rejected_local")
+            return local
+
+        keys: List[str] = []
+        for scope, ident in idents:
+            keys.extend(self.counters[scope].keys(ident, now))
+        counts = cache.get_many(keys)
+
+        retry_after: Optional[int] = None
+        for scope, ident in idents:
+            previous_key, current_key = self.counters[scope].keys(ident, now)
+            wait = self.counters[scope].retry_after(
+                int(counts.get(previous_key, 0)), int(counts.get(current_key, 0)), now
+            )
+            if wait is not None:
+                self._block_locally((scope, ident), now + wait)
+                retry_after = max(retry_after or 0, wait)
+        if retry_after is not None:
+            LOGIN_THROTTLE_EVENTS.inc(result="rejected")
+        return retry_after
+
+    def record_failure(self, ip: str, username: str) -> None:
+        now = time.time()
+        for scope, ident in self._idents(ip, username):
+            self.counters[scope].hit(ident, now)
+        LOGIN_THROTTLE_EVENTS.inc(result="failure")
+
+    def reset_username(self, username: str) -> None:
+        # 로그인에 성공하면 그 계정의 실패 횟수를 지운다 (IP 횟수는 유지)
+        scope, ident = self._idents("", username)[1]
+        counter = self.counters[scope]
+        now = time.time()
+        cache.delete_many(list(counter.keys(ident, now)))
+        with self._lock:
+            self._blocked_until.pop((scope, ident), None)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._blocked_until.clear()
+
+    def _local_retry_after(
+        self, idents: List[Tuple[str, str]], now: float
+    ) -> Optional[int]:
+        with self._lock:
+            until = max(
+                (self._blocked_until.get(ident, 0.0) for ident in idents), default=0.0
+            )
+        return max(1, math.ceil(until - now)) if until > now else None
+
+    def _block_locally(self, ident: Tuple[str, str], until: float) -> None:
+        with self._lock:
+            if len(self._blocked_until) >= self.local_cache_size:
+                # 풀린 항목부터 지우고, 그래도 가득 차면 전부 비운다 (다시 캐시에서 판단)
+                now = time.time()
+                self._blocked_until = {
+                    key: value
+                    for key, value in self._blocked_until.items()
+                    if value > now
+                }
+                if len(self._blocked_until) >= self.local_cache_size:
+                    self._blocked_until.clear()
+            self._blocked_until[ident] = until
+
+    @staticmethod
+    def _idents(ip: str, username: str) -> List[Tuple[str, str]]:
+        # 사용자 입력인 username 은 캐시 키에 쓸 수 있도록 해시한다
+        digest = hashlib.blake2b(str(username).encode(), digest_size=16).hexdigest()
+        return [("ip", ip), ("username", digest)]
+
+
+# 프로세스 전역 로그인 제한 (설정은 LOGIN_THROTTLE)
+login_throttle = LoginThrottle.from_settings()
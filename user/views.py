@@ -58,11 +58,20 @@ class LoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # 실패가 반복된 IP/계정은 사용자 조회와 비밀번호 해시 전에 거절
+        retry_after = UserService.get_login_retry_after(username, request.META)
+        if retry_after is not None:
+            return Response(
+                {"error": "Too many login attempts"},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(retry_after)},
+            )
+
         try:
-            # 주어진 username 사용자 검색
-            user = User.objects.get(username=username)
+            # 주어진 username 사용자 검색 (로그인에 필요한 컬럼만)
+            user = UserService.get_login_user(username)
             # 비밀번호가 맞는지 확인
-            if user.check_password(password):
+            if UserService.check_login_password(user, password):
                 # 비활성 사용자일 경우 오류 메시지 반환
                 if not user.is_active:
                     return Response(
@@ -73,12 +82,14 @@ class LoginView(APIView):
                 tokens = UserService.handle_login(user, request.META)
                 return Response(tokens, status=status.HTTP_200_OK)
             else:
-                # 비밀번호가 잘못된 경우 오류 메시지 반환
+                # 비밀번호가 잘못된 경우 실패로 기록하고 오류 메시지 반환
+                UserService.handle_failed_login(username, request.META, user)
                 return Response(
                     {"error": "Invalid password"}, status=status.HTTP_401_UNAUTHORIZED
                 )
         except User.DoesNotExist:
-            # 사용자가 존재하지 않는 경우 오류 메시지 반환
+            # 사용자가 존재하지 않는 경우 실패로 세고 오류 메시지 반환
+            UserService.handle_failed_login(username, request.META)
             return Response(
                 {"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED
             )